@@ -36,13 +36,18 @@ sys.path.insert(0, "../")
 
 from fiction_dl.Core.Application import Application
 from fiction_dl.Utilities.Filesystem import GetLibreOfficeExecutablePath
+from fiction_dl.Utilities.OutputFormats import ReadOutputFormats
 from fiction_dl.Configuration import *
 
 # Standard packages.
 
 from argparse import Namespace
 import logging
+import os
 from pathlib import Path
+import signal
+from subprocess import Popen
+from time import sleep, time
 
 
 #
@@ -57,40 +62,105 @@ from pathlib import Path
 # Run the integration test.
 #
 
-arguments = Namespace(
-    Authenticate = True,
-    ClearCache = True,
-    Pack = False,
-    Verbose = True,
-    Force = True,
-    Debug = True,
-    Images = True,
-    PersistentCache = True,
-    LibreOffice = GetLibreOfficeExecutablePath() or Path(),
-    Output = OutputDirectoryPath,
-    Input = "Integration Test Dataset 1.txt"
-)
-
-Application(
-    arguments = arguments,
-    cacheDirectoryPath = CacheDirectoryPath
-).Launch()
-
-arguments = Namespace(
-    Authenticate = True,
-    ClearCache = True,
-    Pack = True,
-    Verbose = True,
-    Force = True,
-    Debug = True,
-    Images = True,
-    PersistentCache = True,
-    LibreOffice = GetLibreOfficeExecutablePath() or Path(),
-    Output = OutputDirectoryPath,
-    Input = "Integration Test Dataset 3.txt"
-)
-
-Application(
-    arguments = arguments,
-    cacheDirectoryPath = CacheDirectoryPath
-).Launch()
\ No newline at end of file
+if "__main__" == __name__:
+
+    arguments = Namespace(
+        Authenticate = True,
+        ClearCache = True,
+        Pack = False,
+        Verbose = True,
+        Force = True,
+        UpdateStories = False,
+        Debug = True,
+        Images = True,
+        PersistentCache = True,
+        CollectCacheGarbage = False,
+        PrintCacheStatistics = False,
+        CacheImportFilePath = None,
+        CacheExportFilePath = None,
+        CacheExportFilter = None,
+        CacheMaximumSize = CacheMaximumSize,
+        CacheMaximumItemCount = CacheMaximumItemCount,
+        CacheMaximumItemAge = CacheMaximumItemAge,
+        CacheRemoteLocation = CacheRemoteLocation,
+        StoryScanLifetime = StoryScanLifetime,
+        Resume = False,
+        SpillChapterCount = SpillChapterCount,
+        Jobs = Jobs,
+        JobsPerHost = JobsPerHost,
+        RequestRate = RequestRate,
+        RequestBurst = RequestBurst,
+        AsyncRequests = AsyncRequests,
+        OutputFormats = ReadOutputFormats(OutputFormats),
+        LibreOffice = GetLibreOfficeExecutablePath() or Path(),
+        Output = OutputDirectoryPath,
+        Input = "Integration Test Dataset 1.txt"
+    )
+
+    Application(
+        arguments = arguments,
+        cacheDirectoryPath = CacheDirectoryPath
+    ).Launch()
+
+    arguments = Namespace(
+        Authenticate = True,
+        ClearCache = True,
+        Pack = True,
+        Verbose = True,
+        Force = True,
+        UpdateStories = False,
+        Debug = True,
+        Images = True,
+        PersistentCache = True,
+        CollectCacheGarbage = False,
+        PrintCacheStatistics = False,
+        CacheImportFilePath = None,
+        CacheExportFilePath = None,
+        CacheExportFilter = None,
+        CacheMaximumSize = CacheMaximumSize,
+        CacheMaximumItemCount = CacheMaximumItemCount,
+        CacheMaximumItemAge = CacheMaximumItemAge,
+        CacheRemoteLocation = CacheRemoteLocation,
+        StoryScanLifetime = StoryScanLifetime,
+        Resume = False,
+        SpillChapterCount = SpillChapterCount,
+        Jobs = Jobs,
+        JobsPerHost = JobsPerHost,
+        RequestRate = RequestRate,
+        RequestBurst = RequestBurst,
+        AsyncRequests = AsyncRequests,
+        OutputFormats = ReadOutputFormats(OutputFormats),
+        LibreOffice = GetLibreOfficeExecutablePath() or Path(),
+        Output = OutputDirectoryPath,
+        Input = "Integration Test Dataset 3.txt"
+    )
+
+    Application(
+        arguments = arguments,
+        cacheDirectoryPath = CacheDirectoryPath
+    ).Launch()
+
+    # Check whether the application quits promptly when interrupted (with Ctrl+C) in the middle of a run.
+
+    if "nt" != os.name:
+
+        process = Popen(
+            [
+                sys.executable, "-m", "fiction_dl",
+                "-c", "-f", "-o", str(OutputDirectoryPath),
+                "Integration Test Dataset 1.txt"
+            ],
+            env = {**os.environ, "PYTHONPATH": "../"}
+        )
+
+        sleep(30)
+
+        interruptionTime = time()
+        process.send_signal(signal.SIGINT)
+        process.wait()
+
+        if (quittingTime := time() - interruptionTime) > 5:
+            logging.error(f"The application has taken {quittingTime:.1f} seconds to quit when interrupted.")
+
+        if 130 != process.returncode:
+            logging.error(f"The application has exited with code {process.returncode} when interrupted.")
\ No newline at end of file
@@ -0,0 +1,171 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Concepts.CacheBackend import CacheBackend
+
+# Standard packages.
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+# Non-standard packages.
+
+from dreamy_utilities.Filesystem import GetUniqueFileName
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# The filesystem cache backend: values are stored in files, in a directory that can be shared by many
+# machines (a network drive, for example). Files are written atomically.
+#
+##
+
+class CacheBackendFilesystem(CacheBackend):
+
+    def __init__(self, directoryPath: Path) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param directoryPath The path to the directory. It will be created if necessary.
+        #
+        ##
+
+        super().__init__()
+
+        self._directoryPath = directoryPath
+        self._directoryPath.mkdir(parents = True, exist_ok = True)
+
+    def Read(self, key: str) -> Optional[bytes]:
+
+        ##
+        #
+        # Reads a value.
+        #
+        # @param key The key.
+        #
+        # @return The value, or **None** if it isn't present (or can't be read).
+        #
+        ##
+
+        try:
+
+            with open(self._GetFilePath(key), "rb") as file:
+                return file.read()
+
+        except FileNotFoundError:
+
+            return None
+
+        except OSError as caughtException:
+
+            logging.info(f'Failed to read "{key}" from the remote cache: {caughtException}')
+            return None
+
+    def Write(self, key: str, data: bytes) -> bool:
+
+        ##
+        #
+        # Writes a value, replacing the previous one (if there is one).
+        #
+        # @param key  The key.
+        # @param data The value.
+        #
+        # @return **True** if the value has been written, **False** otherwise.
+        #
+        ##
+
+        filePath = self._GetFilePath(key)
+        temporaryFilePath = filePath.parent / f"{GetUniqueFileName()}.tmp"
+
+        try:
+
+            filePath.parent.mkdir(parents = True, exist_ok = True)
+
+            with open(temporaryFilePath, "wb") as file:
+                file.write(data)
+
+            os.replace(temporaryFilePath, filePath)
+
+        except OSError as caughtException:
+
+            logging.info(f'Failed to write "{key}" to the remote cache: {caughtException}')
+            temporaryFilePath.unlink(missing_ok = True)
+
+            return False
+
+        return True
+
+    def Delete(self, key: str) -> bool:
+
+        ##
+        #
+        # Deletes a value.
+        #
+        # @param key The key.
+        #
+        # @return **True** if the value has been deleted (or wasn't present), **False** otherwise.
+        #
+        ##
+
+        try:
+
+            self._GetFilePath(key).unlink(missing_ok = True)
+
+        except OSError as caughtException:
+
+            logging.info(f'Failed to delete "{key}" from the remote cache: {caughtException}')
+            return False
+
+        return True
+
+    def _GetFilePath(self, key: str) -> Path:
+
+        ##
+        #
+        # Generates the path to the file containing a value.
+        #
+        # @param key The key.
+        #
+        # @return The path to the file.
+        #
+        ##
+
+        return self._directoryPath.joinpath(*key.split("/"))
\ No newline at end of file
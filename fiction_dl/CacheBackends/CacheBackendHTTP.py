@@ -0,0 +1,215 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Concepts.CacheBackend import CacheBackend
+
+# Standard packages.
+
+import logging
+import threading
+from typing import Optional
+
+# Non-standard packages.
+
+import requests
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# The HTTP cache backend. It speaks the simplest possible protocol: a value is read using a GET request
+# and written using a PUT request, both sent to the URL made by appending the key to the base URL.
+# A missing value is signalled by the status code 404. Object stores (like MinIO, with a public bucket)
+# and most WebDAV servers can serve as the remote end.
+#
+##
+
+class CacheBackendHTTP(CacheBackend):
+
+    def __init__(self, baseURL: str) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param baseURL The base URL (e.g. "http://cache.local:9000/fiction-dl").
+        #
+        ##
+
+        super().__init__()
+
+        self._baseURL = baseURL.rstrip("/")
+
+        self._threadData = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def Read(self, key: str) -> Optional[bytes]:
+
+        ##
+        #
+        # Reads a value.
+        #
+        # @param key The key.
+        #
+        # @return The value, or **None** if it isn't present (or can't be read).
+        #
+        ##
+
+        try:
+
+            response = self._GetSession().get(self._GetURL(key), timeout = self._Timeout)
+
+        except requests.RequestException as caughtException:
+
+            logging.info(f'Failed to read "{key}" from the remote cache: {caughtException}')
+            return None
+
+        if requests.codes.ok != response.status_code:
+
+            if requests.codes.not_found != response.status_code:
+                logging.info(f'Failed to read "{key}" from the remote cache: status {response.status_code}.')
+
+            return None
+
+        return response.content
+
+    def Write(self, key: str, data: bytes) -> bool:
+
+        ##
+        #
+        # Writes a value, replacing the previous one (if there is one).
+        #
+        # @param key  The key.
+        # @param data The value.
+        #
+        # @return **True** if the value has been written, **False** otherwise.
+        #
+        ##
+
+        try:
+
+            response = self._GetSession().put(self._GetURL(key), data = data, timeout = self._Timeout)
+
+        except requests.RequestException as caughtException:
+
+            logging.info(f'Failed to write "{key}" to the remote cache: {caughtException}')
+            return False
+
+        if not response.ok:
+
+            logging.info(f'Failed to write "{key}" to the remote cache: status {response.status_code}.')
+            return False
+
+        return True
+
+    def Delete(self, key: str) -> bool:
+
+        ##
+        #
+        # Deletes a value.
+        #
+        # @param key The key.
+        #
+        # @return **True** if the value has been deleted (or wasn't present), **False** otherwise.
+        #
+        ##
+
+        try:
+
+            response = self._GetSession().delete(self._GetURL(key), timeout = self._Timeout)
+
+        except requests.RequestException as caughtException:
+
+            logging.info(f'Failed to delete "{key}" from the remote cache: {caughtException}')
+            return False
+
+        return response.ok or (requests.codes.not_found == response.status_code)
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Closes the connections to the server.
+        #
+        ##
+
+        with self._lock:
+
+            for session in self._sessions:
+                session.close()
+
+            self._sessions.clear()
+
+        self._threadData = threading.local()
+
+    def _GetSession(self) -> requests.Session:
+
+        ##
+        #
+        # Returns the calling thread's session (sessions aren't thread-safe), creating it if necessary.
+        #
+        # @return The session.
+        #
+        ##
+
+        if (session := getattr(self._threadData, "Session", None)):
+            return session
+
+        session = requests.Session()
+        self._threadData.Session = session
+
+        with self._lock:
+            self._sessions.append(session)
+
+        return session
+
+    def _GetURL(self, key: str) -> str:
+
+        ##
+        #
+        # Generates the URL of a value.
+        #
+        # @param key The key.
+        #
+        # @return The URL.
+        #
+        ##
+
+        return f"{self._baseURL}/{key}"
+
+    # The timeout of a request, in seconds.
+    _Timeout = 10.0
\ No newline at end of file
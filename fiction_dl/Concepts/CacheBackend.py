@@ -0,0 +1,104 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from typing import Optional
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Represents an abstract cache backend - a key-value store the cache can use as its remote tier,
+# shared by many instances of the application (possibly running on different machines).
+#
+# Keys are strings consisting of path-like segments separated by slashes (e.g. "Blobs/1a2b..."); values
+# are binary data. Backends have to be thread-safe.
+#
+##
+
+class CacheBackend:
+
+    def Read(self, key: str) -> Optional[bytes]:
+
+        ##
+        #
+        # Reads a value.
+        #
+        # @param key The key.
+        #
+        # @return The value, or **None** if it isn't present (or can't be read).
+        #
+        ##
+
+        raise NotImplementedError()
+
+    def Write(self, key: str, data: bytes) -> bool:
+
+        ##
+        #
+        # Writes a value, replacing the previous one (if there is one).
+        #
+        # @param key  The key.
+        # @param data The value.
+        #
+        # @return **True** if the value has been written, **False** otherwise.
+        #
+        ##
+
+        raise NotImplementedError()
+
+    def Delete(self, key: str) -> bool:
+
+        ##
+        #
+        # Deletes a value.
+        #
+        # @param key The key.
+        #
+        # @return **True** if the value has been deleted (or wasn't present), **False** otherwise.
+        #
+        ##
+
+        raise NotImplementedError()
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Releases the resources used by the backend.
+        #
+        ##
+
+        pass
\ No newline at end of file
@@ -30,21 +30,26 @@
 
 from fiction_dl.Concepts.Chapter import Chapter
 from fiction_dl.Concepts.Story import Story
+from fiction_dl.Core.AsyncWebSession import AsyncWebSession
+from fiction_dl.Core.RateLimitedWebSession import RateLimitedWebSession
+from fiction_dl.Core.RateLimiter import RateLimiter
 import fiction_dl.Configuration as Configuration
 
 # Standard packages.
 
+import asyncio
 from enum import Enum
 import logging
+from random import choice
 import requests
-from typing import List, Optional
+from threading import Lock
+from typing import Any, Dict, List, Optional
 
 # Non-standard packages.
 
 from bs4 import BeautifulSoup
 from dreamy_utilities.Interface import Interface
 from dreamy_utilities.Web import GetHostname
-from dreamy_utilities.WebSession import WebSession
 from fake_useragent import UserAgent
 
 #
@@ -85,7 +90,10 @@ class Extractor:
 
         self.Story = None
 
-        self._webSession = WebSession(UserAgent().random)
+        self._webSession = RateLimitedWebSession(
+            Extractor._GetRandomUserAgent(),
+            rateLimiter = Extractor._rateLimiter
+        )
         self._chapterURLs = []
 
         self._downloadStorySoupWhenScanning = True
@@ -93,6 +101,39 @@ class Extractor:
 
         self._chapterParserName = "html.parser"
 
+    @staticmethod
+    def SetRateLimiter(rateLimiter: Optional[RateLimiter]) -> None:
+
+        ##
+        #
+        # Sets the rate limiter used by all the extractors created afterwards.
+        #
+        # @param rateLimiter The rate limiter.
+        #
+        ##
+
+        Extractor._rateLimiter = rateLimiter
+
+    @staticmethod
+    def _GetRandomUserAgent() -> str:
+
+        ##
+        #
+        # Returns a random user agent. Drawing one from the database of user agents takes a while, so a
+        # few of them are drawn once, and reused.
+        #
+        # @return The user agent.
+        #
+        ##
+
+        with Extractor._userAgentsLock:
+
+            if not Extractor._userAgents:
+                userAgents = UserAgent()
+                Extractor._userAgents = [userAgents.random for _ in range(Extractor._UserAgentCount)]
+
+            return choice(Extractor._userAgents)
+
     def GetSupportedHostnames(self) -> List[str]:
 
         ##
@@ -117,6 +158,19 @@ class Extractor:
 
         return True
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Can the chapters be extracted concurrently (by many threads at once)? By default, that's the
+        # case if every chapter is extracted from its own page.
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        return self._downloadChapterSoupWhenExtracting
+
     def SupportsAuthentication(self) -> bool:
 
         ##
@@ -203,6 +257,46 @@ class Extractor:
 
         return self._InternallyScanStory(normalizedURL, soup)
 
+    def GetScanState(self) -> Optional[Dict[str, Any]]:
+
+        ##
+        #
+        # Returns the results of the last scan (the metadata and the list of chapter URLs), so that
+        # they can be stored and restored later, instead of scanning the story again.
+        #
+        # @return A JSON-serializable dictionary, or **None** if there's nothing worth storing.
+        #
+        ##
+
+        if (self.Story is None) or (not self.Story.Metadata):
+            return None
+
+        return {
+            "Metadata": {name: getattr(self.Story.Metadata, name) for name in self._ScannedMetadataNames},
+            "ChapterURLs": self._chapterURLs,
+        }
+
+    def RestoreScanState(self, state: Dict[str, Any]) -> bool:
+
+        ##
+        #
+        # Restores the results of a previous scan (as returned by GetScanState()).
+        #
+        # @param state The results of the scan.
+        #
+        # @return **True** if the extractor is ready to extract chapters, **False** if only the
+        #         metadata has been restored - i.e. the story has to be scanned anyway before
+        #         extracting its content.
+        #
+        ##
+
+        for name, value in state["Metadata"].items():
+            setattr(self.Story.Metadata, name, value)
+
+        self._chapterURLs = list(state["ChapterURLs"])
+
+        return True
+
     def ExtractChapter(self, index: int) -> Optional[Chapter]:
 
         ##
@@ -215,16 +309,9 @@ class Extractor:
         #
         ##
 
-        if index > len(self._chapterURLs):
-            logging.error(
-                f"Trying to extract chapter {index}. "
-                f"Only {len(self._chapterURLs)} chapter(s) located. "
-                f"The story supposedly has {self.Story.Metadata.ChapterCount} chapter(s)."
-            )
+        if not (chapterURL := self._GetChapterURL(index)):
             return None
 
-        chapterURL = self._chapterURLs[index - 1]
-
         soup = None
 
         if self._downloadChapterSoupWhenExtracting:
@@ -236,6 +323,48 @@ class Extractor:
 
         return self._InternallyExtractChapter(chapterURL, soup)
 
+    async def ExtractChapterAsync(self, index: int, webSession: AsyncWebSession) -> Optional[Chapter]:
+
+        ##
+        #
+        # Extracts specific chapter, asynchronously. The chapter page is downloaded using given
+        # asynchronous session and parsed in a worker thread. Extractors which don't download a page per
+        # chapter (or use Cloudscraper) fall back to calling ExtractChapter() in a worker thread.
+        #
+        # @param index      The index of the chapter to be extracted.
+        # @param webSession The asynchronous web session.
+        #
+        # @return The chapter, or **None** if the extraction has failed.
+        #
+        ##
+
+        loop = asyncio.get_running_loop()
+
+        if (
+            (not self._downloadChapterSoupWhenExtracting) or
+            (not self.SupportsConcurrentExtraction()) or
+            self._webSession.UsesCloudscraper()
+        ):
+            return await loop.run_in_executor(None, self.ExtractChapter, index)
+
+        if not (chapterURL := self._GetChapterURL(index)):
+            return None
+
+        page = await webSession.Get(
+            chapterURL,
+            userAgent = self._webSession.GetUserAgent(),
+            cookies = self._webSession.GetCookies()
+        )
+
+        if not page:
+            logging.error(f'Failed to download tag soup: "{chapterURL}".')
+            return None
+
+        return await loop.run_in_executor(
+            None,
+            lambda: self._InternallyExtractChapter(chapterURL, BeautifulSoup(page, features = self._chapterParserName))
+        )
+
     def ExtractMedia(self, URL: str) -> Optional[bytes]:
 
         ##
@@ -253,6 +382,55 @@ class Extractor:
 
         return self._webSession.Get(URL, text = False, stream = True)
 
+    async def ExtractMediaAsync(self, URL: str, webSession: AsyncWebSession) -> Optional[bytes]:
+
+        ##
+        #
+        # Extracts binary media (an image, for example), asynchronously, using given asynchronous
+        # session. Extractors using Cloudscraper fall back to calling ExtractMedia() in a worker thread.
+        #
+        # @param URL        The URL to be extracted.
+        # @param webSession The asynchronous web session.
+        #
+        # @return The data extracted, as bytes.
+        #
+        ##
+
+        if not URL:
+            return None
+
+        if self._webSession.UsesCloudscraper():
+            return await asyncio.get_running_loop().run_in_executor(None, self.ExtractMedia, URL)
+
+        return await webSession.Get(
+            URL,
+            text = False,
+            userAgent = self._webSession.GetUserAgent(),
+            cookies = self._webSession.GetCookies()
+        )
+
+    def _GetChapterURL(self, index: int) -> Optional[str]:
+
+        ##
+        #
+        # Returns the URL of specific chapter.
+        #
+        # @param index The index of the chapter.
+        #
+        # @return The URL, or **None** if the chapter hasn't been located.
+        #
+        ##
+
+        if index > len(self._chapterURLs):
+            logging.error(
+                f"Trying to extract chapter {index}. "
+                f"Only {len(self._chapterURLs)} chapter(s) located. "
+                f"The story supposedly has {self.Story.Metadata.ChapterCount} chapter(s)."
+            )
+            return None
+
+        return self._chapterURLs[index - 1]
+
     def _InternallyScanStory(
         self,
         URL: str,
@@ -318,4 +496,24 @@ class Extractor:
         #
         ##
 
-        return URL
\ No newline at end of file
+        return URL
+
+    # The names of the metadata values retrieved by scanning a story.
+    _ScannedMetadataNames = [
+        "URL",
+        "Title",
+        "Author",
+        "Summary",
+        "DatePublished",
+        "DateUpdated",
+        "ChapterCount",
+        "WordCount",
+    ]
+
+    # The rate limiter all the requests are sent through.
+    _rateLimiter = None
+
+    # Random user agents shared by all the extractors, and their number.
+    _userAgents = []
+    _userAgentsLock = Lock()
+    _UserAgentCount = 20
\ No newline at end of file
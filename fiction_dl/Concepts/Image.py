@@ -111,6 +111,37 @@ class Image:
 
         return True
 
+    def CreateFromEncodedData(self, data: bytes) -> bool:
+
+        ##
+        #
+        # Creates an image from data previously generated by CreateFromData(), without re-encoding it.
+        # Only the header of the image is decoded, in order to read its dimensions.
+        #
+        # @param data Encoded image data.
+        #
+        # @return **True** if the image has been created correctly, **False** otherwise.
+        #
+        ##
+
+        if not data:
+            return False
+
+        try:
+
+            width, height = PIL.Image.open(BytesIO(data)).size
+
+        except:
+
+            logging.info(f"An exception has occurred while reading image dimensions: \"{self.URL}\".")
+            return False
+
+        self.Data = data
+        self.W = width
+        self.H = height
+
+        return True
+
     def __bool__(self) -> bool:
 
         ##
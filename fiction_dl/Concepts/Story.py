@@ -69,6 +69,11 @@ class Story:
 
         self.Metadata = Metadata()
 
+        # The URL the story has been created with. The one in the metadata might be replaced when the story
+        # is scanned, so this one is used to recognize the story (in the library and in the spill area).
+
+        self.InputURL = URL
+
         self.Metadata.URL = URL
         self.Metadata.DatePublished = GetCurrentDate()
         self.Metadata.DateUpdated = self.Metadata.DatePublished
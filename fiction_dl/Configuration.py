@@ -58,6 +58,15 @@ DebugDirectoryPath = Path(f"{ApplicationName} Debug Data")
 OutputDirectoryPath = Path(f"{ApplicationName} Downloads")
 SkippedURLsFilePath = Path(f"{ApplicationName} Skipped URLs.txt")
 
+# Every run (identified by its input and output directory) keeps its journal and its spill area in a
+# directory of its own, so that runs started in the same directory don't interfere with each other.
+RunsDirectoryPath = Path(f"{ApplicationName} Runs")
+JournalFileName = "Journal.jsonl"
+SpillDirectoryName = "Spill Area"
+
+# The index of saved stories, kept in the output directory.
+LibraryFileName = f"{ApplicationName} Library.sqlite"
+
 # A simple line-break.
 LineBreak = 79 * "-"
 
@@ -70,8 +79,84 @@ WelcomingMessage = f"{ApplicationName} {ApplicationVersion}, by {CreatorName} ({
 # Maximum length of the longer side of an embedded image.
 MaximumImageSideLength = 800
 
-# The time application waits after downloading a chapter, in seconds.
-PostChapterSleepTime = 1.0
+# The quality of embedded (re-encoded) images (1 - 100).
+ImageQuality = 75
+
+# Limits of the cache: the maximum size of stored data (in megabytes), the maximum number of items and
+# the maximum age of an item (in days). "None" means "no limit". When a limit is exceeded, stories are
+# evicted from the cache in the order given by the eviction policy: "LRU" (least recently used first)
+# or "LFU" (least frequently used first).
+CacheMaximumSize = None
+CacheMaximumItemCount = None
+CacheMaximumItemAge = None
+CacheEvictionPolicy = "LRU"
+
+# The location of the remote cache shared by many machines: an HTTP(S) URL or a directory path. Optional.
+CacheRemoteLocation = None
+
+# The number of stories downloaded at once (in total, and per host) by default.
+Jobs = 1
+JobsPerHost = 1
+
+# For how long the results of scanning a story (its metadata and the list of its chapters) are reused,
+# in minutes. Zero disables reusing them.
+StoryScanLifetime = 60
+
+# Request rate limits, applied per host: the average number of requests per second, and the number of
+# requests that can be sent at once. The first pair applies to websites requiring breaks between requests;
+# the second one - to all the other hosts.
+RequestRate = 1.0
+RequestBurst = 1
+DefaultRequestRate = 10.0
+DefaultRequestBurst = 10
+
+# The maximum number of chapters of a single story downloaded at once (further limited by the request
+# burst of the host).
+ChapterJobs = 8
+
+# Send chapter and image requests asynchronously (using one event loop and one pool of connections shared
+# by all the hosts) instead of using worker threads. Requires the "aiohttp" package. The connection limits
+# apply to all the hosts, and to every host separately. Stories are still scanned synchronously.
+AsyncRequests = False
+AsyncConnectionLimit = 1000
+AsyncConnectionLimitPerHost = 16
+
+# The number of processes processing chapter content at once. Zero means one process per CPU core.
+# The number of chapters sent to the processes at once (the content of the rest isn't read until then).
+ProcessingJobs = 0
+ProcessingBatchSize = 256
+
+# Stories are processed in a pipeline of stages. The number of stories whose content is processed at once,
+# the number of stories formatted at once, the number of stories whose output files are being generated
+# at once (including the ones waiting for conversions performed in the background, which keep their
+# content in memory until then), and the number of stories which can wait for each stage.
+ProcessingStageJobs = 1
+FormattingStageJobs = 2
+FormattingStageStories = 8
+StageQueueLength = 2
+
+# Stories with at least that many chapters keep the content of their chapters on the disk (in the spill
+# area), instead of in memory, from the moment they're extracted. "None" means "never".
+SpillChapterCount = None
+
+# The output formats generated by default, separated with commas. Formats which the requested ones are
+# converted from (ODT for PDF, EPUB for MOBI) are generated too, but their files are removed afterwards.
+OutputFormats = "html,odt,pdf,epub,mobi"
+
+# The number of output files generated at once (of all the stories being formatted). Use the first page
+# of the PDF file as the cover of the EPUB file (which makes EPUB files wait for PDF files, instead of
+# being generated in parallel with them - but only if PDF files are generated anyway).
+FormatterJobs = 4
+EPUBCoverFromPDF = True
+
+# LibreOffice converts documents to PDF files in batches (many documents converted by one process). The
+# maximum number of documents in a batch, and the time one document can take to be converted, in seconds.
+LibreOfficeBatchSize = 8
+LibreOfficeTimeout = 300.0
+
+# The number of e-books converted by Calibre at once, and the time one conversion can take, in seconds.
+CalibreJobs = 4
+CalibreTimeout = 600.0
 
 # About repeated connection attempts.
 MaximumConnectionAttemptCount = 10
@@ -30,35 +30,57 @@
 
 from fiction_dl.Concepts.Chapter import Chapter
 from fiction_dl.Concepts.Extractor import Extractor
+from fiction_dl.Concepts.Image import Image
 from fiction_dl.Concepts.Story import Story
 from fiction_dl.Concepts.StoryPackage import StoryPackage
+from fiction_dl.Core.AsyncWebSession import AsyncWebSession
+from fiction_dl.Core.BufferedOutput import BufferedOutput
+from fiction_dl.Core.CalibreConverter import CalibreConverter
 from fiction_dl.Core.Cache import Cache
+from fiction_dl.Core.EventLoop import EventLoop
 from fiction_dl.Core.InputData import InputData
+from fiction_dl.Core.Journal import Journal
+from fiction_dl.Core.LibreOfficeConverter import LibreOfficeConverter
+from fiction_dl.Core.Library import Library
+from fiction_dl.Core.RateLimiter import RateLimiter
+from fiction_dl.Core.SpillArea import SpillArea
+from fiction_dl.Core.TaskGraph import TaskGraph
 from fiction_dl.Extractors.ExtractorTextFile import ExtractorTextFile
 from fiction_dl.Formatters.FormatterEPUB import FormatterEPUB
 from fiction_dl.Formatters.FormatterHTML import FormatterHTML
 from fiction_dl.Formatters.FormatterMOBI import FormatterMOBI
 from fiction_dl.Formatters.FormatterODT import FormatterODT
 from fiction_dl.Formatters.FormatterPDF import FormatterPDF
-from fiction_dl.Processors.SanitizerProcessor import SanitizerProcessor
-from fiction_dl.Processors.TypographyProcessor import TypographyProcessor
+from fiction_dl.Utilities.CacheBackends import CreateCacheBackend
 from fiction_dl.Utilities.Extractors import CreateExtractor
-from fiction_dl.Utilities.General import RenderPDFPageToBytes
+from fiction_dl.Utilities.General import KillProcesses, RenderPDFPageToBytes
 from fiction_dl.Utilities.HTML import FindImagesInCode, MakeURLAbsolute
+from fiction_dl.Utilities.OutputFormats import OutputFormatSources, PlanOutputFormats
+from fiction_dl.Utilities.Processors import GetContentProcessingVersion, ProcessContent
 from fiction_dl.Utilities.Text import GetPrintableStoryTitle, Transliterate
 import fiction_dl. Configuration as Configuration
 
 # Standard packages.
 
 from argparse import Namespace
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from hashlib import sha256
+import json
 import logging
+from multiprocessing import get_context
+from os import _exit, cpu_count
 from os.path import expandvars, isfile
 from pathlib import Path
 import re
 from requests.exceptions import ConnectionError
 from ssl import SSLError
-from time import sleep
-from typing import Dict, List, Optional, Union
+import sys
+from tarfile import TarError
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from urllib3.exceptions import ProtocolError
 
 # Non-standard packages.
@@ -68,7 +90,7 @@ from dreamy_utilities.Containers import RemoveDuplicates
 from dreamy_utilities.Filesystem import FindExecutable, GetSanitizedFileName, WriteTextFile
 from dreamy_utilities.Interface import Interface
 from dreamy_utilities.Text import GetCurrentDate, Stringify, Truncate
-from dreamy_utilities.Web import GetSiteURL
+from dreamy_utilities.Web import GetHostname, GetSiteURL
 
 #
 #
@@ -98,8 +120,71 @@ class Application:
 
         self._arguments = arguments
 
-        self._cache = Cache(cacheDirectoryPath)
+        cacheMaximumSize =                                 \
+            arguments.CacheMaximumSize * 1024 * 1024       \
+            if arguments.CacheMaximumSize is not None else \
+            None
+
+        self._cache = Cache(
+            cacheDirectoryPath,
+            maximumSize = cacheMaximumSize,
+            maximumItemCount = arguments.CacheMaximumItemCount,
+            maximumItemAge = arguments.CacheMaximumItemAge,
+            evictionPolicy = Configuration.CacheEvictionPolicy,
+            remoteBackend = CreateCacheBackend(arguments.CacheRemoteLocation)
+        )
+
+        self._library = Library(Path(expandvars(arguments.Output)) / Configuration.LibraryFileName)
+
+        runDirectoryPath = Configuration.RunsDirectoryPath / self._GetRunIdentifier()
+
+        self._journal = Journal(runDirectoryPath / Configuration.JournalFileName)
+        self._spillArea = SpillArea(runDirectoryPath / Configuration.SpillDirectoryName)
+
         self._interface = Interface()
+        self._output = None
+
+        self._eventLoop = None
+        self._asyncWebSession = None
+
+        self._processPool = None
+        self._processPoolLock = Lock()
+
+        # In update mode, chapters which could have changed since a story was saved aren't retrieved from
+        # the cache (keyed by story URLs, values are the indices of the first such chapters).
+
+        self._outdatedChapterIndices = {}
+
+        # PDF files are converted by LibreOffice, started only when needed.
+
+        self._libreOffice = LibreOfficeConverter(
+            arguments.LibreOffice,
+            Configuration.LibreOfficeTimeout,
+            Configuration.LibreOfficeBatchSize
+        )
+
+        # MOBI files are converted by Calibre, in the background.
+
+        self._calibre = CalibreConverter(Configuration.CalibreJobs, Configuration.CalibreTimeout)
+
+        # Output files are generated by a pool of worker threads shared by all the stories (including the
+        # files generated once the conversions performed in the background finish).
+
+        self._formatterExecutor = ThreadPoolExecutor(Configuration.FormatterJobs)
+
+        # The requested output formats which can be generated (PDF files require LibreOffice, MOBI files
+        # require Calibre).
+
+        self._outputFormats = [
+            name for name in arguments.OutputFormats
+            if (("PDF" != name) or arguments.LibreOffice.is_file()) and
+               (("MOBI" != name) or FindExecutable("ebook-convert"))
+        ]
+
+        # All the requests are sent through the rate limiter.
+
+        self._rateLimiter = RateLimiter(Configuration.DefaultRequestRate, Configuration.DefaultRequestBurst)
+        Extractor.SetRateLimiter(self._rateLimiter)
 
     def Launch(self) -> None:
 
@@ -117,6 +202,25 @@ class Application:
             logging.info("Deleting the cache...")
             self._cache.Clear()
 
+        # Collect the garbage and import a cache bundle (if requested). Quit if there's nothing else to do.
+
+        if self._arguments.CollectCacheGarbage:
+            self._CollectCacheGarbage()
+
+        if self._arguments.CacheImportFilePath:
+            self._ImportCache(self._arguments.CacheImportFilePath)
+
+        if not self._arguments.Input:
+
+            if self._arguments.CacheExportFilePath:
+                self._ExportCache(self._arguments.CacheExportFilePath)
+
+            if self._arguments.PrintCacheStatistics:
+                self._PrintCacheStatistics(self._cache.GetStatistics(), "Cache statistics (all runs):")
+
+            self._cache.Close()
+            return
+
         # Print notices.
 
         if (notices := self._GenerateNotices()):
@@ -126,150 +230,459 @@ class Application:
             for notice in notices:
                 self._interface.Notice(notice)
 
-        # Process the input arguments.
+        # Process the input arguments - or continue the previous run, using the list of URLs it has
+        # processed (in the same order).
 
         self._interface.Process("Processing input arguments...", section = True)
 
-        inputData = InputData(self._arguments.Input)
-        if not self._arguments.Pack:
-            inputData.ExpandAndShuffle()
+        if self._arguments.Resume and (URLs := self._journal.Read(self._arguments.Input)) is not None:
+
+            finishedURLCount = sum(Journal.State.FINISHED == self._journal.GetState(URL) for URL in URLs)
+
+            self._interface.Comment(
+                f"Resuming the previous run: {finishedURLCount}/{len(URLs)} item(s) have been processed."
+            )
+
         else:
-            inputData.Expand()
 
-        URLs = inputData.Access()
+            if self._arguments.Resume:
+                self._interface.Comment("There's no previous run using the same input to be resumed.")
+
+            inputData = InputData(self._arguments.Input)
+            if not self._arguments.Pack:
+                inputData.ExpandAndShuffle()
+            else:
+                inputData.Expand()
+
+            URLs = inputData.Access()
+
+            self._journal.Start(self._arguments.Input, URLs)
+            self._spillArea.Clear()
 
         self._interface.Comment(f"The list contains {len(URLs)} item(s).")
 
+        # Start the event loop sending asynchronous requests (if requested).
+
+        if self._arguments.AsyncRequests and AsyncWebSession.IsAvailable():
+
+            self._eventLoop = EventLoop()
+            self._asyncWebSession = AsyncWebSession(
+                Configuration.AsyncConnectionLimit,
+                Configuration.AsyncConnectionLimitPerHost,
+                self._rateLimiter
+            )
+
         # Process the stories.
 
-        downloadedStories = []
-        skippedURLs = []
+        try:
 
-        for index, URL in enumerate(URLs, start = 1):
+            results = self._ProcessURLsInPipeline(URLs)
 
-            self._interface.LineBreak()
-            self._interface.Text(f'{index}/{len(URLs)}: "{URL}".', section = True, bold = True)
+        finally:
 
-            newlyDownloadedStory = None
+            if self._eventLoop:
 
-            if not self._arguments.Debug:
+                self._eventLoop.Close(self._asyncWebSession.Close())
 
-                try:
+                self._eventLoop = None
+                self._asyncWebSession = None
 
-                    sleep(Configuration.PostChapterSleepTime)
+            if self._processPool:
 
-                    newlyDownloadedStory = self._ProcessURL(URL)
+                self._processPool.shutdown()
+                self._processPool = None
 
-                except KeyboardInterrupt:
+        downloadedStories = [story for _, story in results if story]
+        skippedURLs = [URL for URL, (succeeded, _) in zip(URLs, results) if not succeeded]
 
-                    self._interface.ClearLine()
-                    self._interface.Notice("Quitting...")
+        self._interface.LineBreak()
 
-                    exit()
+        # Print information about skipped stories.
 
-                except ConnectionError as caughtException:
+        if skippedURLs:
 
-                    self._interface.Error(f"The website has refused connection: {caughtException}")
-                    self._interface.GrabUserAttention()
+            print()
 
-                except SSLError as caughtException:
+            for URL in skippedURLs:
+                self._interface.Error(f'Failed to download a story: "{URL}".')
 
-                    self._interface.Error(f"An SSL error has occurred: {caughtException}")
-                    self._interface.GrabUserAttention()
+            WriteTextFile(Configuration.SkippedURLsFilePath, "\n".join(skippedURLs))
 
-                except CloudflareChallengeError as caughtException:
+        # Print some final information.
 
-                    self._interface.Error("A Cloudflare challenge error has occurred. Try again later.")
-                    self._interface.GrabUserAttention()
+        successCount = len(URLs) - len(skippedURLs)
 
-                except BaseException as caughtException:
+        self._interface.Comment(f"Downloaded {successCount}/{len(URLs)} stories.", section = True)
 
-                    self._interface.Error(f"An exception has been thrown: {caughtException}")
-                    self._interface.GrabUserAttention()
+        self._PrintCacheStatistics(self._cache.GetStatistics(session = True), "Cache statistics:")
 
-                except:
+        if self._arguments.PrintCacheStatistics:
+            self._PrintCacheStatistics(self._cache.GetStatistics(), "Cache statistics (all runs):")
 
-                    self._interface.Error("An exception has been thrown.")
-                    self._interface.GrabUserAttention()
+        # Save downloaded stories.
 
-            else:
+        if self._arguments.Pack and downloadedStories:
+            # Wait for the output files generated in the background (the content of the stories is still
+            # needed until then).
 
-                sleep(Configuration.PostChapterSleepTime)
+            saving = self._FormatAndSaveStoryOrPackage(StoryPackage(downloadedStories))
 
-                newlyDownloadedStory = self._ProcessURL(URL)
+            if isinstance(saving, Future):
+                saving.result()
 
-            if not newlyDownloadedStory:
-                skippedURLs.append(URL)
+            self._spillArea.Clear()
 
-            if newlyDownloadedStory:
+        self._formatterExecutor.shutdown()
+
+        self._libreOffice.Close()
+        self._calibre.Close()
+
+        # Export and clear the cache. In update mode, the cache is always kept: the chapters which haven't
+        # changed are taken from it when the stories are updated again.
+
+        if self._arguments.CacheExportFilePath:
+            self._ExportCache(self._arguments.CacheExportFilePath)
+
+        if (not self._arguments.PersistentCache) and (not self._arguments.UpdateStories):
+            logging.info("Deleting the cache...")
+            self._cache.Clear()
+
+        self._cache.Close()
+        self._library.Close()
+        self._journal.Close()
+
+    def _ProcessURLsInPipeline(self, URLs: List[str]) -> List[Tuple[bool, Optional[Story]]]:
+
+        ##
+        #
+        # Processes URLs in a pipeline of stages: scanning stories, extracting chapters, downloading
+        # images, processing content and formatting stories. Every stage has its own pool of worker
+        # threads, so that (for example) a story can be downloaded while the previous one is being
+        # formatted. Between the stages, stories wait in bounded queues: a stage doesn't start working on
+        # another story while the queue of the next stage is full.
+        #
+        # The stages using the network are also limited by the number of stories downloaded at once, in
+        # total and per host. The output related to every story is printed in one piece, in the order the
+        # stories have been started.
+        #
+        # The progress made on every URL is recorded in the journal. URLs which have been processed by the
+        # previous run (if it's being resumed) are skipped. If the stories are to be packed, they're
+        # restored from the spill area instead (or processed again, if they aren't there).
+        #
+        # @param URLs The URLs to be processed.
+        #
+        # @return The results of processing the URLs, in the same order: tuples containing **True** if
+        #         the URL has been processed successfully (**False** if it's to be skipped), and the
+        #         downloaded story (only if the stories are to be packed).
+        #
+        ##
+
+        results = [(False, None)] * len(URLs)
+
+        # Prepare the stages: their functions and worker counts. Stories which are to be packed aren't
+        # formatted separately: they're moved to the spill area instead.
+
+        stages = [
+            (self._ScanURL, self._arguments.Jobs),
+            (self._ExtractChapters, self._arguments.Jobs),
+            (self._RetrieveImages, self._arguments.Jobs),
+            (self._ProcessContent, Configuration.ProcessingStageJobs),
+            (self._FormatAndSaveStoryOrPackage, Configuration.FormattingStageJobs),
+        ]
+
+        if self._arguments.Pack:
+            stages[-1] = (self._SpillStory, Configuration.FormattingStageJobs)
+
+        networkStageCount = 3
+
+        # The states recorded in the journal once the stages have been completed (except for the last one).
+
+        stageJournalStates = [Journal.State.SCANNED, Journal.State.EXTRACTED]
+
+        # Stories formatted in the background (waiting for PDF and MOBI conversions) don't occupy a worker
+        # of the last stage, but they still count against the number of stories it works on at once.
+
+        stageStoryLimits = [workerCount for _, workerCount in stages]
+        stageStoryLimits[-1] = max(Configuration.FormattingStageStories, Configuration.FormattingStageJobs)
+
+        stageQueues = [deque() for _ in stages]
+        activeStageJobCounts = [0] * len(stages)
+        activeStageStoryCounts = [0] * len(stages)
+
+        # Group the URLs by host (the same way the rate limiter does, so that both limits apply to the same
+        # hosts), preserving their order.
+
+        pendingURLs = {}
+
+        for index, URL in enumerate(URLs, start = 1):
+
+            if Journal.State.FINISHED == self._journal.GetState(URL):
 
                 if not self._arguments.Pack:
+                    results[index - 1] = (True, None)
+                    continue
 
-                    if not self._arguments.Debug:
+                if (story := self._RestoreSpilledStory(URL)):
+                    results[index - 1] = (True, story)
+                    continue
 
-                        try:
+            pendingURLs.setdefault(GetHostname(URL) or "", deque()).append((index, URL))
 
-                            self._FormatAndSaveStoryOrPackage(newlyDownloadedStory)
+        downloadedStoryCounts = dict.fromkeys(pendingURLs, 0)
+        downloadedStoryHosts = {}
 
-                        except FileNotFoundError as caughtException:
+        # Process the stories.
 
-                            self._interface.Error(f"A filesystem exception has occurred: {caughtException}")
-                            self._interface.GrabUserAttention()
-                            skippedURLs.append(URL)
+        executors = [ThreadPoolExecutor(workerCount) for _, workerCount in stages]
 
-                        except:
+        with BufferedOutput() as output:
 
-                            self._interface.Error("An exception has been thrown.")
-                            self._interface.GrabUserAttention()
-                            skippedURLs.append(URL)
+            self._output = output
 
-                    else:
+            outputChannels = {}
+            futures = {}
 
-                        self._FormatAndSaveStoryOrPackage(newlyDownloadedStory)
+            def RunStage(stageIndex: int, index: int, value: Any) -> Any:
 
-                else:
+                with output.Channel(outputChannels[index]):
 
-                    downloadedStories.append(newlyDownloadedStory)
+                    if 0 == stageIndex:
+                        self._interface.LineBreak()
+                        self._interface.Text(f'{index}/{len(URLs)}: "{value}".', section = True, bold = True)
 
-        self._interface.LineBreak()
+                    return self._RunStage(stages[stageIndex][0], value)
 
-        # Print information about skipped stories.
+            def CanStartStage(stageIndex: int) -> bool:
 
-        if skippedURLs:
+                nextStageQueueFull =                                                                \
+                    (stageIndex + 1 < len(stages)) and                                              \
+                    (len(stageQueues[stageIndex + 1]) >= Configuration.StageQueueLength)
 
-            print()
+                return                                                                      \
+                    (activeStageJobCounts[stageIndex] < stages[stageIndex][1]) and          \
+                    (activeStageStoryCounts[stageIndex] < stageStoryLimits[stageIndex]) and \
+                    not nextStageQueueFull
 
-            for URL in skippedURLs:
-                self._interface.Error(f'Failed to download a story: "{URL}".')
+            def CanStartDownloading(host: str) -> bool:
 
-            WriteTextFile(Configuration.SkippedURLsFilePath, "\n".join(skippedURLs))
+                return                                                              \
+                    bool(pendingURLs[host]) and                                     \
+                    CanStartStage(0) and                                            \
+                    (len(downloadedStoryHosts) < self._arguments.Jobs) and          \
+                    (downloadedStoryCounts[host] < self._arguments.JobsPerHost)
 
-        # Print some final information.
+            def StartStage(stageIndex: int, index: int, value: Any) -> None:
 
-        successCount = len(URLs) - len(skippedURLs)
+                future = executors[stageIndex].submit(RunStage, stageIndex, index, value)
 
-        self._interface.Comment(f"Downloaded {successCount}/{len(URLs)} stories.", section = True)
+                futures[future] = (stageIndex, index, False)
+                activeStageJobCounts[stageIndex] += 1
+                activeStageStoryCounts[stageIndex] += 1
 
-        # Save downloaded stories.
+            def StopDownloading(index: int) -> None:
 
-        if self._arguments.Pack and downloadedStories:
-            self._FormatAndSaveStoryOrPackage(StoryPackage(downloadedStories))
+                if (host := downloadedStoryHosts.pop(index, None)) is not None:
+                    downloadedStoryCounts[host] -= 1
 
-        # Clear the cache.
+            def FinishStory(index: int, result: Tuple[bool, Optional[Story]]) -> None:
 
-        if not self._arguments.PersistentCache:
-            logging.info("Deleting the cache...")
-            self._cache.Clear()
+                results[index - 1] = result
+
+                journalState = Journal.State.FINISHED if result[0] else Journal.State.FAILED
+                self._journal.Record(URLs[index - 1], journalState)
+
+                StopDownloading(index)
+                output.CloseChannel(outputChannels.pop(index))
+
+            try:
+
+                while pendingURLs or futures or any(stageQueues):
+
+                    # Move the stories along, starting with the last stage (so that the queues get emptied).
+
+                    for stageIndex in reversed(range(1, len(stages))):
+
+                        while stageQueues[stageIndex] and CanStartStage(stageIndex):
+                            StartStage(stageIndex, *stageQueues[stageIndex].popleft())
+
+                    # Start downloading as many stories as the limits allow.
+
+                    for host in list(pendingURLs):
+
+                        while CanStartDownloading(host):
+
+                            index, URL = pendingURLs[host].popleft()
+
+                            outputChannels[index] = output.OpenChannel()
+                            downloadedStoryHosts[index] = host
+                            downloadedStoryCounts[host] += 1
+
+                            StartStage(0, index, URL)
+
+                        if not pendingURLs[host]:
+                            del pendingURLs[host]
+
+                    # Wait for any stage to finish working on a story.
+
+                    finishedFutures, _ = wait(futures, return_when = FIRST_COMPLETED)
+
+                    for future in finishedFutures:
+
+                        stageIndex, index, inBackground = futures.pop(future)
+
+                        if not inBackground:
+                            activeStageJobCounts[stageIndex] -= 1
+
+                        result = future.result()
+
+                        # The stage might still be working on the story in the background (without
+                        # occupying a worker). Wait for it to finish.
+
+                        if isinstance(result, Future):
+                            futures[result] = (stageIndex, index, True)
+                            continue
+
+                        activeStageStoryCounts[stageIndex] -= 1
+
+                        if result is None:
+
+                            FinishStory(index, (False, None))
 
-    def _ProcessURL(self, URL: str) -> Optional[Story]:
+                        elif (result is True) or (len(stages) - 1 == stageIndex):
+
+                            # The last stage has been completed (or the story has been downloaded already).
+
+                            FinishStory(index, (True, result if isinstance(result, Story) else None))
+
+                        else:
+
+                            if stageIndex < len(stageJournalStates):
+                                self._journal.Record(URLs[index - 1], stageJournalStates[stageIndex])
+
+                            if networkStageCount - 1 == stageIndex:
+                                StopDownloading(index)
+
+                            stageQueues[stageIndex + 1].append((index, result))
+
+            except KeyboardInterrupt:
+
+                for executor in executors:
+                    executor.shutdown(wait = False, cancel_futures = True)
+
+                output.__exit__()
+
+                self._interface.ClearLine()
+                self._interface.Notice("Quitting...")
+
+                self._Quit()
+
+            finally:
+
+                for executor in executors:
+                    executor.shutdown(wait = False)
+
+                self._output = None
+
+        return results
+
+    def _GetRunIdentifier(self) -> str:
 
         ##
         #
-        # Processes a URL, in text mode.
+        # Identifies the run, using its input and its output directory (a run resuming another one has
+        # to use the same ones).
+        #
+        # @return The identifier.
+        #
+        ##
+
+        outputDirectoryPath = Path(expandvars(self._arguments.Output)).resolve()
+        runDescription = json.dumps([self._arguments.Input, str(outputDirectoryPath)])
+
+        return sha256(runDescription.encode()).hexdigest()[:16]
+
+    def _Quit(self) -> None:
+
+        ##
+        #
+        # Quits right away, without waiting for the worker threads (which would otherwise keep the
+        # interpreter running until they finish working on their stories). The journal, the library and
+        # the cache are closed first, so that the run can be resumed; running LibreOffice and Calibre
+        # processes are killed. The exit code (130, like a shell's for a process interrupted using
+        # SIGINT) tells scripts running the application that the run has been interrupted.
+        #
+        ##
+
+        KillProcesses()
+
+        self._libreOffice.Close(cancel = True)
+        self._calibre.Close(cancel = True)
+        self._formatterExecutor.shutdown(wait = False, cancel_futures = True)
+
+        self._journal.Close()
+        self._library.Close()
+        self._cache.Close()
+
+        sys.stdout.flush()
+        _exit(130)
+
+    def _RunStage(self, function: Callable[[Any], Any], value: Any) -> Any:
+
+        ##
+        #
+        # Runs a stage of the pipeline, handling the exceptions it throws (unless in debug mode).
+        #
+        # @param function The function of the stage.
+        # @param value    The value passed to the function (the result of the previous stage).
+        #
+        # @return The result of the function, or **None** if an exception has been thrown.
+        #
+        ##
+
+        if self._arguments.Debug:
+            return function(value)
+
+        try:
+
+            return function(value)
+
+        except ConnectionError as caughtException:
+
+            self._interface.Error(f"The website has refused connection: {caughtException}")
+            self._interface.GrabUserAttention()
+
+        except SSLError as caughtException:
+
+            self._interface.Error(f"An SSL error has occurred: {caughtException}")
+            self._interface.GrabUserAttention()
+
+        except CloudflareChallengeError as caughtException:
+
+            self._interface.Error("A Cloudflare challenge error has occurred. Try again later.")
+            self._interface.GrabUserAttention()
+
+        except FileNotFoundError as caughtException:
+
+            self._interface.Error(f"A filesystem exception has occurred: {caughtException}")
+            self._interface.GrabUserAttention()
+
+        except BaseException as caughtException:
+
+            self._interface.Error(f"An exception has been thrown: {caughtException}")
+            self._interface.GrabUserAttention()
+
+        return None
+
+    def _ScanURL(self, URL: str) -> Optional[Union[Extractor, bool]]:
+
+        ##
+        #
+        # Creates an extractor for a URL and scans the story (the first stage of the pipeline).
         #
         # @param URL The URL to be processed.
         #
-        # @return The Story object if the URL has been processed successfully, **None** otherwise.
+        # @return The extractor if the story has been scanned successfully, **True** if it has been
+        #         downloaded already, **None** if the scan has failed.
         #
         ##
 
@@ -284,13 +697,44 @@ class Application:
 
         self._interface.Comment(f'Extractor created: "{type(extractor).__name__}".')
 
+        # Stories present in the library are skipped without scanning them (unless they're to be
+        # overwritten or updated), as long as their output files still exist - and include the files of
+        # all the requested formats (recognized by their extensions).
+
+        if (not self._arguments.Force) and (not self._arguments.UpdateStories):
+
+            savedStory = self._library.RetrieveStory(extractor.Story.InputURL)
+
+            savedFormats =                                                             \
+                {x.suffix[1:].upper() for x in savedStory["OutputFilePaths"]}          \
+                if savedStory else                                                     \
+                set()
+
+            if (
+                savedStory and
+                savedFormats.issuperset(self._outputFormats) and
+                all(x.is_file() for x in savedStory["OutputFilePaths"])
+            ):
+                self._interface.Comment("This story has been downloaded already.", section = True)
+                return True
+
+        # Websites that require breaks between requests are subject to stricter limits.
+
+        if extractor.RequiresBreaksBetweenRequests():
+
+            for hostname in extractor.GetSupportedHostnames():
+                self._rateLimiter.SetLimits(hostname, self._arguments.RequestRate, self._arguments.RequestBurst)
+
         # Authenticate the user (if supported by the extractor).
 
         if self._arguments.Authenticate and extractor.SupportsAuthentication():
 
             self._interface.Process("Logging-in...", section = True)
 
-            authenticationResult = extractor.Authenticate(self._interface)
+            # The user might have to be asked for credentials - which requires printing directly.
+
+            with self._output.Exclusive():
+                authenticationResult = extractor.Authenticate(self._interface)
 
             if Extractor.AuthenticationResult.FAILURE == authenticationResult:
                 self._interface.Error("Failed to authenticate.")
@@ -299,140 +743,297 @@ class Application:
             else:
                 self._interface.Comment("Authenticated successfully.")
 
-        # Scan the story.
+        # Scan the story - or reuse the results of a recent scan, if there are any. In update mode, stories
+        # are always scanned again (a reused scan wouldn't contain recently added chapters).
 
         self._interface.Process("Scanning the story...", section = True)
 
-        if not extractor.ScanStory():
-            logging.error("Failed to scan the story.")
+        cacheScanOwnerName = extractor.Story.Metadata.URL
+
+        scanLifetime =                                    \
+            self._arguments.StoryScanLifetime / (24 * 60) \
+            if not self._arguments.UpdateStories else     \
+            0
+
+        # Stories scanned by the previous run (if it's being resumed) aren't scanned again, no matter how
+        # long ago that was.
+
+        if self._journal.GetState(URL) in [Journal.State.SCANNED, Journal.State.EXTRACTED]:
+            scanLifetime = None
+
+        scanState =                                                                                         \
+            self._cache.RetrieveItem(cacheScanOwnerName, "Scan", maximumAge = scanLifetime, kind = "Scan") \
+            if (scanLifetime is None) or (scanLifetime > 0) else                                            \
+            None
+
+        if scanState:
+
+            storyScanned = extractor.RestoreScanState(json.loads(Stringify(scanState)))
+            self._interface.Comment("Reusing the results of a recent scan.")
+
+        elif self._ScanStory(extractor, cacheScanOwnerName):
+
+            storyScanned = True
+
+        else:
+
             return None
 
         self._PrintMetadata(extractor.Story)
 
-        # Check whether the output files already exist.
+        # Check whether the output files of the requested formats already exist. In update mode, the
+        # output files of stories which have changed since they were saved (according to the library) are
+        # generated again. Only the files of the requested formats (and of the formats they're converted
+        # from) are ever removed.
 
         outputFilePaths = self._GetOutputPaths(self._arguments.Output, extractor.Story)
 
-        if (not self._arguments.Force) and all(x.is_file() for x in outputFilePaths.values()):
+        requestedFilePaths = [outputFilePaths[name] for name in self._outputFormats]
+        plannedFilePaths = [outputFilePaths[name] for name in PlanOutputFormats(self._outputFormats)]
+
+        if (
+            self._arguments.UpdateStories and
+            (not self._arguments.Force) and
+            any(x.is_file() for x in requestedFilePaths)
+        ):
+
+            if not self._PrepareStoryUpdate(extractor):
+                self._interface.Comment("This story is up to date.", section = True)
+                return True
+
+            [x.unlink() for x in plannedFilePaths if x.is_file()]
+
+        if (not self._arguments.Force) and all(x.is_file() for x in requestedFilePaths):
             self._interface.Comment("This story has been downloaded already.", section = True)
             return True
 
         elif self._arguments.Force:
-            [x.unlink() for x in outputFilePaths.values() if x.is_file()]
+            [x.unlink() for x in plannedFilePaths if x.is_file()]
+
+        # Some extractors need more than the results of the previous scan to extract the content.
+
+        if (not storyScanned) and (not self._ScanStory(extractor, cacheScanOwnerName)):
+            return None
+
+        return extractor
 
-        # Extract content.
+    def _ExtractChapters(self, extractor: Extractor) -> Optional[Extractor]:
+
+        ##
+        #
+        # Extracts the chapters of a scanned story (the second stage of the pipeline).
+        #
+        # @param extractor The extractor.
+        #
+        # @return The extractor if the chapters have been extracted successfully, **None** otherwise.
+        #
+        ##
 
         self._interface.Process("Extracting content...", section = True)
 
-        for index in range(1, extractor.Story.Metadata.ChapterCount + 1):
+        cacheOwnerName = extractor.Story.Metadata.URL
+        firstOutdatedChapterIndex = self._outdatedChapterIndices.pop(cacheOwnerName, None)
 
-            # Generate cache identifiers.
+        # The chapters of very large stories are moved to the spill area as soon as they're extracted, so
+        # that the content of the whole story is never kept in memory.
 
-            cacheOwnerName = extractor.Story.Metadata.URL
-            cacheTitleName = f"{index}-Title"
-            cacheContentName = f"{index}-Content"
+        spillChapters =                                                                   \
+            (self._arguments.SpillChapterCount is not None) and                           \
+            (extractor.Story.Metadata.ChapterCount >= self._arguments.SpillChapterCount)
 
-            # Retrieve chapter data, either from cache or by downloading it.
+        # In update mode, the chapters which haven't changed are taken from the cache - unless they aren't
+        # there anymore (the cache is cleared after runs without "-u" or "-persistent-cache").
+
+        if firstOutdatedChapterIndex is not None:
+
+            missingChapterCount = sum(
+                not self._cache.ContainsItem(cacheOwnerName, f"{index}-Content")
+                for index in range(1, firstOutdatedChapterIndex)
+            )
 
-            retrievedFromCache = False
+            if missingChapterCount:
+                self._interface.Notice(
+                    f"{missingChapterCount} unchanged chapter(s) aren't cached anymore; "
+                    "they will be downloaded again."
+                )
+
+        def RetrieveCachedChapter(index: int) -> Optional[Chapter]:
+
+            if (firstOutdatedChapterIndex is not None) and (index >= firstOutdatedChapterIndex):
+                return None
 
             chapter = Chapter(
-                title = Stringify(self._cache.RetrieveItem(cacheOwnerName, cacheTitleName)),
-                content = Stringify(self._cache.RetrieveItem(cacheOwnerName, cacheContentName))
+                title = Stringify(self._cache.RetrieveItem(cacheOwnerName, f"{index}-Title", kind = "Title")),
+                content = Stringify(self._cache.RetrieveItem(cacheOwnerName, f"{index}-Content", kind = "Content"))
             )
 
-            if chapter:
+            return chapter if chapter else None
 
-                retrievedFromCache = True
+        def RetrieveChapter(index: int) -> Tuple[Optional[Chapter], bool]:
 
-            else:
+            # Retrieve chapter data, either from cache or by downloading it.
+
+            if (chapter := RetrieveCachedChapter(index)):
+                return (chapter, True)
+
+            return (extractor.ExtractChapter(index), False)
+
+        async def RetrieveChapterAsync(index: int) -> Tuple[Optional[Chapter], bool]:
+
+            # The cache is accessed in a worker thread, so that it doesn't block the event loop.
+
+            if (chapter := await asyncio.get_running_loop().run_in_executor(None, RetrieveCachedChapter, index)):
+                return (chapter, True)
+
+            return (await extractor.ExtractChapterAsync(index, self._asyncWebSession), False)
+
+        # Chapters are retrieved in the background when possible (by the event loop or by worker threads),
+        # but processed in order. Only a few chapters are retrieved ahead of the one being processed, so
+        # that retrieved chapters don't pile up in memory (which happens quickly if they're cached).
+        # Chapters of stories which can't be downloaded concurrently are retrieved one at a time.
 
-                chapter = extractor.ExtractChapter(index)
+        chapterIndices = range(1, extractor.Story.Metadata.ChapterCount + 1)
+        chapterJobCount = self._GetChapterJobCount(extractor)
+
+        chapterExecutor = None
+        chapterFutures = {}
+        SubmitChapter = None
+
+        maximumChapterFutureCount = 2 * chapterJobCount if (chapterJobCount > 1) else 1
+
+        if self._eventLoop:
+
+            SubmitChapter = lambda index: self._eventLoop.Submit(RetrieveChapterAsync(index))
+
+        elif chapterJobCount > 1:
+
+            chapterExecutor = ThreadPoolExecutor(chapterJobCount)
+            SubmitChapter = lambda index: chapterExecutor.submit(RetrieveChapter, index)
+
+        submittedChapterIndices = iter(chapterIndices)
+
+        try:
+
+            for index in chapterIndices:
+
+                if SubmitChapter:
+
+                    while len(chapterFutures) < maximumChapterFutureCount:
+
+                        if (submittedIndex := next(submittedChapterIndices, None)) is None:
+                            break
+
+                        chapterFutures[submittedIndex] = SubmitChapter(submittedIndex)
+
+                chapter, retrievedFromCache =                                 \
+                    chapterFutures.pop(index).result() if chapterFutures else \
+                    RetrieveChapter(index)
 
                 if not chapter:
 
                     if (1 != index) and (extractor.Story.Metadata.ChapterCount != index):
                         logging.error("Failed to extract story content.")
+                        self._spillArea.RemoveStory(extractor.Story.InputURL)
                         return None
 
                     else:
                         self._interface.Error("Failed to extract the last chapter - it doesn't seem to exist.")
                         continue
 
-            extractor.Story.Chapters.append(chapter)
+                # Add the chapter to cache.
 
-            # Add the chapter to cache.
+                if not retrievedFromCache:
+                    self._cache.AddItem(cacheOwnerName, f"{index}-Title", chapter.Title, kind = "Title")
+                    self._cache.AddItem(cacheOwnerName, f"{index}-Content", chapter.Content, kind = "Content")
 
-            if not retrievedFromCache:
-                self._cache.AddItem(cacheOwnerName, cacheTitleName, chapter.Title)
-                self._cache.AddItem(cacheOwnerName, cacheContentName, chapter.Content)
+                if spillChapters:
+                    chapter = self._spillArea.SpillChapter(
+                        extractor.Story.InputURL,
+                        len(extractor.Story.Chapters) + 1,
+                        chapter
+                    )
 
-            # Notify the user, then sleep for a while.
+                extractor.Story.Chapters.append(chapter)
 
-            self._interface.ProgressBar(
-                index,
-                extractor.Story.Metadata.ChapterCount,
-                Configuration.ProgressBarLength,
-                f"# Extracted chapter {index}/{extractor.Story.Metadata.ChapterCount}",
-                True
-            )
+                # Notify the user.
 
-            if extractor.Story.Metadata.ChapterCount == index:
-                self._interface.EmptyLine()
+                self._interface.ProgressBar(
+                    index,
+                    extractor.Story.Metadata.ChapterCount,
+                    Configuration.ProgressBarLength,
+                    f"# Extracted chapter {index}/{extractor.Story.Metadata.ChapterCount}",
+                    True
+                )
 
-            if not retrievedFromCache and extractor.RequiresBreaksBetweenRequests():
-                sleep(Configuration.PostChapterSleepTime)
+                if extractor.Story.Metadata.ChapterCount == index:
+                    self._interface.EmptyLine()
 
-        # Locate and download images.
+        finally:
 
-        if self._arguments.Images:
+            # Don't keep downloading chapters that won't be used.
 
-            self._interface.Process("Downloading images...", section = True)
+            for future in chapterFutures.values():
+                future.cancel()
 
-            # Locate the images.
+            if chapterExecutor:
+                chapterExecutor.shutdown()
 
-            for chapter in extractor.Story.Chapters:
-                extractor.Story.Images.extend(FindImagesInCode(chapter.Content))
+        return extractor
 
-            storySiteURL = GetSiteURL(extractor.Story.Metadata.URL)
-            for image in extractor.Story.Images:
-                image.URL = MakeURLAbsolute(image.URL, storySiteURL)
+    def _RetrieveImages(self, extractor: Extractor) -> Extractor:
 
-            self._interface.Comment(f"Found {len(extractor.Story.Images)} image(s).")
+        ##
+        #
+        # Locates and downloads the images used in a story (the third stage of the pipeline), unless
+        # images are disabled.
+        #
+        # @param extractor The extractor.
+        #
+        # @return The extractor.
+        #
+        ##
 
-            # Download them.
+        if not self._arguments.Images:
+            return extractor
 
-            if extractor.Story.Images:
+        self._interface.Process("Downloading images...", section = True)
 
-                imageCount = len(extractor.Story.Images)
-                downloadedImageCount = 0
+        # Locate the images.
 
-                previousImageFailedToDownload = False
+        for chapter in extractor.Story.Chapters:
+            extractor.Story.Images.extend(FindImagesInCode(chapter.Content))
 
-                for index, image in enumerate(extractor.Story.Images, start = 1):
+        storySiteURL = GetSiteURL(extractor.Story.Metadata.URL)
+        for image in extractor.Story.Images:
+            image.URL = MakeURLAbsolute(image.URL, storySiteURL)
 
-                    retrievedFromCache = False
-                    imageData = self._cache.RetrieveItem(extractor.Story.Metadata.URL, image.URL)
+        self._interface.Comment(f"Found {len(extractor.Story.Images)} image(s).")
 
-                    if not image.CreateFromData(imageData, Configuration.MaximumImageSideLength):
+        # Download them. When requests are sent asynchronously, all the images are requested at once (the
+        # event loop limits the number of connections), but their results are printed in order.
 
-                        imageData = extractor.ExtractMedia(image.URL)
+        if extractor.Story.Images:
 
-                        if imageData:
-                            image.CreateFromData(imageData, Configuration.MaximumImageSideLength)
+            imageCount = len(extractor.Story.Images)
+            downloadedImageCount = 0
 
-                    else:
+            previousImageFailedToDownload = False
 
-                        retrievedFromCache = True
+            imageFutures = [
+                self._eventLoop.Submit(self._RetrieveImageAsync(extractor, image))
+                for image in extractor.Story.Images
+            ] if self._eventLoop else []
 
-                    if image:
+            try:
+
+                for index, image in enumerate(extractor.Story.Images, start = 1):
 
-                        if not retrievedFromCache:
-                            self._cache.AddItem(
-                                extractor.Story.Metadata.URL,
-                                image.URL,
-                                image.Data
-                            )
+                    imageDownloaded =                           \
+                        imageFutures[index - 1].result()        \
+                        if imageFutures else                    \
+                        self._RetrieveImage(extractor, image)
+
+                    if image:
 
                         self._interface.ProgressBar(
                             index,
@@ -455,23 +1056,45 @@ class Application:
 
                         errorMessage =                                                       \
                             f'Failed to download image {index}/{imageCount}: "{image.URL}".' \
-                            if not imageData else                                            \
+                            if not imageDownloaded else                                      \
                             f'Failed to process/re-encode image {index}/{imageCount}: "{image.URL}".'
 
                         self._interface.Error(errorMessage)
 
                         previousImageFailedToDownload = True
 
-                self._interface.Comment(
-                    f"Successfully downloaded {downloadedImageCount}/{imageCount} image(s)."
-                )
+            finally:
+
+                # Don't keep downloading images that won't be used.
 
-        # Process content.
+                for future in imageFutures:
+                    future.cancel()
+
+            self._interface.Comment(
+                f"Successfully downloaded {downloadedImageCount}/{imageCount} image(s)."
+            )
+
+        return extractor
+
+    def _ProcessContent(self, extractor: Extractor) -> Story:
+
+        ##
+        #
+        # Processes the content of a downloaded story (the fourth stage of the pipeline).
+        #
+        # @param extractor The extractor.
+        #
+        # @return The story.
+        #
+        ##
 
         self._interface.Process("Processing content...", section = True)
 
         extractor.Story.Process()
 
+        cacheOwnerName = extractor.Story.Metadata.URL
+        unprocessedChapters = []
+
         for index, chapter in enumerate(extractor.Story.Chapters, start = 1):
 
             # Store original content.
@@ -486,17 +1109,43 @@ class Application:
                     chapter.Content
                 )
 
-            # The sanitizer is used twice - once before any other processing, once after every other
-            # processor. The first time is required to clean up the story (remove empty tags and tag
-            # trees, for example), the second to guarantee that the story is actually sanitized.
+            # Processed content is cached, keyed by the hash of the original content and the version of
+            # the processing pipeline - so re-processing only happens when either of them changes.
 
-            chapter.Content = SanitizerProcessor().Process(chapter.Content)
-            chapter.Content = TypographyProcessor().Process(chapter.Content)
-            chapter.Content = SanitizerProcessor().Process(chapter.Content)
+            contentHash = sha256(chapter.Content.encode()).hexdigest()
+            cacheProcessedContentName = f"Processed-{GetContentProcessingVersion()}-{contentHash}"
 
-            # Store processed content.
+            processedContent = self._cache.RetrieveItem(
+                cacheOwnerName,
+                cacheProcessedContentName,
+                kind = "Processed"
+            )
 
-            if self._arguments.Debug:
+            if processedContent:
+                chapter.Content = Stringify(processedContent)
+            else:
+                unprocessedChapters.append((chapter, cacheProcessedContentName))
+
+        # Process the content missing from the cache (in batches of many chapters, so that it can be done
+        # in parallel, but without keeping the content of the whole story in memory at once).
+
+        batchSize = Configuration.ProcessingBatchSize
+
+        for batchStart in range(0, len(unprocessedChapters), batchSize):
+
+            batch = unprocessedChapters[batchStart:batchStart + batchSize]
+            processedContents = self._ProcessChapterContents([chapter.Content for chapter, _ in batch])
+
+            for (chapter, cacheProcessedContentName), processedContent in zip(batch, processedContents):
+
+                chapter.Content = processedContent
+                self._cache.AddItem(cacheOwnerName, cacheProcessedContentName, processedContent, kind = "Processed")
+
+        # Store processed content.
+
+        if self._arguments.Debug:
+
+            for index, chapter in enumerate(extractor.Story.Chapters, start = 1):
 
                 fileName = GetSanitizedFileName(f"{index} - Processed.html")
                 fileSubdirectoryName = GetSanitizedFileName(extractor.Story.Metadata.Title)
@@ -511,11 +1160,303 @@ class Application:
 
         self._interface.Comment("Content processed.")
 
-        # Return.
-
         return extractor.Story
 
-    def _FormatAndSaveStoryOrPackage(self, story: Union[Story, StoryPackage]) -> bool:
+    def _SpillStory(self, story: Story) -> Story:
+
+        ##
+        #
+        # Moves a story which is to be packed to the spill area (the last stage of the pipeline in pack
+        # mode), so that its content doesn't have to be kept in memory until all the stories are packed.
+        #
+        # @param story The story.
+        #
+        # @return The story, with its content stored in the spill area.
+        #
+        ##
+
+        self._interface.Process("Storing the story until it's packed...", section = True)
+
+        return self._spillArea.SpillStory(story)
+
+    def _RestoreSpilledStory(self, URL: str) -> Optional[Story]:
+
+        ##
+        #
+        # Restores a story stored in the spill area by the previous run (if it's being resumed).
+        #
+        # @param URL The URL of the story.
+        #
+        # @return The story, or **None** if it isn't present in the spill area.
+        #
+        ##
+
+        if not (extractor := CreateExtractor(URL)):
+            return None
+
+        return self._spillArea.RestoreStory(extractor.Story.InputURL)
+
+    def _ProcessChapterContents(self, contents: List[str]) -> List[str]:
+
+        ##
+        #
+        # Processes the content of many chapters. Processing is CPU-bound, so (if there's more than one
+        # chapter) it's done by a pool of processes, shared by all the stories processed at once. Chapters
+        # are sent to the processes in batches.
+        #
+        # @param contents The content of the chapters.
+        #
+        # @return The processed content, in the same order.
+        #
+        ##
+
+        processCount = Configuration.ProcessingJobs or cpu_count() or 1
+
+        if (len(contents) < 2) or (processCount < 2):
+            return [ProcessContent(content) for content in contents]
+
+        # Processes are spawned (instead of being forked), as forking a multithreaded process isn't safe.
+
+        with self._processPoolLock:
+
+            if not self._processPool:
+                self._processPool = ProcessPoolExecutor(processCount, mp_context = get_context("spawn"))
+
+        chunkSize = max(1, len(contents) // (processCount * 4))
+
+        return list(self._processPool.map(ProcessContent, contents, chunksize = chunkSize))
+
+    def _GetChapterJobCount(self, extractor: Extractor) -> int:
+
+        ##
+        #
+        # Determines how many chapters of a story can be retrieved at once.
+        #
+        # @param extractor The extractor.
+        #
+        # @return The number of chapters.
+        #
+        ##
+
+        if not extractor.SupportsConcurrentExtraction():
+            return 1
+
+        jobCount = Configuration.ChapterJobs
+
+        if extractor.RequiresBreaksBetweenRequests():
+            _, burst = self._rateLimiter.GetLimits(extractor.Story.Metadata.URL)
+            jobCount = min(jobCount, burst)
+
+        return max(1, jobCount)
+
+    def _ScanStory(self, extractor: Extractor, cacheOwnerName: str) -> bool:
+
+        ##
+        #
+        # Scans the story, then stores the results of the scan in the cache.
+        #
+        # @param extractor      The extractor.
+        # @param cacheOwnerName The cache namespace in which the results are to be stored.
+        #
+        # @return **True** if the story has been scanned successfully, **False** otherwise.
+        #
+        ##
+
+        if not extractor.ScanStory():
+            logging.error("Failed to scan the story.")
+            return False
+
+        if (scanState := extractor.GetScanState()):
+            self._cache.AddItem(cacheOwnerName, "Scan", json.dumps(scanState), kind = "Scan")
+
+        return True
+
+    def _PrepareStoryUpdate(self, extractor: Extractor) -> bool:
+
+        ##
+        #
+        # Compares a freshly scanned story with the one saved previously. If the story has changed,
+        # determines which chapters have to be downloaded again (only the new ones, if possible).
+        #
+        # @param extractor The extractor.
+        #
+        # @return **True** if the story has changed since it was saved (or if it's unknown what was
+        #         saved), **False** otherwise.
+        #
+        ##
+
+        cacheOwnerName = extractor.Story.Metadata.URL
+        savedStory = self._library.RetrieveStory(extractor.Story.InputURL)
+
+        if not savedStory:
+            self._interface.Comment("It's unknown what has been saved, the story will be saved again.")
+            return True
+
+        savedChapterCount = savedStory["ChapterCount"]
+
+        chapterCount = extractor.Story.Metadata.ChapterCount
+        dateUpdated = extractor.Story.Metadata.DateUpdated
+
+        if (chapterCount == savedChapterCount) and (dateUpdated == savedStory["DateUpdated"]):
+            return False
+
+        # New chapters are downloaded. If no chapters have been added, the last one might have been
+        # modified. If some chapters have been removed, it's impossible to tell which ones.
+
+        if chapterCount > savedChapterCount:
+            self._outdatedChapterIndices[cacheOwnerName] = savedChapterCount + 1
+        elif chapterCount == savedChapterCount:
+            self._outdatedChapterIndices[cacheOwnerName] = chapterCount
+        else:
+            self._outdatedChapterIndices[cacheOwnerName] = 1
+
+        self._interface.Comment(
+            f"The story has been updated ({savedChapterCount} -> {chapterCount} chapter(s)), "
+            f"downloading chapters from {self._outdatedChapterIndices[cacheOwnerName]} onwards."
+        )
+
+        return True
+
+    def _AddStoryToLibrary(self, story: Story, outputFilePaths: Dict, contentHash: str) -> None:
+
+        ##
+        #
+        # Adds a saved story to the library, along with the output files which exist.
+        #
+        # @param story           The story.
+        # @param outputFilePaths The paths of the output files (see _GetOutputPaths()).
+        # @param contentHash     The hash of the content of the story (see _GetContentHash()).
+        #
+        ##
+
+        self._library.AddStory(
+            story.InputURL,
+            [x for name, x in outputFilePaths.items() if ("Directory" != name) and x.is_file()],
+            story.Metadata.DateUpdated,
+            story.Metadata.ChapterCount,
+            contentHash
+        )
+
+    @staticmethod
+    def _GetContentHash(story: Story) -> str:
+
+        ##
+        #
+        # Calculates the hash of the content of a story (the titles and the content of its chapters).
+        #
+        # @param story The story.
+        #
+        # @return The hash.
+        #
+        ##
+
+        contentHash = sha256()
+
+        for chapter in story.Chapters:
+            contentHash.update((chapter.Title or "").encode())
+            contentHash.update((chapter.Content or "").encode())
+
+        return contentHash.hexdigest()
+
+    def _RetrieveImage(self, extractor: Extractor, image: Image) -> bool:
+
+        ##
+        #
+        # Retrieves an image and re-encodes it. Images are cached globally, under their own (absolute) URLs, so that
+        # the ones shared by many stories are downloaded only once. Re-encoded images are cached along with the source
+        # data, under names containing the hash of the source and the encoding parameters.
+        #
+        # @param extractor The extractor used to download the image.
+        # @param image     The image.
+        #
+        # @return **True** if the source image data has been obtained, **False** otherwise.
+        #
+        ##
+
+        sourceData = self._cache.RetrieveItem(image.URL, "Source", kind = "Image")
+
+        if not sourceData:
+
+            sourceData = extractor.ExtractMedia(image.URL)
+            if not sourceData:
+                return False
+
+            self._cache.AddItem(image.URL, "Source", sourceData, kind = "Image")
+
+        self._EncodeImage(image, sourceData)
+
+        return True
+
+    async def _RetrieveImageAsync(self, extractor: Extractor, image: Image) -> bool:
+
+        ##
+        #
+        # Retrieves an image and re-encodes it (see _RetrieveImage()), asynchronously. The image is
+        # downloaded by the event loop; the cache is accessed (and the image is re-encoded) in a worker
+        # thread, so that the event loop isn't blocked.
+        #
+        # @param extractor The extractor used to download the image.
+        # @param image     The image.
+        #
+        # @return **True** if the source image data has been obtained, **False** otherwise.
+        #
+        ##
+
+        loop = asyncio.get_running_loop()
+
+        sourceData = await loop.run_in_executor(
+            None,
+            lambda: self._cache.RetrieveItem(image.URL, "Source", kind = "Image")
+        )
+
+        if not sourceData:
+
+            sourceData = await extractor.ExtractMediaAsync(image.URL, self._asyncWebSession)
+            if not sourceData:
+                return False
+
+            await loop.run_in_executor(
+                None,
+                lambda: self._cache.AddItem(image.URL, "Source", sourceData, kind = "Image")
+            )
+
+        await loop.run_in_executor(None, self._EncodeImage, image, sourceData)
+
+        return True
+
+    def _EncodeImage(self, image: Image, sourceData: bytes) -> None:
+
+        ##
+        #
+        # Re-encodes an image, using the cached result if there is one.
+        #
+        # @param image      The image.
+        # @param sourceData The source image data.
+        #
+        ##
+
+        side = Configuration.MaximumImageSideLength
+        quality = Configuration.ImageQuality
+        encodedImageName = f"Encoded-{sha256(sourceData).hexdigest()}-{side}-{quality}"
+
+        if image.CreateFromEncodedData(self._cache.RetrieveItem(image.URL, encodedImageName, kind = "Image")):
+            return
+
+        if image.CreateFromData(sourceData, side, quality):
+            self._cache.AddItem(image.URL, encodedImageName, image.Data, kind = "Image")
+
+    def _FormatAndSaveStoryOrPackage(self, story: Union[Story, StoryPackage]) -> Union[bool, Future]:
+
+        ##
+        #
+        # Formats a story (or a package of stories) and saves the output files.
+        #
+        # @param story The story (or the package).
+        #
+        # @return **True**, or a future if some output file is still being generated in the background
+        #         (resolved once it has been generated, and the result has been printed).
+        #
+        ##
 
         # Notify the user.
 
@@ -531,109 +1472,270 @@ class Application:
         filePaths = self._GetOutputPaths(self._arguments.Output, story)
         filePaths["Directory"].mkdir(parents = True, exist_ok = True)
 
-        # Format and save the stories to HTML.
+        # Prepare the output formats: each one is generated by a task, started once the tasks it depends
+        # on have finished (so that independent formats are generated in parallel). The formats each one
+        # is converted from are listed in OutputFormatSources. The first page of the PDF file is used as
+        # the cover of the EPUB file (optionally, if the PDF file is generated anyway).
+
+        isPackage = isinstance(story, StoryPackage)
+        images = self._arguments.Images
+
+        def SaveAsEPUB() -> bool:
+
+            coverImageData =                                                          \
+                RenderPDFPageToBytes(filePaths["PDF"], 0)                             \
+                if Configuration.EPUBCoverFromPDF and filePaths["PDF"].is_file() else \
+                None
+
+            return FormatterEPUB(images, coverImageData).FormatAndSave(story, filePaths["EPUB"])
+
+        formats = [
+            (
+                "HTML",
+                lambda: FormatterHTML(images).FormatAndSave(story, filePaths["HTML"]),
+                []
+            ),
+            (
+                "ODT",
+                lambda: FormatterODT(images, isPackage).FormatAndSave(story, filePaths["ODT"]),
+                []
+            ),
+            (
+                "PDF",
+                lambda: FormatterPDF(images).ConvertFromODT(
+                    filePaths["ODT"],
+                    filePaths["PDF"].parent,
+                    self._libreOffice
+                ),
+                []
+            ),
+            (
+                "EPUB",
+                SaveAsEPUB,
+                ["PDF"] if Configuration.EPUBCoverFromPDF else []
+            ),
+            (
+                "MOBI",
+                lambda: FormatterMOBI(images).ConvertFromEPUB(
+                    filePaths["EPUB"],
+                    filePaths["MOBI"].parent,
+                    self._calibre
+                ),
+                []
+            ),
+        ]
+
+        # Only the requested formats are generated, along with the ones they're converted from (the
+        # intermediate formats, removed once they aren't needed anymore). Output files which already exist
+        # (and unavailable formats) are skipped.
+
+        missingFormats = []
+
+        for name in OutputFormatSources:
+
+            if name not in self._arguments.OutputFormats:
+                continue
+
+            elif name not in self._outputFormats:
+                self._interface.Comment(f"Saving as {name}... This output format is unavailable.")
+
+            elif filePaths[name].is_file():
+                self._interface.Comment(f"Saving as {name}... Output file already exists.")
 
-        self._interface.Comment("Saving as HTML... ", end = "")
+            else:
+                missingFormats.append(name)
 
-        formatter = FormatterHTML(self._arguments.Images)
-        if not filePaths["HTML"].is_file():
+        plannedFormats = PlanOutputFormats(missingFormats)
+        intermediateFormats = [x for x in plannedFormats if x not in self._arguments.OutputFormats]
 
-            if not formatter.FormatAndSave(story, filePaths["HTML"]):
-                self._interface.Text("Failed!")
+        taskGraph = TaskGraph()
 
-            else:
-                self._interface.Text("Done!")
+        for name, function, optionalDependencies in formats:
 
-        else:
+            if (name in plannedFormats) and not filePaths[name].is_file():
+                taskGraph.AddTask(name, function, OutputFormatSources[name], optionalDependencies)
 
-            self._interface.Text("Output file already exists.")
+        # Format and save the story. PDF files and MOBI files are converted in the background, by
+        # LibreOffice and Calibre (conversions take long, and many of them can be performed at once): this
+        # stage doesn't wait for them, so that the next stories can be formatted in the meantime.
 
-        # Format and save the stories to ODT.
+        outputChannel = self._output.GetChannel() if self._output else None
 
-        self._interface.Comment("Saving as ODT... ", end = "")
+        def PrintResult(name: str, result: Optional[bool]) -> None:
+            with self._output.Channel(outputChannel) if (outputChannel is not None) else nullcontext():
+                self._interface.Comment(f"Saving as {name}... {'Done!' if result else 'Failed!'}")
 
-        formatter = FormatterODT(self._arguments.Images, isinstance(story, StoryPackage))
-        if not filePaths["ODT"].is_file():
+        contentHash = self._GetContentHash(story) if not isPackage else None
 
-            if not formatter.FormatAndSave(story, filePaths["ODT"]):
-                self._interface.Text("Failed!")
+        tasksFinished = taskGraph.Run(self._formatterExecutor, PrintResult)
 
-            else:
-                self._interface.Text("Done!")
+        def FinishSaving(results: Dict[str, Optional[bool]]) -> None:
 
-        else:
+            # Remove the intermediate files generated by this run.
 
-            self._interface.Text("Output file already exists.")
+            for name in intermediateFormats:
+                if name in results:
+                    filePaths[name].unlink(missing_ok = True)
 
-        # Format and save the stories to PDF.
+            # Add the story to the library. The content of the story isn't needed anymore, so it's
+            # removed from the spill area (if it's been stored there).
 
-        self._interface.Comment("Saving as PDF... ", end = "")
+            if isPackage:
+                return
 
-        coverImageData = None
+            if all(results.values()):
+                self._AddStoryToLibrary(story, filePaths, contentHash)
 
-        formatter = FormatterPDF(self._arguments.Images)
+            self._spillArea.RemoveStory(story.InputURL)
 
-        if not self._arguments.LibreOffice.is_file():
+        if tasksFinished.done():
+            FinishSaving(tasksFinished.result())
+            return True
 
-            self._interface.Text("This output format is unavailable.")
+        savingFinished = Future()
 
-        elif not filePaths["PDF"].is_file():
+        def OnTasksFinished(tasksFinished: Future) -> None:
 
-            if not formatter.ConvertFromODT(filePaths["ODT"], filePaths["PDF"].parent, self._arguments.LibreOffice):
-                self._interface.Text("Failed!")
+            try:
 
-            else:
-                self._interface.Text("Done!")
+                FinishSaving(tasksFinished.result())
 
-        else:
+            finally:
 
-            self._interface.Text("Output file already exists.")
+                savingFinished.set_result(True)
 
-        if filePaths["PDF"].is_file():
-            coverImageData = RenderPDFPageToBytes(filePaths["PDF"], 0)
+        tasksFinished.add_done_callback(OnTasksFinished)
 
-        # Format and save the stories to EPUB.
+        return savingFinished
 
-        self._interface.Comment("Saving as EPUB... ", end = "")
+    def _CollectCacheGarbage(self) -> None:
 
-        formatter = FormatterEPUB(self._arguments.Images, coverImageData)
-        if not filePaths["EPUB"].is_file():
+        ##
+        #
+        # Removes expired items from the cache and evicts stories exceeding its limits.
+        #
+        ##
 
-            if not formatter.FormatAndSave(story, filePaths["EPUB"]):
-                self._interface.Text("Failed!")
+        self._interface.Process("Collecting cache garbage...", section = True)
 
-            else:
-                self._interface.Text("Done!")
+        initialSize = self._cache.GetSize()
+        removedItemCount = self._cache.CollectGarbage()
+        freedSize = initialSize - self._cache.GetSize()
 
-        else:
+        self._interface.Comment(
+            f"Removed {removedItemCount} item(s), freed {freedSize / (1024 * 1024):.1f} MB. "
+            f"{self._cache.GetItemCount()} item(s) remaining."
+        )
 
-            self._interface.Text("Output file already exists.")
+    def _ImportCache(self, filePath: Path) -> None:
 
-        # Format and save the story to MOBI.
+        ##
+        #
+        # Imports a cache bundle.
+        #
+        # @param filePath The path to the bundle file.
+        #
+        ##
 
-        self._interface.Comment("Saving as MOBI... ", end = "")
+        self._interface.Process(f'Importing the cache from "{filePath}"...', section = True)
 
-        formatter = FormatterMOBI(self._arguments.Images)
+        try:
 
-        if not FindExecutable("ebook-convert"):
+            with open(filePath, "rb") as file:
+                importedItemCount = self._cache.Import(file)
 
-            self._interface.Text("This output format is unavailable.")
+        except (OSError, TarError, ValueError) as caughtException:
 
-        elif not filePaths["MOBI"].is_file():
+            self._interface.Error(f"Failed to import the cache: {caughtException}")
+            return
 
-            if not formatter.ConvertFromEPUB(filePaths["EPUB"], filePaths["MOBI"].parent):
-                self._interface.Text("Failed!")
+        self._interface.Comment(f"Imported {importedItemCount} item(s).")
 
-            else:
-                self._interface.Text("Done!")
+    def _ExportCache(self, filePath: Path) -> None:
 
-        else:
+        ##
+        #
+        # Exports the contents of the cache to a bundle.
+        #
+        # @param filePath The path to the bundle file.
+        #
+        ##
 
-            self._interface.Text("Output file already exists.")
+        self._interface.Process(f'Exporting the cache to "{filePath}"...', section = True)
 
-        # Return.
+        try:
 
-        return True
+            with open(filePath, "wb") as file:
+                exportedItemCount = self._cache.Export(file, self._arguments.CacheExportFilter)
+
+        except (OSError, TarError) as caughtException:
+
+            self._interface.Error(f"Failed to export the cache: {caughtException}")
+            return
+
+        self._interface.Comment(f"Exported {exportedItemCount} item(s).")
+
+    def _PrintCacheStatistics(self, statistics: List[Dict], title: str) -> None:
+
+        ##
+        #
+        # Prints the statistics of the cache's usage, summed up per item kind and per host.
+        #
+        # @param statistics The statistics (see Cache.GetStatistics()).
+        # @param title      The title of the section.
+        #
+        ##
+
+        self._interface.Process(title, section = True)
+
+        if not statistics:
+            self._interface.Comment("The cache hasn't been used yet.")
+            return
+
+        def FormatSize(size: int) -> str:
+
+            return                                      \
+                f"{size / (1024 * 1024):.1f} MB"        \
+                if size >= 1024 * 1024 else             \
+                f"{size / 1024:.1f} KB"
+
+        for groupingKey in ["Kind", "Host"]:
+
+            totals = {}
+
+            for entry in statistics:
+
+                groupTotals = totals.setdefault(entry[groupingKey] or "?", {})
+
+                for key, value in entry.items():
+                    if key not in ["Host", "Kind"]:
+                        groupTotals[key] = groupTotals.get(key, 0) + value
+
+            rows = [[groupingKey, "Hits", "Remote hits", "Misses", "Hit rate", "Read", "Written", "Time"]]
+
+            for name, groupTotals in sorted(totals.items()):
+
+                hitCount = groupTotals["Hits"] + groupTotals["RemoteHits"]
+                lookupCount = hitCount + groupTotals["Misses"]
+
+                hitRate =                                  \
+                    f"{100 * hitCount / lookupCount:.0f}%" \
+                    if lookupCount else                    \
+                    "-"
+
+                rows.append([
+                    name,
+                    str(groupTotals["Hits"]),
+                    str(groupTotals["RemoteHits"]),
+                    str(groupTotals["Misses"]),
+                    hitRate,
+                    FormatSize(groupTotals["BytesRead"]),
+                    FormatSize(groupTotals["BytesWritten"]),
+                    f"{groupTotals['Time']:.1f} s",
+                ])
+
+            self._interface.EmptyLine()
+            self._interface.Table(rows, alignment = "l" + "r" * (len(rows[0]) - 1))
 
     def _PrintMetadata(self, story: Story) -> None:
 
@@ -698,16 +1800,22 @@ class Application:
 
         notices = []
 
-        if not FindExecutable("ebook-convert"):
+        if ("MOBI" in self._arguments.OutputFormats) and not FindExecutable("ebook-convert"):
             notices.append(
                 "\"Calibre\" doesn't seem to be installed on this machine. MOBI output files will not "
                 "be generated."
             )
 
-        if not self._arguments.LibreOffice.is_file():
+        if ("PDF" in self._arguments.OutputFormats) and not self._arguments.LibreOffice.is_file():
             notices.append(
                 "\"LibreOffice\" doesn't seem to be installed on this machine. PDF output files will "
                 "not be generated."
             )
 
+        if self._arguments.AsyncRequests and not AsyncWebSession.IsAvailable():
+            notices.append(
+                "The \"aiohttp\" package doesn't seem to be installed. Chapters will be downloaded using "
+                "worker threads instead of asynchronous requests."
+            )
+
         return notices
\ No newline at end of file
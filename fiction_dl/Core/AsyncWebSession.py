@@ -0,0 +1,193 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Core.RateLimiter import RateLimiter
+
+# Standard packages.
+
+import asyncio
+import logging
+from typing import Dict, Optional, Union
+
+# Non-standard packages.
+
+from dreamy_utilities.Text import Stringify
+from dreamy_utilities.WebSession import DEFAULT_TEXT_ENCODING
+
+try:
+
+    import aiohttp
+
+except ImportError:
+
+    aiohttp = None
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# An asynchronous web session, backed by a pool of connections shared by all the hosts. Its coroutines
+# have to be run by one event loop (see EventLoop). Requires the *aiohttp* package.
+#
+# The session doesn't store any state related to specific websites: the user agent and the cookies are
+# passed along with every request.
+#
+##
+
+class AsyncWebSession:
+
+    def __init__(
+        self,
+        connectionLimit: int,
+        connectionLimitPerHost: int,
+        rateLimiter: Optional[RateLimiter] = None
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param connectionLimit        The maximum number of connections open at once.
+        # @param connectionLimitPerHost The maximum number of connections open at once to one host.
+        # @param rateLimiter            The rate limiter. Optional: if there's none, requests aren't
+        #                               limited.
+        #
+        ##
+
+        self._connectionLimit = connectionLimit
+        self._connectionLimitPerHost = connectionLimitPerHost
+        self._rateLimiter = rateLimiter
+
+        self._session = None
+
+    @staticmethod
+    def IsAvailable() -> bool:
+
+        ##
+        #
+        # Checks whether asynchronous web sessions can be used (i.e. whether *aiohttp* is installed).
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        return aiohttp is not None
+
+    async def Get(
+        self,
+        URL: str,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING,
+        userAgent: str = "",
+        cookies: Optional[Dict[str, str]] = None
+    ) -> Optional[Union[bytes, str]]:
+
+        ##
+        #
+        # Sends a GET request, once the rate limiter allows it.
+        #
+        # @param URL          The URL.
+        # @param text         Return the response as text (instead of bytes).
+        # @param textEncoding The encoding of the text.
+        # @param userAgent    The user agent.
+        # @param cookies      The cookies. Optional.
+        #
+        # @return The response, or **None** if the request has failed.
+        #
+        ##
+
+        if self._rateLimiter and (delay := self._rateLimiter.Reserve(URL)) > 0:
+            await asyncio.sleep(delay)
+
+        try:
+
+            async with self._GetSession().get(
+                URL,
+                headers = {"User-Agent": userAgent},
+                cookies = cookies
+            ) as response:
+
+                if 200 != response.status:
+                    return None
+
+                data = await response.read()
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as caughtException:
+
+            logging.error(f'Failed to send a request: "{URL}" ({caughtException or "timeout"}).')
+            return None
+
+        return Stringify(data, encoding = textEncoding) if text else data
+
+    async def Close(self) -> None:
+
+        ##
+        #
+        # Closes all the connections.
+        #
+        ##
+
+        if self._session:
+
+            await self._session.close()
+            self._session = None
+
+    def _GetSession(self) -> "aiohttp.ClientSession":
+
+        ##
+        #
+        # Returns the underlying session, creating it if necessary (it has to be created by a coroutine
+        # run by the event loop that's going to use it).
+        #
+        # @return The session.
+        #
+        ##
+
+        if not self._session:
+
+            self._session = aiohttp.ClientSession(
+                connector = aiohttp.TCPConnector(
+                    limit = self._connectionLimit,
+                    limit_per_host = self._connectionLimitPerHost
+                ),
+                cookie_jar = aiohttp.DummyCookieJar(),
+                timeout = aiohttp.ClientTimeout(total = self._Timeout)
+            )
+
+        return self._session
+
+    # The timeout of a request (including reading the response), in seconds.
+    _Timeout = 60.0
\ No newline at end of file
@@ -0,0 +1,477 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from hashlib import sha256
+import os
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Callable, Optional, Set, Tuple
+import zlib
+
+# Non-standard packages.
+
+from dreamy_utilities.Filesystem import GetUniqueFileName
+
+try:
+
+    import zstandard
+
+except ImportError:
+
+    zstandard = None
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A content-addressed store of binary data. Every piece of data is stored once, in a file named
+# after its hash, no matter how many cache items refer to it; the number of such references is
+# tracked and the file is deleted once it drops to zero. Data that compresses well is compressed
+# (using zstd, if available, or zlib otherwise).
+#
+# Files are written atomically, so a reader never encounters a partially written one. Files of released
+# data are only deleted once the transaction releasing it has been committed, and only if the data
+# hasn't been stored again in the meantime (see Commit()); files written in transactions which have been
+# rolled back are removed by CollectOrphans().
+#
+##
+
+class BlobStore:
+
+    def __init__(self, directoryPath: Path, connection: Callable[[], sqlite3.Connection]) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param directoryPath The path of the directory in which the data will be stored. It will be
+        #                      created if necessary.
+        # @param connection    A function returning the connection to the database in which the list
+        #                      of blobs is kept. Changes made by the store are *not* committed - that's
+        #                      up to the owner of the connection.
+        #
+        ##
+
+        self._directoryPath = directoryPath
+        self._connection = connection
+
+        self._threadData = threading.local()
+
+        self._directoryPath.mkdir(parents = True, exist_ok = True)
+
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS Blobs ("
+            "    Hash TEXT NOT NULL PRIMARY KEY,"
+            "    Compression TEXT NOT NULL,"
+            "    Size INTEGER NOT NULL,"
+            "    StoredSize INTEGER NOT NULL,"
+            "    ReferenceCount INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+
+    def Add(self, data: bytes) -> str:
+
+        ##
+        #
+        # Stores the data (unless it's already present) and adds a reference to it.
+        #
+        # @param data The data.
+        #
+        # @return The hash of the data, to be used to retrieve it.
+        #
+        ##
+
+        hash = sha256(data).hexdigest()
+
+        if self._AddReference(hash):
+            return hash
+
+        compression, storedData = self._Compress(data)
+        self._Store(hash, compression, len(data), storedData)
+
+        return hash
+
+    def AddStored(self, hash: str, compression: str, storedData: bytes) -> bool:
+
+        ##
+        #
+        # Stores data in the form returned by RetrieveStored() (unless it's already present) and adds a
+        # reference to it. The data is verified before being stored.
+        #
+        # @param hash        The hash of the data.
+        # @param compression The name of the compression method used.
+        # @param storedData  The (possibly compressed) data.
+        #
+        # @return **True** if the data has been stored, **False** if it's invalid (or compressed using
+        #         an unsupported method).
+        #
+        ##
+
+        if self._AddReference(hash):
+            return True
+
+        try:
+
+            data = self._Decompress(compression, storedData)
+
+        except Exception:
+
+            data = None
+
+        if (data is None) or (sha256(data).hexdigest() != hash):
+            return False
+
+        self._Store(hash, compression, len(data), storedData)
+
+        return True
+
+    def Retrieve(self, hash: str) -> Optional[bytes]:
+
+        ##
+        #
+        # Reads stored data.
+        #
+        # @param hash The hash of the data.
+        #
+        # @return The data, or **None** if it isn't present in the store (or can't be read).
+        #
+        ##
+
+        row = self._connection().execute(
+            "SELECT Compression FROM Blobs WHERE Hash = ?",
+            (hash,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        try:
+
+            with open(self._GetFilePath(hash), "rb") as file:
+                return self._Decompress(row[0], file.read())
+
+        except Exception:
+
+            # Either the file is missing or its content is corrupted.
+
+            return None
+
+    def RetrieveStored(self, hash: str) -> Optional[Tuple[str, bytes]]:
+
+        ##
+        #
+        # Reads stored data without decompressing it.
+        #
+        # @param hash The hash of the data.
+        #
+        # @return A tuple: the name of the compression method used, and the (possibly compressed) data;
+        #         **None** if the data isn't present in the store (or can't be read).
+        #
+        ##
+
+        row = self._connection().execute(
+            "SELECT Compression FROM Blobs WHERE Hash = ?",
+            (hash,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        try:
+
+            with open(self._GetFilePath(hash), "rb") as file:
+                return (row[0], file.read())
+
+        except OSError:
+
+            return None
+
+    def Release(self, hash: str) -> None:
+
+        ##
+        #
+        # Removes a reference to stored data. The data is deleted once nothing refers to it.
+        #
+        # @param hash The hash of the data.
+        #
+        ##
+
+        self._connection().execute(
+            "UPDATE Blobs SET ReferenceCount = ReferenceCount - 1 WHERE Hash = ?",
+            (hash,)
+        )
+
+        row = self._connection().execute(
+            "SELECT ReferenceCount FROM Blobs WHERE Hash = ?",
+            (hash,)
+        ).fetchone()
+
+        if row and (row[0] <= 0):
+
+            self._connection().execute("DELETE FROM Blobs WHERE Hash = ?", (hash,))
+            self._GetReleasedHashes().add(hash)
+
+    def HasReleasedData(self) -> bool:
+
+        ##
+        #
+        # Checks whether any data has been released in the calling thread's transaction.
+        #
+        # @return **True** if it has, **False** otherwise.
+        #
+        ##
+
+        return bool(self._GetReleasedHashes())
+
+    def Commit(self) -> None:
+
+        ##
+        #
+        # Deletes the files of the data released in the calling thread's transaction. Has to be called
+        # once that transaction has been committed, in a new one: another thread or process might have
+        # stored the same data between the two, in which case its file is kept.
+        #
+        ##
+
+        releasedHashes = self._GetReleasedHashes()
+
+        for hash in releasedHashes:
+
+            row = self._connection().execute(
+                "SELECT 1 FROM Blobs WHERE Hash = ?",
+                (hash,)
+            ).fetchone()
+
+            if not row:
+                self._GetFilePath(hash).unlink(missing_ok = True)
+
+        releasedHashes.clear()
+
+    def Rollback(self) -> None:
+
+        ##
+        #
+        # Forgets the data released in the calling thread's transaction (keeping its files). Has to be
+        # called once the transaction has been rolled back.
+        #
+        ##
+
+        self._GetReleasedHashes().clear()
+
+    def CollectOrphans(self) -> int:
+
+        ##
+        #
+        # Deletes the files which don't belong to any data listed in the database (left behind by
+        # transactions which have been rolled back, or by interrupted writes). Has to be called in a
+        # transaction, so that no other thread or process stores data in the meantime.
+        #
+        # @return The number of files deleted.
+        #
+        ##
+
+        hashes = {row[0] for row in self._connection().execute("SELECT Hash FROM Blobs")}
+        deletedFileCount = 0
+
+        for filePath in self._directoryPath.glob("*/*"):
+
+            if filePath.is_file() and (filePath.name not in hashes):
+
+                filePath.unlink(missing_ok = True)
+                deletedFileCount += 1
+
+        return deletedFileCount
+
+    def _AddReference(self, hash: str) -> bool:
+
+        ##
+        #
+        # Adds a reference to stored data.
+        #
+        # @param hash The hash of the data.
+        #
+        # @return **True** if the data is present in the store, **False** otherwise (in which case no
+        #         reference is added).
+        #
+        ##
+
+        row = self._connection().execute(
+            "SELECT Compression FROM Blobs WHERE Hash = ?",
+            (hash,)
+        ).fetchone()
+
+        if (not row) or (not self._GetFilePath(hash).is_file()):
+            return False
+
+        self._connection().execute(
+            "UPDATE Blobs SET ReferenceCount = ReferenceCount + 1 WHERE Hash = ?",
+            (hash,)
+        )
+
+        return True
+
+    def _Store(self, hash: str, compression: str, size: int, storedData: bytes) -> None:
+
+        ##
+        #
+        # Writes data to a file and adds a reference to it.
+        #
+        # @param hash        The hash of the data.
+        # @param compression The name of the compression method used.
+        # @param size        The size of the data (before compression).
+        # @param storedData  The (possibly compressed) data.
+        #
+        ##
+
+        filePath = self._GetFilePath(hash)
+        filePath.parent.mkdir(parents = True, exist_ok = True)
+
+        temporaryFilePath = filePath.parent / f"{GetUniqueFileName()}.tmp"
+
+        with open(temporaryFilePath, "wb") as file:
+            file.write(storedData)
+
+        os.replace(temporaryFilePath, filePath)
+
+        # The data might have been released earlier in the same transaction: its file has to be kept.
+
+        self._GetReleasedHashes().discard(hash)
+
+        # The row might exist even though the file doesn't (if it has been deleted by hand).
+
+        self._connection().execute(
+            "INSERT INTO Blobs (Hash, Compression, Size, StoredSize, ReferenceCount) "
+            "VALUES (?, ?, ?, ?, 1) "
+            "ON CONFLICT (Hash) DO UPDATE SET "
+            "    Compression = excluded.Compression,"
+            "    StoredSize = excluded.StoredSize,"
+            "    ReferenceCount = ReferenceCount + 1",
+            (hash, compression, size, len(storedData))
+        )
+
+    def _GetFilePath(self, hash: str) -> Path:
+
+        ##
+        #
+        # Generates the path to the file containing given data.
+        #
+        # @param hash The hash of the data.
+        #
+        # @return The path to the file.
+        #
+        ##
+
+        return self._directoryPath / hash[:2] / hash
+
+    def _GetReleasedHashes(self) -> Set[str]:
+
+        ##
+        #
+        # Returns the hashes of the data released in the calling thread's transaction (whose files are
+        # to be deleted once it's committed).
+        #
+        # @return The set of hashes.
+        #
+        ##
+
+        if not hasattr(self._threadData, "ReleasedHashes"):
+            self._threadData.ReleasedHashes = set()
+
+        return self._threadData.ReleasedHashes
+
+    @staticmethod
+    def _Compress(data: bytes) -> Tuple[str, bytes]:
+
+        ##
+        #
+        # Compresses the data, unless it's already compressed (JPEG, PNG and similar) or compression
+        # doesn't make it any smaller.
+        #
+        # @param data The data.
+        #
+        # @return A tuple: the name of the compression method used, and the compressed data.
+        #
+        ##
+
+        if data.startswith(BlobStore._CompressedFormatSignatures):
+            return ("none", data)
+
+        compressedData =                                       \
+            zstandard.ZstdCompressor(level = 9).compress(data) \
+            if zstandard else                                  \
+            zlib.compress(data, 6)
+
+        if len(compressedData) >= len(data):
+            return ("none", data)
+
+        return ("zstd" if zstandard else "zlib", compressedData)
+
+    @staticmethod
+    def _Decompress(compression: str, data: bytes) -> Optional[bytes]:
+
+        ##
+        #
+        # Decompresses the data.
+        #
+        # @param compression The name of the compression method used.
+        # @param data        The compressed data.
+        #
+        # @return Decompressed data, or **None** if the compression method is unsupported.
+        #
+        ##
+
+        if "none" == compression:
+            return data
+
+        elif "zlib" == compression:
+            return zlib.decompress(data)
+
+        elif ("zstd" == compression) and zstandard:
+            return zstandard.ZstdDecompressor().decompress(data)
+
+        return None
+
+    # The first bytes of files in formats that are already compressed: JPEG, PNG, GIF, WebP/RIFF,
+    # ZIP-based formats and gzip.
+    _CompressedFormatSignatures = (
+        b"\xFF\xD8\xFF",
+        b"\x89PNG",
+        b"GIF8",
+        b"RIFF",
+        b"PK\x03\x04",
+        b"\x1F\x8B",
+    )
\ No newline at end of file
@@ -0,0 +1,298 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from collections import deque
+from contextlib import contextmanager
+from io import StringIO
+import sys
+import threading
+from typing import Any, Iterator, Optional
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A replacement for the standard output, used when many threads print at once. The output is divided
+# into channels, printed in the order they have been opened - so the output of different threads doesn't
+# get mixed up. The oldest open channel is printed live; the other ones are buffered until all the older
+# channels are closed. A thread chooses the channel it prints to, so output related to one task can be
+# printed by many threads, one after another.
+#
+# The object is meant to be used as a context manager: it replaces sys.stdout for the duration of the
+# "with" block.
+#
+##
+
+class BufferedOutput:
+
+    def __init__(self) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        ##
+
+        self._stream = sys.stdout
+        self._lock = threading.RLock()
+        self._threadData = threading.local()
+
+        self._buffers = {}
+        self._channelOrder = deque()
+        self._closedChannels = set()
+        self._nextChannel = 0
+
+    def __enter__(self) -> "BufferedOutput":
+
+        ##
+        #
+        # Replaces the standard output.
+        #
+        # @return The object itself.
+        #
+        ##
+
+        self._stream = sys.stdout
+        sys.stdout = self
+
+        return self
+
+    def __exit__(self, *arguments: Any) -> None:
+
+        ##
+        #
+        # Restores the standard output, printing whatever is left in the buffers.
+        #
+        ##
+
+        with self._lock:
+
+            for channel in list(self._channelOrder):
+                self.CloseChannel(channel)
+
+        sys.stdout = self._stream
+
+    def __getattr__(self, name: str) -> Any:
+
+        ##
+        #
+        # Forwards attribute lookups (like "encoding") to the original stream.
+        #
+        # @param name The name of the attribute.
+        #
+        # @return The value of the attribute.
+        #
+        ##
+
+        return getattr(self._stream, name)
+
+    def OpenChannel(self) -> int:
+
+        ##
+        #
+        # Opens a new channel, printed after all the channels opened before it.
+        #
+        # @return The identifier of the channel.
+        #
+        ##
+
+        with self._lock:
+
+            channel = self._nextChannel
+            self._nextChannel += 1
+
+            self._buffers[channel] = StringIO()
+            self._channelOrder.append(channel)
+
+            return channel
+
+    def CloseChannel(self, channel: int) -> None:
+
+        ##
+        #
+        # Closes a channel. Nothing more can be printed to it. If it was the oldest open channel, the
+        # buffered output of the following ones is printed, up to the next open channel (which is printed
+        # live from now on).
+        #
+        # @param channel The identifier of the channel.
+        #
+        ##
+
+        with self._lock:
+
+            self._closedChannels.add(channel)
+
+            while self._channelOrder and (self._channelOrder[0] in self._closedChannels):
+
+                closedChannel = self._channelOrder.popleft()
+
+                self._closedChannels.discard(closedChannel)
+                self._WriteBuffer(self._buffers.pop(closedChannel))
+
+            if self._channelOrder:
+                self._WriteBuffer(self._buffers[self._channelOrder[0]])
+
+    def GetChannel(self) -> Optional[int]:
+
+        ##
+        #
+        # Returns the channel the calling thread prints to.
+        #
+        # @return The identifier of the channel, or **None** if the thread doesn't print to any channel.
+        #
+        ##
+
+        return getattr(self._threadData, "Channel", None)
+
+    @contextmanager
+    def Channel(self, channel: int) -> Iterator[None]:
+
+        ##
+        #
+        # Directs everything the calling thread prints within the "with" block to given channel.
+        #
+        # @param channel The identifier of the channel.
+        #
+        ##
+
+        previousChannel = getattr(self._threadData, "Channel", None)
+        self._threadData.Channel = channel
+
+        try:
+
+            yield
+
+        finally:
+
+            self._threadData.Channel = previousChannel
+
+    @contextmanager
+    def Exclusive(self) -> Iterator[None]:
+
+        ##
+        #
+        # Lets the calling thread print directly (without buffering), with no other thread printing at
+        # the same time. Meant for interacting with the user. The output buffered in the calling thread's
+        # channel so far is printed first.
+        #
+        ##
+
+        with self._lock:
+
+            channel = getattr(self._threadData, "Channel", None)
+
+            if channel in self._buffers:
+                self._WriteBuffer(self._buffers[channel])
+
+            self._threadData.Channel = None
+
+            try:
+
+                yield
+
+            finally:
+
+                self._threadData.Channel = channel
+
+    def write(self, text: str) -> int:
+
+        ##
+        #
+        # Writes text to the calling thread's channel (see Channel()). It's printed right away if the
+        # channel is the oldest open one (or if the thread doesn't print to any channel); buffered
+        # otherwise.
+        #
+        # @param text The text.
+        #
+        # @return The length of the text.
+        #
+        ##
+
+        with self._lock:
+
+            if self._IsBuffered():
+                return self._buffers[self._threadData.Channel].write(text)
+
+            return self._stream.write(text)
+
+    def flush(self) -> None:
+
+        ##
+        #
+        # Flushes the original stream (unless the calling thread's output is buffered).
+        #
+        ##
+
+        with self._lock:
+
+            if not self._IsBuffered():
+                self._stream.flush()
+
+    def _IsBuffered(self) -> bool:
+
+        ##
+        #
+        # Checks whether the output of the calling thread is buffered (i.e. whether it prints to a
+        # channel other than the oldest open one). Has to be called with the lock held. Output printed to a
+        # channel which has been closed and printed already (by a thread still running after its story
+        # has been finished, for example) isn't buffered.
+        #
+        # @return **True** if it is, **False** otherwise.
+        #
+        ##
+
+        channel = getattr(self._threadData, "Channel", None)
+
+        return (channel in self._buffers) and (channel != self._channelOrder[0])
+
+    def _WriteBuffer(self, buffer: StringIO) -> None:
+
+        ##
+        #
+        # Prints the contents of a buffer and empties it. Has to be called with the lock held.
+        #
+        # @param buffer The buffer.
+        #
+        ##
+
+        if not (text := buffer.getvalue()):
+            return
+
+        self._stream.write(text)
+        self._stream.flush()
+
+        buffer.seek(0)
+        buffer.truncate()
\ No newline at end of file
@@ -26,16 +26,33 @@
 #
 #
 
+# Application.
+
+from fiction_dl.Concepts.CacheBackend import CacheBackend
+from fiction_dl.Core.BlobStore import BlobStore
+
 # Standard packages.
 
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from hashlib import sha256
+from io import BytesIO
+import json
+import logging
 from pathlib import Path
+from queue import Queue
 from shutil import rmtree
-from typing import Any
+import sqlite3
+import tarfile
+import threading
+from time import perf_counter, time
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 
 # Non-standard packages.
 
 from bs4 import BeautifulSoup
-from dreamy_utilities.Filesystem import GetUniqueFileName, ReadTextFile, WriteTextFile
+from dreamy_utilities.Filesystem import ReadTextFile
 from dreamy_utilities.Text import Bytify
 
 #
@@ -48,32 +65,91 @@ from dreamy_utilities.Text import Bytify
 
 ##
 #
-# Represents the application's cache.
+# Represents the application's cache. The index mapping item names to their data is an SQLite
+# database, so that adding or looking up an item doesn't require reading or rewriting the whole
+# index. The data itself is kept in a content-addressed blob store: identical items (the same image
+# used by several stories, for example) are stored only once.
+#
+# The cache can be limited in size, item count and item age. When a limit is exceeded, whole owners
+# are evicted, starting with the least recently (or least frequently) used ones.
+#
+# The cache can be shared by multiple threads and by multiple processes (several instances of the
+# application using the same cache directory): every thread uses its own connection to the index,
+# every modification is made in a transaction holding the index's write lock, and data files are
+# written atomically.
+#
+# Hits, misses, the amount of data read and written, and the time spent doing so are counted per host
+# (of the owner's URL) and per item kind. The statistics are kept across runs.
+#
+# Optionally, a remote backend (shared by many machines) can be used as the second tier of the cache.
+# Items missing from the local cache are read from the backend (and stored locally); new items are
+# written to it in the background. Removing items only affects the local cache.
 #
 ##
 
 class Cache:
 
-    def __init__(self, directoryPath: Path) -> None:
+    def __init__(
+        self,
+        directoryPath: Path,
+        maximumSize: Optional[int] = None,
+        maximumItemCount: Optional[int] = None,
+        maximumItemAge: Optional[float] = None,
+        evictionPolicy: str = "LRU",
+        remoteBackend: Optional[CacheBackend] = None
+    ) -> None:
 
         ##
         #
         # The constructor.
         #
-        # @param directoryPath The path of the cache's directory. It will be created if necessary.
-        #                      Needs to be write-able.
+        # @param directoryPath    The path of the cache's directory. It will be created if necessary.
+        #                         Needs to be write-able.
+        # @param maximumSize      The maximum size of stored data, in bytes. Optional.
+        # @param maximumItemCount The maximum number of items. Optional.
+        # @param maximumItemAge   The maximum age of an item, in days. Optional.
+        # @param evictionPolicy   The order in which owners are evicted: "LRU" (least recently used
+        #                         first) or "LFU" (least frequently used first).
+        # @param remoteBackend    The backend used as the remote tier of the cache. Optional.
         #
         ##
 
         self._directoryPath = directoryPath
-        self._items = {}
+        self._blobs = None
+
+        self._threadData = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
 
-        # Create the directory and attempt to read pre-existing cache.
+        self._maximumSize = maximumSize
+        self._maximumItemCount = maximumItemCount
+        self._maximumItemAge = maximumItemAge
+        self._evictionPolicy = evictionPolicy
+
+        self._accessedOwners = {}
+        self._additionsSinceLimitCheck = 0
+
+        self._sessionStatistics = {}
+        self._unsavedStatistics = {}
+
+        self._remoteBackend = remoteBackend
+        self._remoteWriteQueue = Queue()
+        self._remoteWriter = None
+
+        if self._remoteBackend:
+            self._remoteWriter = threading.Thread(target = self._WriteToRemoteBackend, daemon = True)
+            self._remoteWriter.start()
+
+        # Create the directory and open (or create) the index.
 
         self._directoryPath.mkdir(parents = True, exist_ok = True)
-        self._ReadIndexFromFile()
+        self._OpenIndex()
+
+        # Import the contents of the old, XML-based index (if there is one).
+
+        self._MigrateLegacyIndex()
 
-    def AddItem(self, owner: str, name: str, data: Any) -> None:
+    def AddItem(self, owner: str, name: str, data: Any, kind: str = "Other") -> None:
 
         ##
         #
@@ -82,42 +158,105 @@ class Cache:
         # @param owner The namespace.
         # @param name  The name of the item.
         # @param data  Data to be stored.
+        # @param kind  The kind of the item (e.g. "Content"), used only to gather statistics.
         #
         ##
 
         if (not owner) or (not name) or (not data):
             return
 
-        if self.ContainsItem(owner, name):
-            Path(self._items[owner][name]).unlink()
+        startTime = perf_counter()
 
-        filePath = self._directoryPath / GetUniqueFileName()
-        with open(filePath, "wb") as file:
-            file.write(Bytify(data))
+        self._RecordAccess(owner)
 
-        self._items.setdefault(owner, {})
-        self._items[owner][name] = filePath
+        data = Bytify(data)
+        dateAdded = time()
 
-        self._SaveIndexToFile()
+        with self._Transaction():
 
-    def RetrieveItem(self, owner: str, name: str) -> bytes:
+            previousHash = self._GetItemHash(owner, name)
+            hash = self._blobs.Add(data)
+
+            self._GetConnection().execute(
+                "INSERT OR REPLACE INTO Items (Owner, Name, Hash, DateAdded) VALUES (?, ?, ?, ?)",
+                (owner, name, hash, dateAdded)
+            )
+
+            if previousHash:
+                self._blobs.Release(previousHash)
+
+            self._SaveAccessRecords()
+
+        if self._remoteBackend:
+            self._remoteWriteQueue.put((owner, name, hash, dateAdded))
+
+        self._RecordStatistics(owner, kind, BytesWritten = len(data), Time = perf_counter() - startTime)
+
+        # Enforce the limits every now and then.
+
+        with self._lock:
+            self._additionsSinceLimitCheck += 1
+            limitCheckRequired = self._additionsSinceLimitCheck >= self._LimitCheckInterval
+
+        if limitCheckRequired:
+            self._EnforceLimits(protectedOwner = owner)
+
+    def RetrieveItem(
+        self,
+        owner: str,
+        name: str,
+        maximumAge: Optional[float] = None,
+        kind: str = "Other"
+    ) -> Optional[bytes]:
 
         ##
         #
         # Reads an item from the cache.
         #
-        # @param owner The namespace.
-        # @param item  The name of the item.
+        # @param owner      The namespace.
+        # @param item       The name of the item.
+        # @param maximumAge The maximum age of the item, in days. Older items are treated as if they
+        #                   weren't present in the cache. Optional.
+        # @param kind       The kind of the item (e.g. "Content"), used only to gather statistics.
         #
         # @return The data associated with the item.
         #
         ##
 
-        if (owner not in self._items) or (name not in self._items[owner]):
-            return None
+        startTime = perf_counter()
+
+        data = None
+        retrievedFromRemoteBackend = False
+
+        row = self._GetConnection().execute(
+            "SELECT Hash, DateAdded FROM Items WHERE Owner = ? AND Name = ?",
+            (owner, name)
+        ).fetchone()
 
-        with open(self._items[owner][name], "rb") as file:
-            return file.read()
+        if row and not self._IsExpired(row[1], maximumAge):
+
+            self._RecordAccess(owner)
+            data = self._blobs.Retrieve(row[0])
+
+        # Items whose data can't be read (if its file is missing or corrupted) are read from the remote
+        # backend too, like the ones missing from the local cache.
+
+        if (data is None) and self._remoteBackend:
+
+            data = self._ReadFromRemoteBackend(owner, name, maximumAge)
+            retrievedFromRemoteBackend = True
+
+        self._RecordStatistics(
+            owner,
+            kind,
+            Hits = int((data is not None) and not retrievedFromRemoteBackend),
+            RemoteHits = int((data is not None) and retrievedFromRemoteBackend),
+            Misses = int(data is None),
+            BytesRead = len(data) if data else 0,
+            Time = perf_counter() - startTime
+        )
+
+        return data
 
     def ContainsItem(self, owner: str, name: str) -> bool:
 
@@ -132,89 +271,957 @@ class Cache:
         #
         ##
 
-        return (owner in self._items) and (name in self._items[owner])
+        return self._GetItemHash(owner, name) is not None
+
+    def RemoveOwner(self, owner: str) -> None:
+
+        ##
+        #
+        # Removes all the items belonging to given owner. Data that's still referred to by other
+        # owners' items is preserved.
+        #
+        # @param owner The namespace.
+        #
+        ##
+
+        with self._Transaction():
+
+            hashes = self._GetConnection().execute(
+                "SELECT Hash FROM Items WHERE Owner = ?",
+                (owner,)
+            ).fetchall()
+
+            self._GetConnection().execute("DELETE FROM Items WHERE Owner = ?", (owner,))
+            self._GetConnection().execute("DELETE FROM Owners WHERE Owner = ?", (owner,))
+
+            for (hash,) in hashes:
+                self._blobs.Release(hash)
+
+        with self._lock:
+            self._accessedOwners.pop(owner, None)
+
+    def GetSize(self) -> int:
+
+        ##
+        #
+        # Calculates the size of the data stored in the cache.
+        #
+        # @return The size of stored (compressed) data, in bytes.
+        #
+        ##
+
+        return self._GetConnection().execute("SELECT COALESCE(SUM(StoredSize), 0) FROM Blobs").fetchone()[0]
+
+    def GetItemCount(self) -> int:
+
+        ##
+        #
+        # Counts the items stored in the cache.
+        #
+        # @return The number of items.
+        #
+        ##
+
+        return self._GetConnection().execute("SELECT COUNT(*) FROM Items").fetchone()[0]
+
+    def GetStatistics(self, session: bool = False) -> List[Dict[str, Any]]:
+
+        ##
+        #
+        # Returns the statistics of the cache's usage.
+        #
+        # @param session Return the statistics of the current session only (instead of the ones gathered
+        #                across all the sessions).
+        #
+        # @return A list of dictionaries, one per host and item kind, sorted by host and kind. Every
+        #         dictionary contains the keys "Host" and "Kind", and the keys listed in
+        #         _StatisticsFields.
+        #
+        ##
+
+        # Statistics that haven't been saved yet have to be added to the ones read from the database.
+
+        with self._lock:
+
+            statistics =                                                                  \
+                {key: list(values) for key, values in self._sessionStatistics.items()}    \
+                if session else                                                           \
+                {key: list(values) for key, values in self._unsavedStatistics.items()}
+
+        if not session:
+
+            rows = self._GetConnection().execute(
+                f"SELECT Host, Kind, {', '.join(self._StatisticsFields)} FROM Statistics"
+            ).fetchall()
+
+            for row in rows:
+
+                values = statistics.setdefault((row[0], row[1]), [0] * len(self._StatisticsFields))
+
+                for index, value in enumerate(row[2:]):
+                    values[index] += value
+
+        return [
+            {"Host": host, "Kind": kind, **dict(zip(self._StatisticsFields, values))}
+            for (host, kind), values in sorted(statistics.items())
+        ]
+
+    def CollectGarbage(self) -> int:
+
+        ##
+        #
+        # Removes expired items, then evicts owners until the cache fits within its limits. Orphaned data
+        # files are deleted too.
+        #
+        # @return The number of items removed.
+        #
+        ##
+
+        initialItemCount = self.GetItemCount()
+
+        with self._Transaction():
+            self._SaveAccessRecords()
+            self._blobs.CollectOrphans()
+
+        self._EnforceLimits()
+
+        return initialItemCount - self.GetItemCount()
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Saves pending changes (waiting for the items to be written to the remote backend) and closes
+        # the cache. It can't be used afterwards.
+        #
+        ##
+
+        if self._remoteWriter:
+
+            self._remoteWriteQueue.put(None)
+            self._remoteWriter.join()
+            self._remoteWriter = None
+
+            self._remoteBackend.Close()
+
+        with self._Transaction():
+            self._SaveAccessRecords()
+            self._SaveStatistics()
+
+        with self._lock:
+
+            for connection in self._connections:
+                connection.close()
+
+            self._connections.clear()
+
+        self._threadData = threading.local()
 
     def Clear(self) -> None:
 
         ##
         #
-        # Clears the cache.
+        # Clears the (local) cache. Waits for pending items to be written to the remote backend first.
         #
         ##
 
-        self._items.clear()
+        self._remoteWriteQueue.join()
 
-        rmtree(self._directoryPath)
-        self._directoryPath.mkdir(parents = True, exist_ok = True)
+        with self._lock:
+            self._accessedOwners.clear()
+
+        with self._Transaction():
+            self._DropContent()
+
+    def Export(self, file: BinaryIO, ownerPattern: Optional[str] = None) -> int:
+
+        ##
+        #
+        # Exports the contents of the cache to a bundle (which can then be imported into another cache).
+        # The bundle is a TAR archive written sequentially, so the file can be a pipe or a socket: it
+        # begins with the list of items, followed by the data (in its stored, compressed form).
+        #
+        # @param file         A binary file the bundle will be written to.
+        # @param ownerPattern A shell-style pattern (e.g. "*.fanfiction.net"); only the items whose
+        #                     owners (or the host names in their owners' URLs) match it are exported.
+        #                     Optional.
+        #
+        # @return The number of exported items.
+        #
+        ##
+
+        rows = self._GetConnection().execute(
+            "SELECT Items.Owner, Items.Name, Items.Hash, Items.DateAdded, Blobs.Compression "
+            "FROM Items JOIN Blobs ON Items.Hash = Blobs.Hash "
+            "ORDER BY Items.Owner, Items.Name"
+        ).fetchall()
+
+        rows = [row for row in rows if self._OwnerMatches(row[0], ownerPattern)]
+
+        index = [json.dumps({"Version": self._BundleVersion})]
+        index.extend(
+            json.dumps({
+                "Owner": owner,
+                "Name": name,
+                "Hash": hash,
+                "DateAdded": dateAdded,
+                "Compression": compression,
+            })
+            for owner, name, hash, dateAdded, compression in rows
+        )
+
+        with tarfile.open(fileobj = file, mode = "w|") as archive:
+
+            self._WriteBundleMember(archive, self._BundleIndexFileName, "\n".join(index).encode())
+
+            # Data that has disappeared in the meantime (evicted by another process, for example) is
+            # simply skipped; the items referring to it won't be imported.
+
+            for hash in dict.fromkeys(row[2] for row in rows):
+
+                if (storedBlob := self._blobs.RetrieveStored(hash)):
+                    self._WriteBundleMember(archive, f"{self._BlobDirectoryName}/{hash}", storedBlob[1])
+
+        return len(rows)
+
+    def Import(self, file: BinaryIO) -> int:
+
+        ##
+        #
+        # Imports the contents of a bundle created by Export(). The bundle is read sequentially. Items
+        # already present in the cache are replaced only if the imported ones are newer; invalid data
+        # is skipped.
+        #
+        # @param file A binary file the bundle will be read from.
+        #
+        # @return The number of imported items.
+        #
+        ##
+
+        # The items, grouped by the hash of their data.
+
+        items: Optional[Dict[str, List[Tuple[str, str, float, str]]]] = None
+
+        importedItemCount = 0
+
+        with tarfile.open(fileobj = file, mode = "r|") as archive:
+
+            for member in archive:
+
+                if not member.isfile():
+                    continue
+
+                data = archive.extractfile(member).read()
+
+                if self._BundleIndexFileName == member.name:
+
+                    items = self._ReadBundleIndex(data)
+
+                elif (items is not None) and member.name.startswith(f"{self._BlobDirectoryName}/"):
+
+                    hash = member.name.split("/")[-1]
+
+                    if (hashItems := items.pop(hash, None)):
+                        importedItemCount += self._ImportBlob(hash, data, hashItems)
+
+        if items is None:
+            raise ValueError("The bundle contains no index.")
+
+        self._EnforceLimits()
+
+        return importedItemCount
+
+    def _GetConnection(self) -> sqlite3.Connection:
+
+        ##
+        #
+        # Returns the calling thread's connection to the index, opening it if necessary.
+        #
+        # @return The connection.
+        #
+        ##
+
+        if (connection := getattr(self._threadData, "Connection", None)):
+            return connection
+
+        # The connection is in autocommit mode: transactions are started explicitly, by
+        # _Transaction(). Other processes might keep the index locked for a while; the timeout
+        # prevents failing immediately in such cases.
+
+        connection = sqlite3.connect(
+            self._directoryPath / self._IndexFileName,
+            timeout = self._LockTimeout,
+            isolation_level = None,
+            check_same_thread = False
+        )
+
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+
+        self._threadData.Connection = connection
+
+        with self._lock:
+            self._connections.append(connection)
+
+        return connection
+
+    @contextmanager
+    def _Transaction(self) -> Iterator[sqlite3.Connection]:
+
+        ##
+        #
+        # Runs a block of code in a transaction holding the index's write lock (so that no other thread
+        # or process can modify the cache in the meantime). The transaction is committed at the end of
+        # the block, or rolled back if an exception is thrown.
+        #
+        # @return The connection used.
+        #
+        ##
+
+        connection = self._GetConnection()
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+
+            yield connection
+
+        except BaseException:
+
+            connection.execute("ROLLBACK")
+
+            if self._blobs:
+                self._blobs.Rollback()
+
+            raise
+
+        connection.execute("COMMIT")
+
+        # Files of released data are deleted only now, so that a rolled back transaction doesn't leave
+        # the index referring to missing files - but still holding the write lock, so that they can't be
+        # deleted right after some other thread or process has stored the same data again.
+
+        if self._blobs and self._blobs.HasReleasedData():
+
+            connection.execute("BEGIN IMMEDIATE")
+
+            try:
+
+                self._blobs.Commit()
+
+            finally:
+
+                connection.execute("COMMIT")
+
+    def _DropContent(self) -> None:
+
+        ##
+        #
+        # Removes all the items and all the data. Has to be called in a transaction.
+        #
+        ##
+
+        for table in ["Items", "Owners", "Blobs"]:
+            self._GetConnection().execute(f"DROP TABLE IF EXISTS {table}")
+
+        rmtree(self._directoryPath / self._BlobDirectoryName, ignore_errors = True)
+
+        self._CreateTables()
+
+    def _OpenIndex(self) -> None:
+
+        ##
+        #
+        # Opens the index database, creating it if necessary.
+        #
+        ##
+
+        with self._Transaction() as connection:
+
+            # A cache created by an incompatible version of the application is simply discarded.
+
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+
+            if self._IndexVersion != version:
+                self._DropContent()
+            else:
+                self._CreateTables()
+
+            # Files written in transactions which have been rolled back (or by interrupted processes) are
+            # removed.
+
+            self._blobs.CollectOrphans()
+
+    def _CreateTables(self) -> None:
+
+        ##
+        #
+        # Creates the tables making up the index (unless they exist already). Has to be called in a
+        # transaction.
+        #
+        ##
+
+        self._GetConnection().execute(
+            "CREATE TABLE IF NOT EXISTS Items ("
+            "    Owner TEXT NOT NULL,"
+            "    Name TEXT NOT NULL,"
+            "    Hash TEXT NOT NULL,"
+            "    DateAdded REAL NOT NULL,"
+            "    PRIMARY KEY (Owner, Name)"
+            ") WITHOUT ROWID"
+        )
+
+        self._GetConnection().execute(
+            "CREATE TABLE IF NOT EXISTS Owners ("
+            "    Owner TEXT NOT NULL PRIMARY KEY,"
+            "    DateAccessed REAL NOT NULL,"
+            "    AccessCount INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+
+        self._GetConnection().execute("CREATE INDEX IF NOT EXISTS ItemsByDate ON Items (DateAdded)")
+
+        self._GetConnection().execute(
+            "CREATE TABLE IF NOT EXISTS Statistics ("
+            "    Host TEXT NOT NULL,"
+            "    Kind TEXT NOT NULL,"
+            "    Hits INTEGER NOT NULL,"
+            "    RemoteHits INTEGER NOT NULL,"
+            "    Misses INTEGER NOT NULL,"
+            "    BytesRead INTEGER NOT NULL,"
+            "    BytesWritten INTEGER NOT NULL,"
+            "    Time REAL NOT NULL,"
+            "    PRIMARY KEY (Host, Kind)"
+            ") WITHOUT ROWID"
+        )
+
+        self._blobs = BlobStore(self._directoryPath / self._BlobDirectoryName, self._GetConnection)
+
+        self._GetConnection().execute(f"PRAGMA user_version = {self._IndexVersion}")
+
+    def _GetItemHash(self, owner: str, name: str) -> Optional[str]:
 
-    def _ReadIndexFromFile(self) -> None:
+        ##
+        #
+        # Looks up the hash of the data associated with given item.
+        #
+        # @param owner The namespace.
+        # @param item  The name of the item.
+        #
+        # @return The hash of the data, or **None** if the item isn't present in the cache.
+        #
+        ##
+
+        row = self._GetConnection().execute(
+            "SELECT Hash FROM Items WHERE Owner = ? AND Name = ?",
+            (owner, name)
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def _RecordAccess(self, owner: str) -> None:
+
+        ##
+        #
+        # Notes that an owner's item has been accessed. Access records are kept in memory and saved
+        # in batches, so that reading from the cache doesn't require writing to the database.
+        #
+        # @param owner The namespace.
+        #
+        ##
+
+        with self._lock:
+            self._accessedOwners[owner] = self._accessedOwners.get(owner, 0) + 1
+
+    def _SaveAccessRecords(self) -> None:
 
         ##
         #
-        # Reads the contents of the cache from the index file.
+        # Saves access records to the database. Has to be called in a transaction.
         #
         ##
 
-        code = ReadTextFile(self._directoryPath / self._IndexFileName)
-        if not code:
+        with self._lock:
+            accessedOwners = self._accessedOwners
+            self._accessedOwners = {}
+
+        if not accessedOwners:
             return
 
-        soup = BeautifulSoup(code, "xml")
+        currentTime = time()
 
-        indexNode = soup.find("Index")
-        if not indexNode:
+        self._GetConnection().executemany(
+            "INSERT INTO Owners (Owner, DateAccessed, AccessCount) VALUES (?, ?, ?) "
+            "ON CONFLICT (Owner) DO UPDATE SET "
+            "    DateAccessed = excluded.DateAccessed,"
+            "    AccessCount = AccessCount + excluded.AccessCount",
+            [(owner, currentTime, count) for owner, count in accessedOwners.items()]
+        )
+
+    def _RecordStatistics(self, owner: str, kind: str, **increments: float) -> None:
+
+        ##
+        #
+        # Updates the statistics of the cache's usage. The statistics are kept in memory and saved when
+        # the cache is closed.
+        #
+        # @param owner      The namespace.
+        # @param kind       The kind of the item.
+        # @param increments The values to be added to the statistics (see _StatisticsFields).
+        #
+        ##
+
+        key = (urlparse(owner).hostname or "", kind)
+
+        with self._lock:
+
+            for statistics in [self._sessionStatistics, self._unsavedStatistics]:
+
+                values = statistics.setdefault(key, [0] * len(self._StatisticsFields))
+
+                for index, field in enumerate(self._StatisticsFields):
+                    values[index] += increments.get(field, 0)
+
+    def _SaveStatistics(self) -> None:
+
+        ##
+        #
+        # Saves the statistics of the cache's usage to the database. Has to be called in a transaction.
+        #
+        ##
+
+        with self._lock:
+            unsavedStatistics = self._unsavedStatistics
+            self._unsavedStatistics = {}
+
+        if not unsavedStatistics:
             return
 
-        for ownerNode in indexNode.find_all(recursive = False):
+        fields = ", ".join(self._StatisticsFields)
+        placeholders = ", ".join(["?"] * len(self._StatisticsFields))
+        updates = ", ".join(f"{field} = {field} + excluded.{field}" for field in self._StatisticsFields)
 
-            ownerName = ownerNode.find("Name").get_text()
-            self._items[ownerName] = {}
+        self._GetConnection().executemany(
+            f"INSERT INTO Statistics (Host, Kind, {fields}) VALUES (?, ?, {placeholders}) "
+            f"ON CONFLICT (Host, Kind) DO UPDATE SET {updates}",
+            [(host, kind, *values) for (host, kind), values in unsavedStatistics.items()]
+        )
 
-            for itemNode in ownerNode.find("Items").find_all(recursive = False):
+    def _EnforceLimits(self, protectedOwner: Optional[str] = None) -> None:
 
-                itemName = itemNode.find("Name").get_text()
-                itemValue = itemNode.find("Value").get_text()
+        ##
+        #
+        # Removes expired items, then evicts owners until the cache fits within its limits.
+        #
+        # @param protectedOwner An owner that's not to be evicted (the one currently being written
+        #                       to, for example). Optional.
+        #
+        ##
+
+        with self._lock:
+            self._additionsSinceLimitCheck = 0
+
+        # Remove expired items.
+
+        if self._maximumItemAge is not None:
 
-                self._items[ownerName][itemName] = itemValue
+            expirationDate = time() - self._maximumItemAge * self._SecondsInDay
 
-    def _SaveIndexToFile(self) -> None:
+            with self._Transaction():
+
+                hashes = self._GetConnection().execute(
+                    "SELECT Hash FROM Items WHERE DateAdded < ?",
+                    (expirationDate,)
+                ).fetchall()
+
+                self._GetConnection().execute("DELETE FROM Items WHERE DateAdded < ?", (expirationDate,))
+                self._GetConnection().execute("DELETE FROM Owners WHERE Owner NOT IN (SELECT Owner FROM Items)")
+
+                for (hash,) in hashes:
+                    self._blobs.Release(hash)
+
+        # Evict owners.
+
+        if (self._maximumSize is None) and (self._maximumItemCount is None):
+            return
+
+        def IsOverLimit(size: int, itemCount: int) -> bool:
+
+            return                                                                   \
+                ((self._maximumSize is not None) and (size > self._maximumSize)) or  \
+                ((self._maximumItemCount is not None) and (itemCount > self._maximumItemCount))
+
+        size = self.GetSize()
+        itemCount = self.GetItemCount()
+
+        if not IsOverLimit(size, itemCount):
+            return
+
+        ordering =                                \
+            "AccessCount ASC, DateAccessed ASC"   \
+            if "LFU" == self._evictionPolicy else \
+            "DateAccessed ASC"
+
+        owners = [x[0] for x in self._GetConnection().execute(f"SELECT Owner FROM Owners ORDER BY {ordering}")]
+
+        for owner in owners:
+
+            if owner == protectedOwner:
+                continue
+
+            # The estimate might be too high, since some of the owner's data might be shared with
+            # others. The actual values are recalculated once the estimate looks good enough.
+
+            ownerSize, ownerItemCount = self._GetConnection().execute(
+                "SELECT COALESCE(SUM(Blobs.StoredSize), 0), COUNT(*) "
+                "FROM Items JOIN Blobs ON Items.Hash = Blobs.Hash "
+                "WHERE Items.Owner = ?",
+                (owner,)
+            ).fetchone()
+
+            self.RemoveOwner(owner)
+
+            size -= ownerSize
+            itemCount -= ownerItemCount
+
+            if not IsOverLimit(size, itemCount):
+
+                size = self.GetSize()
+                itemCount = self.GetItemCount()
+
+                if not IsOverLimit(size, itemCount):
+                    break
+
+    def _IsExpired(self, dateAdded: float, maximumAge: Optional[float]) -> bool:
 
         ##
         #
-        # Saves the index to the index file.
+        # Checks whether an item is too old.
+        #
+        # @param dateAdded  The date the item has been added.
+        # @param maximumAge The maximum age of the item, in days. Optional.
+        #
+        # @return **True** if the item is too old, **False** otherwise.
+        #
+        ##
+
+        return (maximumAge is not None) and (time() - dateAdded > maximumAge * self._SecondsInDay)
+
+    def _ReadFromRemoteBackend(self, owner: str, name: str, maximumAge: Optional[float]) -> Optional[bytes]:
+
+        ##
+        #
+        # Reads an item from the remote backend and stores it in the local cache.
+        #
+        # @param owner      The namespace.
+        # @param item       The name of the item.
+        # @param maximumAge The maximum age of the item, in days. Optional.
+        #
+        # @return The data associated with the item.
         #
         ##
 
-        soup = BeautifulSoup(features = "xml")
+        record = self._remoteBackend.Read(self._GetRemoteItemKey(owner, name))
+        if not record:
+            return None
+
+        try:
+
+            item = json.loads(record)
+
+            if (item["Owner"], item["Name"]) != (owner, name):
+                return None
+
+            hash = item["Hash"]
+            dateAdded = item["DateAdded"]
+            compression = item["Compression"]
+
+        except (ValueError, KeyError, TypeError):
+
+            return None
+
+        if self._IsExpired(dateAdded, maximumAge):
+            return None
+
+        storedData = self._remoteBackend.Read(f"{self._BlobDirectoryName}/{hash}")
+        if not storedData:
+            return None
+
+        with self._Transaction():
+
+            # The data is verified before being stored.
+
+            if not self._blobs.AddStored(hash, compression, storedData):
+                return None
+
+            previousHash = self._GetItemHash(owner, name)
+
+            self._GetConnection().execute(
+                "INSERT OR REPLACE INTO Items (Owner, Name, Hash, DateAdded) VALUES (?, ?, ?, ?)",
+                (owner, name, hash, dateAdded)
+            )
+
+            if previousHash:
+                self._blobs.Release(previousHash)
+
+        self._RecordAccess(owner)
+
+        return self._blobs.Retrieve(hash)
+
+    def _WriteToRemoteBackend(self) -> None:
+
+        ##
+        #
+        # Writes the items added to the local cache to the remote backend. Runs in a separate thread,
+        # until it encounters **None** in the queue.
+        #
+        ##
+
+        while True:
+
+            entry = self._remoteWriteQueue.get()
+
+            try:
+
+                if entry is None:
+                    return
+
+                self._WriteItemToRemoteBackend(*entry)
+
+            except Exception as caughtException:
+
+                logging.info(f"Failed to write an item to the remote cache: {caughtException}")
+
+            finally:
+
+                self._remoteWriteQueue.task_done()
+
+    def _WriteItemToRemoteBackend(self, owner: str, name: str, hash: str, dateAdded: float) -> None:
+
+        ##
+        #
+        # Writes an item to the remote backend.
+        #
+        # @param owner     The namespace.
+        # @param item      The name of the item.
+        # @param hash      The hash of the data associated with the item.
+        # @param dateAdded The date the item has been added.
+        #
+        ##
+
+        if not (storedBlob := self._blobs.RetrieveStored(hash)):
+            return
+
+        compression, storedData = storedBlob
+
+        # The data is written before the item, so that the item never refers to missing data.
+
+        if not self._remoteBackend.Write(f"{self._BlobDirectoryName}/{hash}", storedData):
+            return
+
+        record = json.dumps({
+            "Owner": owner,
+            "Name": name,
+            "Hash": hash,
+            "DateAdded": dateAdded,
+            "Compression": compression,
+        })
+
+        self._remoteBackend.Write(self._GetRemoteItemKey(owner, name), record.encode())
+
+    @staticmethod
+    def _GetRemoteItemKey(owner: str, name: str) -> str:
+
+        ##
+        #
+        # Generates the key of an item in the remote backend.
+        #
+        # @param owner The namespace.
+        # @param item  The name of the item.
+        #
+        # @return The key.
+        #
+        ##
+
+        digest = sha256("\0".join([owner, name]).encode()).hexdigest()
+
+        return f"Items/{digest}"
+
+    def _ReadBundleIndex(self, data: bytes) -> Dict[str, List[Tuple[str, str, float, str]]]:
+
+        ##
+        #
+        # Reads the index of a bundle.
+        #
+        # @param data The content of the index file.
+        #
+        # @return The items, grouped by the hashes of their data. Each item is represented by a tuple:
+        #         owner, name, the date it's been added, the name of the compression method used.
+        #
+        ##
+
+        lines = data.decode().splitlines()
+
+        if (not lines) or (json.loads(lines[0]).get("Version") != self._BundleVersion):
+            raise ValueError("The bundle has been created by an incompatible version of the application.")
+
+        items = {}
+
+        for line in lines[1:]:
+
+            item = json.loads(line)
+
+            items.setdefault(item["Hash"], []).append(
+                (item["Owner"], item["Name"], item["DateAdded"], item["Compression"])
+            )
+
+        return items
+
+    def _ImportBlob(self, hash: str, storedData: bytes, items: List[Tuple[str, str, float, str]]) -> int:
+
+        ##
+        #
+        # Imports the data read from a bundle, along with the items referring to it.
+        #
+        # @param hash       The hash of the data.
+        # @param storedData The (possibly compressed) data.
+        # @param items      The items referring to the data (see _ReadBundleIndex()).
+        #
+        # @return The number of imported items.
+        #
+        ##
+
+        importedItemCount = 0
+
+        with self._Transaction() as connection:
+
+            for owner, name, dateAdded, compression in items:
+
+                row = connection.execute(
+                    "SELECT Hash, DateAdded FROM Items WHERE Owner = ? AND Name = ?",
+                    (owner, name)
+                ).fetchone()
+
+                if row and (row[1] >= dateAdded):
+                    continue
+
+                if not self._blobs.AddStored(hash, compression, storedData):
+                    break
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO Items (Owner, Name, Hash, DateAdded) VALUES (?, ?, ?, ?)",
+                    (owner, name, hash, dateAdded)
+                )
+
+                if row:
+                    self._blobs.Release(row[0])
+
+                self._RecordAccess(owner)
+                importedItemCount += 1
+
+            self._SaveAccessRecords()
+
+        return importedItemCount
+
+    @staticmethod
+    def _WriteBundleMember(archive: tarfile.TarFile, name: str, data: bytes) -> None:
+
+        ##
+        #
+        # Writes a file to a bundle.
+        #
+        # @param archive The bundle.
+        # @param name    The name of the file.
+        # @param data    The content of the file.
+        #
+        ##
+
+        member = tarfile.TarInfo(name)
+        member.size = len(data)
+        member.mtime = int(time())
+
+        archive.addfile(member, BytesIO(data))
+
+    @staticmethod
+    def _OwnerMatches(owner: str, pattern: Optional[str]) -> bool:
+
+        ##
+        #
+        # Checks whether an owner matches given pattern.
+        #
+        # @param owner   The namespace (usually a URL).
+        # @param pattern A shell-style pattern, matched against the owner and the host name in its URL.
+        #
+        # @return **True** if the owner matches the pattern (or there's no pattern), **False** otherwise.
+        #
+        ##
+
+        if not pattern:
+            return True
+
+        return fnmatch(owner, pattern) or fnmatch(urlparse(owner).hostname or "", pattern)
+
+    def _MigrateLegacyIndex(self) -> None:
+
+        ##
+        #
+        # Imports the contents of the XML index file used by previous versions of the application,
+        # then deletes that file.
+        #
+        ##
+
+        legacyIndexFilePath = self._directoryPath / self._LegacyIndexFileName
+        if not legacyIndexFilePath.is_file():
+            return
+
+        code = ReadTextFile(legacyIndexFilePath)
+        indexNode = BeautifulSoup(code, "xml").find("Index") if code else None
+
+        legacyFilePaths = [legacyIndexFilePath]
+
+        if indexNode:
+
+            for ownerNode in indexNode.find_all(recursive = False):
+
+                ownerName = ownerNode.find("Name").get_text()
+
+                for itemNode in ownerNode.find("Items").find_all(recursive = False):
+
+                    itemName = itemNode.find("Name").get_text()
+                    itemFilePath = self._directoryPath / Path(itemNode.find("Value").get_text()).name
+
+                    if not itemFilePath.is_file():
+                        continue
+
+                    try:
+
+                        with open(itemFilePath, "rb") as file:
+                            self.AddItem(ownerName, itemName, file.read())
 
-        indexNode = soup.new_tag("Index")
-        soup.append(indexNode)
+                    except OSError:
 
-        for ownerName, itemDictionary in self._items.items():
+                        # Another instance of the application might be migrating the cache as well.
 
-            ownerNode = soup.new_tag("Owner")
-            indexNode.append(ownerNode)
+                        continue
 
-            ownerNameNode = soup.new_tag("Name")
-            ownerNameNode.string = ownerName
-            ownerNode.append(ownerNameNode)
+                    legacyFilePaths.append(itemFilePath)
 
-            ownerItemsNode = soup.new_tag("Items")
-            ownerNode.append(ownerItemsNode)
+        for filePath in legacyFilePaths:
+            filePath.unlink(missing_ok = True)
 
-            for name, value in itemDictionary.items():
+    _IndexFileName = "Index.sqlite"
+    _IndexVersion = 2
+    _BlobDirectoryName = "Blobs"
+    _LegacyIndexFileName = "Index.xml"
 
-                itemNode = soup.new_tag("Item")
-                ownerItemsNode.append(itemNode)
+    _StatisticsFields = ("Hits", "RemoteHits", "Misses", "BytesRead", "BytesWritten", "Time")
 
-                nameNode = soup.new_tag("Name")
-                nameNode.string = name
-                itemNode.append(nameNode)
+    _BundleIndexFileName = "Index.jsonl"
+    _BundleVersion = 1
 
-                valueNode = soup.new_tag("Value")
-                valueNode.string = str(value)
-                itemNode.append(valueNode)
+    # For how long to wait for other processes to release the index, in seconds.
+    _LockTimeout = 60.0
 
-        WriteTextFile(self._directoryPath / self._IndexFileName, str(soup))
+    # The number of items added between subsequent checks of the cache's limits.
+    _LimitCheckInterval = 100
 
-    _IndexFileName = "Index.xml"
\ No newline at end of file
+    _SecondsInDay = 24 * 60 * 60
\ No newline at end of file
@@ -0,0 +1,105 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Utilities.General import RunProcess
+
+# Standard packages.
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+# Non-standard packages.
+
+from dreamy_utilities.Text import Stringify
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A service converting e-books using Calibre ("ebook-convert"). Conversions are queued and performed in
+# the background, by a limited number of processes at once (Calibre uses only one CPU core per
+# conversion). A process which doesn't finish in time is killed.
+#
+##
+
+class CalibreConverter:
+
+    def __init__(self, maximumProcessCount: int, timeout: float) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param maximumProcessCount The maximum number of conversions performed at once.
+        # @param timeout             The time a conversion can take, in seconds.
+        #
+        ##
+
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(maximumProcessCount, thread_name_prefix = "CalibreConverter")
+
+    def Submit(self, sourceFilePath: Path, outputFilePath: Path) -> Future:
+
+        ##
+        #
+        # Queues an e-book to be converted. The output format is determined by the extension of the output
+        # file; the file is overwritten if it exists.
+        #
+        # @param sourceFilePath The path to the source e-book.
+        # @param outputFilePath The path to the output file.
+        #
+        # @return A future; its result is **True** if the e-book has been converted, **False** otherwise.
+        #
+        ##
+
+        return self._executor.submit(
+            RunProcess,
+            ["ebook-convert", Stringify(sourceFilePath), Stringify(outputFilePath)],
+            self._timeout
+        )
+
+    def Close(self, cancel: bool = False) -> None:
+
+        ##
+        #
+        # Stops the service, once all the queued e-books have been converted.
+        #
+        # @param cancel Stop right away instead, abandoning the conversions which haven't started yet
+        #               (the ones in progress are left running).
+        #
+        ##
+
+        self._executor.shutdown(wait = not cancel, cancel_futures = cancel)
\ No newline at end of file
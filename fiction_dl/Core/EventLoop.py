@@ -0,0 +1,123 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+import asyncio
+from concurrent.futures import Future
+from threading import Thread
+from typing import Any, Coroutine, Optional
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# An asyncio event loop running in a background thread. Coroutines can be submitted from any thread;
+# all of them are multiplexed by the same loop.
+#
+##
+
+class EventLoop:
+
+    def __init__(self) -> None:
+
+        ##
+        #
+        # The constructor. Starts the loop.
+        #
+        ##
+
+        self._loop = asyncio.new_event_loop()
+
+        self._thread = Thread(target = self._Run, name = "EventLoop", daemon = True)
+        self._thread.start()
+
+    def Submit(self, coroutine: Coroutine) -> Future:
+
+        ##
+        #
+        # Schedules a coroutine.
+        #
+        # @param coroutine The coroutine.
+        #
+        # @return A future representing the result of the coroutine. Cancelling the future cancels the
+        #         coroutine.
+        #
+        ##
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def Run(self, coroutine: Coroutine) -> Any:
+
+        ##
+        #
+        # Runs a coroutine and waits for its result.
+        #
+        # @param coroutine The coroutine.
+        #
+        # @return The result of the coroutine.
+        #
+        ##
+
+        return self.Submit(coroutine).result()
+
+    def Close(self, finalCoroutine: Optional[Coroutine] = None) -> None:
+
+        ##
+        #
+        # Stops the loop.
+        #
+        # @param finalCoroutine A coroutine run before the loop is stopped (releasing some resources, for
+        #                       example). Optional.
+        #
+        ##
+
+        if finalCoroutine:
+            self.Run(finalCoroutine)
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+        self._loop.close()
+
+    def _Run(self) -> None:
+
+        ##
+        #
+        # Runs the loop (in the background thread) until it's stopped.
+        #
+        ##
+
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
\ No newline at end of file
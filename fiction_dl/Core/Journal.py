@@ -0,0 +1,226 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from enum import Enum
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Represents the journal of a run: an append-only file recording the list of URLs to be processed
+# (after expanding and shuffling the input) and the progress made on every one of them, so that a run
+# which has been interrupted can be resumed.
+#
+# Every entry is a line of JSON, written as soon as it's recorded. If the application is killed, only
+# the entry being written at that moment might be incomplete (and it's ignored when reading the
+# journal).
+#
+##
+
+class Journal:
+
+    ##
+    #
+    # Represents the state of a URL.
+    #
+    ##
+
+    class State(Enum):
+        SCANNED   = "Scanned"
+        EXTRACTED = "Extracted"
+        FINISHED  = "Finished"
+        FAILED    = "Failed"
+
+    def __init__(self, filePath: Path) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param filePath The path of the journal file.
+        #
+        ##
+
+        self._filePath = filePath
+        self._file = None
+        self._lock = Lock()
+
+        self._states = {}
+
+    def Read(self, inputArgument: str) -> Optional[List[str]]:
+
+        ##
+        #
+        # Reads the journal of the previous run, and continues it.
+        #
+        # @param inputArgument The input of the current run (the journal is used only if it's the same).
+        #
+        # @return The URLs processed by the previous run, or **None** if there's no journal of a run
+        #         using the same input.
+        #
+        ##
+
+        if not self._filePath.is_file():
+            return None
+
+        URLs = None
+        states = {}
+        isComplete = True
+
+        with open(self._filePath, "r", encoding = "utf-8") as file:
+
+            for line in file:
+
+                isComplete = line.endswith("\n")
+
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if "URLs" in entry:
+
+                    if inputArgument != entry.get("Input"):
+                        return None
+
+                    URLs = entry["URLs"]
+
+                elif ("URL" in entry) and (entry.get("State") in self._StateValues):
+
+                    states[entry["URL"]] = Journal.State(entry["State"])
+
+        if URLs is None:
+            return None
+
+        with self._lock:
+
+            self._states = states
+            self._file = open(self._filePath, "a", encoding = "utf-8")
+
+            # The last entry might have been cut off: the next one has to start on a new line anyway.
+
+            if not isComplete:
+                self._file.write("\n")
+                self._file.flush()
+
+        return URLs
+
+    def Start(self, inputArgument: str, URLs: List[str]) -> None:
+
+        ##
+        #
+        # Starts a new journal (replacing the previous one).
+        #
+        # @param inputArgument The input of the run.
+        # @param URLs          The URLs to be processed.
+        #
+        ##
+
+        with self._lock:
+
+            self._states = {}
+
+            self._filePath.parent.mkdir(parents = True, exist_ok = True)
+            self._file = open(self._filePath, "w", encoding = "utf-8")
+
+            self._WriteEntry({"Input": inputArgument, "URLs": URLs})
+
+    def Record(self, URL: str, state: State) -> None:
+
+        ##
+        #
+        # Records the state of a URL.
+        #
+        # @param URL   The URL.
+        # @param state The state.
+        #
+        ##
+
+        with self._lock:
+
+            self._states[URL] = state
+
+            if self._file:
+                self._WriteEntry({"URL": URL, "State": state.value})
+
+    def GetState(self, URL: str) -> Optional[State]:
+
+        ##
+        #
+        # Returns the (last recorded) state of a URL.
+        #
+        # @param URL The URL.
+        #
+        # @return The state, or **None** if no state has been recorded.
+        #
+        ##
+
+        with self._lock:
+            return self._states.get(URL)
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Closes the journal file.
+        #
+        ##
+
+        with self._lock:
+
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _WriteEntry(self, entry: Dict) -> None:
+
+        ##
+        #
+        # Writes an entry to the journal file (immediately). Has to be called holding the lock.
+        #
+        # @param entry The entry.
+        #
+        ##
+
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    # The values of the states of URLs.
+    _StateValues = [state.value for state in State]
\ No newline at end of file
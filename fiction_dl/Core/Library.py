@@ -0,0 +1,260 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import sqlite3
+import threading
+from time import time
+from typing import Any, Dict, Iterator, List, Optional
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Represents the library: the index of saved stories, kept in the output directory. It maps the URL of
+# every saved story to the paths of its output files, along with the state of the story when it was
+# saved (the date of its last update, the number of its chapters and the hash of its content) - so
+# that stories can be recognized as saved (or as changed since they were saved) without any requests.
+#
+# The paths are stored relative to the library's directory, so the whole directory can be moved. The
+# library can be shared by multiple threads: every thread uses its own connection to the database.
+#
+##
+
+class Library:
+
+    def __init__(self, filePath: Path) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param filePath The path of the library's database. It (and its directory) will be created
+        #                 when it's first used.
+        #
+        ##
+
+        self._filePath = filePath
+
+        self._threadData = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        self._tablesCreated = False
+
+    def AddStory(
+        self,
+        URL: str,
+        outputFilePaths: List[Path],
+        dateUpdated: Optional[str],
+        chapterCount: int,
+        contentHash: str
+    ) -> None:
+
+        ##
+        #
+        # Adds a saved story to the library (or updates its entry).
+        #
+        # @param URL             The URL of the story (see Story.InputURL).
+        # @param outputFilePaths The paths of the output files.
+        # @param dateUpdated     The date of the last update of the story.
+        # @param chapterCount    The number of chapters.
+        # @param contentHash     The hash of the content of the story.
+        #
+        ##
+
+        relativeFilePaths = [self._GetRelativePath(filePath) for filePath in outputFilePaths]
+
+        with self._Transaction() as connection:
+
+            connection.execute(
+                "INSERT OR REPLACE INTO Stories VALUES (?, ?, ?, ?, ?, ?)",
+                (URL, json.dumps(relativeFilePaths), dateUpdated, chapterCount, contentHash, time())
+            )
+
+    def RetrieveStory(self, URL: str) -> Optional[Dict[str, Any]]:
+
+        ##
+        #
+        # Looks up a saved story.
+        #
+        # @param URL The URL of the story (see Story.InputURL).
+        #
+        # @return A dictionary ("OutputFilePaths", "DateUpdated", "ChapterCount", "ContentHash" and
+        #         "DateSaved"), or **None** if the story isn't present in the library.
+        #
+        ##
+
+        row = self._GetConnection().execute(
+            "SELECT OutputFilePaths, DateUpdated, ChapterCount, ContentHash, DateSaved FROM Stories "
+            "WHERE URL = ?",
+            (URL,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            "OutputFilePaths": [self._filePath.parent / filePath for filePath in json.loads(row[0])],
+            "DateUpdated": row[1],
+            "ChapterCount": row[2],
+            "ContentHash": row[3],
+            "DateSaved": row[4],
+        }
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Closes the library. It can be used afterwards (new connections are opened when needed).
+        #
+        ##
+
+        with self._lock:
+
+            for connection in self._connections:
+                connection.close()
+
+            self._connections.clear()
+
+        self._threadData = threading.local()
+
+    def _GetConnection(self) -> sqlite3.Connection:
+
+        ##
+        #
+        # Returns the calling thread's connection to the database, opening it (and creating the
+        # database) if necessary.
+        #
+        # @return The connection.
+        #
+        ##
+
+        if (connection := getattr(self._threadData, "Connection", None)):
+            return connection
+
+        self._filePath.parent.mkdir(parents = True, exist_ok = True)
+
+        connection = sqlite3.connect(
+            self._filePath,
+            timeout = self._LockTimeout,
+            isolation_level = None,
+            check_same_thread = False
+        )
+
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+
+        self._threadData.Connection = connection
+
+        with self._lock:
+
+            self._connections.append(connection)
+
+            if not self._tablesCreated:
+                self._CreateTables(connection)
+                self._tablesCreated = True
+
+        return connection
+
+    @contextmanager
+    def _Transaction(self) -> Iterator[sqlite3.Connection]:
+
+        ##
+        #
+        # Runs a block of code in a transaction holding the database's write lock. The transaction is
+        # committed at the end of the block, or rolled back if an exception is thrown.
+        #
+        # @return The connection used.
+        #
+        ##
+
+        connection = self._GetConnection()
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+
+            yield connection
+
+        except BaseException:
+
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    def _CreateTables(self, connection: sqlite3.Connection) -> None:
+
+        ##
+        #
+        # Creates the tables making up the database (unless they exist already).
+        #
+        # @param connection The connection used.
+        #
+        ##
+
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS Stories ("
+            "    URL TEXT NOT NULL PRIMARY KEY,"
+            "    OutputFilePaths TEXT NOT NULL,"
+            "    DateUpdated TEXT,"
+            "    ChapterCount INTEGER NOT NULL,"
+            "    ContentHash TEXT NOT NULL,"
+            "    DateSaved REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+
+    def _GetRelativePath(self, filePath: Path) -> str:
+
+        ##
+        #
+        # Converts a path to the one relative to the library's directory (if possible).
+        #
+        # @param filePath The path.
+        #
+        # @return The converted path.
+        #
+        ##
+
+        try:
+            return str(filePath.resolve().relative_to(self._filePath.parent.resolve()))
+        except ValueError:
+            return str(filePath.resolve())
+
+    # The time after which an attempt to lock the database fails, in seconds.
+    _LockTimeout = 60.0
\ No newline at end of file
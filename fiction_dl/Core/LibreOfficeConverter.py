@@ -0,0 +1,259 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Utilities.General import RunProcess
+
+# Standard packages.
+
+from concurrent.futures import Future
+import logging
+from pathlib import Path
+from queue import Empty, Queue
+import shutil
+from tempfile import TemporaryDirectory
+import threading
+from typing import List, Tuple
+
+# Non-standard packages.
+
+from dreamy_utilities.Text import Stringify
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A long-lived service converting documents to PDF files using LibreOffice. Conversions are queued and
+# performed by a worker thread, in batches: all the documents waiting in the queue (up to a limit) are
+# converted by one LibreOffice process, so LibreOffice is started once per batch instead of once per
+# document. LibreOffice uses its own user profile, kept for the lifetime of the service, so it doesn't
+# conflict with an instance the user might have open (and doesn't have to recreate the profile).
+# Callers don't wait for their conversions, so the documents of many stories end up in one batch.
+#
+# A process which doesn't finish in time is killed. If a batch fails (the process crashes or is killed),
+# its documents are converted again one by one, each by a new process - so one broken document doesn't
+# prevent the others from being converted.
+#
+##
+
+class LibreOfficeConverter:
+
+    def __init__(self, executableFilePath: Path, timeout: float, maximumBatchSize: int) -> None:
+
+        ##
+        #
+        # The constructor. The worker thread is started once the first conversion is requested.
+        #
+        # @param executableFilePath The path to the LibreOffice executable (soffice.exe/soffice).
+        # @param timeout            The time a single document can take to be converted, in seconds.
+        # @param maximumBatchSize   The maximum number of documents converted by one process. Twice as many
+        #                           documents can wait in the queue.
+        #
+        ##
+
+        self._executableFilePath = executableFilePath
+        self._timeout = timeout
+        self._maximumBatchSize = maximumBatchSize
+
+        self._queue = Queue(2 * maximumBatchSize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._profileDirectory = None
+
+    def Submit(self, sourceFilePath: Path, outputDirectoryPath: Path) -> Future:
+
+        ##
+        #
+        # Queues a document to be converted to a PDF file, in the background. The output file has the
+        # same (base)name as the source file; it's overwritten if it exists. If the queue is full, waits
+        # until there's room in it (so that the documents waiting for conversion don't pile up).
+        #
+        # @param sourceFilePath      The path to the document.
+        # @param outputDirectoryPath The path to the output directory. It has to exist.
+        #
+        # @return A future; its result is **True** if the document has been converted, **False**
+        #         otherwise.
+        #
+        ##
+
+        future = Future()
+
+        with self._lock:
+
+            if not self._thread:
+
+                self._profileDirectory = TemporaryDirectory()
+
+                self._thread = threading.Thread(target = self._Work, name = "LibreOfficeConverter", daemon = True)
+                self._thread.start()
+
+        self._queue.put((sourceFilePath, outputDirectoryPath, future))
+
+        return future
+
+    def Close(self, cancel: bool = False) -> None:
+
+        ##
+        #
+        # Stops the service, once all the queued documents have been converted.
+        #
+        # @param cancel Stop right away instead, abandoning the queued documents (the worker thread is
+        #               left to finish the conversion in progress).
+        #
+        ##
+
+        with self._lock:
+
+            if not self._thread:
+                return
+
+            if not cancel:
+                self._queue.put(None)
+                self._thread.join()
+
+            self._thread = None
+
+            self._profileDirectory.cleanup()
+            self._profileDirectory = None
+
+    def _Work(self) -> None:
+
+        ##
+        #
+        # Converts queued documents, batch after batch (run by the worker thread).
+        #
+        ##
+
+        deferredJobs = []
+
+        while True:
+
+            # Collect a batch: the first job waiting, and whatever else is in the queue. Documents with
+            # the same name are converted by separate processes, as their output files would collide.
+
+            batch = deferredJobs[:1] or [self._queue.get()]
+            deferredJobs = deferredJobs[1:]
+
+            if batch[0] is None:
+                return
+
+            # Every job deferred earlier is considered once (before the ones in the queue); the ones which
+            # still collide are deferred again.
+
+            pendingJobs = deferredJobs
+            deferredJobs = []
+
+            while len(batch) < self._maximumBatchSize:
+
+                try:
+                    job = pendingJobs.pop(0) if pendingJobs else self._queue.get_nowait()
+                except Empty:
+                    break
+
+                if job is None:
+                    deferredJobs.append(job)
+                    break
+
+                if any(job[0].stem == batchJob[0].stem for batchJob in batch):
+                    deferredJobs.append(job)
+                else:
+                    batch.append(job)
+
+            deferredJobs += pendingJobs
+
+            # Convert the documents. Retry failed batches one document at a time.
+
+            if not self._ConvertBatch(batch) and (len(batch) > 1):
+
+                logging.info("A LibreOffice process has failed; converting the documents separately.")
+
+                for job in batch:
+                    if not job[2].done():
+                        self._ConvertBatch([job])
+
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(False)
+
+    def _ConvertBatch(self, batch: List[Tuple[Path, Path, Future]]) -> bool:
+
+        ##
+        #
+        # Converts a batch of documents using one LibreOffice process. The futures of the documents
+        # converted successfully are resolved.
+        #
+        # @param batch The jobs: tuples containing the source file path, the output directory path and
+        #              the future.
+        #
+        # @return **True** if the process has finished successfully, **False** otherwise.
+        #
+        ##
+
+        with TemporaryDirectory() as temporaryDirectoryPath:
+
+            command = [
+                Stringify(self._executableFilePath),
+                "--headless",
+                "--norestore",
+                f"-env:UserInstallation={Path(self._profileDirectory.name).resolve().as_uri()}",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                temporaryDirectoryPath,
+                *[Stringify(sourceFilePath) for sourceFilePath, _, _ in batch],
+            ]
+
+            succeeded = RunProcess(command, self._timeout * len(batch))
+
+            # Move the output files to their directories.
+
+            for sourceFilePath, outputDirectoryPath, future in batch:
+
+                outputFilePath = Path(temporaryDirectoryPath) / f"{sourceFilePath.stem}.pdf"
+
+                if not outputFilePath.is_file():
+                    continue
+
+                try:
+
+                    shutil.move(Stringify(outputFilePath), Stringify(outputDirectoryPath / outputFilePath.name))
+                    future.set_result(True)
+
+                except OSError as caughtException:
+
+                    logging.error(f'Failed to save a PDF file: "{outputFilePath.name}" ({caughtException}).')
+                    future.set_result(False)
+
+        return succeeded
\ No newline at end of file
@@ -0,0 +1,166 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Core.RateLimiter import RateLimiter
+
+# Standard packages.
+
+from typing import Dict, Optional, Union
+
+# Non-standard packages.
+
+from cloudscraper import CloudScraper
+from dreamy_utilities.WebSession import DEFAULT_TEXT_ENCODING, WebSession
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A web session sending its requests through a rate limiter. GetSoup() uses Get(), so it's limited as
+# well.
+#
+##
+
+class RateLimitedWebSession(WebSession):
+
+    def __init__(
+        self,
+        userAgent: str = "",
+        useCloudscraper: bool = False,
+        rateLimiter: Optional[RateLimiter] = None
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param userAgent       The user agent.
+        # @param useCloudscraper Use Cloudscraper instead of a plain requests session.
+        # @param rateLimiter     The rate limiter. Optional: if there's none, requests aren't limited.
+        #
+        ##
+
+        super().__init__(userAgent, useCloudscraper)
+
+        self._rateLimiter = rateLimiter
+
+    def GetUserAgent(self) -> str:
+
+        ##
+        #
+        # Returns the user agent.
+        #
+        # @return The user agent.
+        #
+        ##
+
+        return self._userAgent
+
+    def GetCookies(self) -> Dict[str, str]:
+
+        ##
+        #
+        # Returns the cookies received so far (set when logging-in, for example).
+        #
+        # @return The cookies, as a dictionary.
+        #
+        ##
+
+        return self._session.cookies.get_dict()
+
+    def UsesCloudscraper(self) -> bool:
+
+        ##
+        #
+        # Checks whether the session uses Cloudscraper (and so can't be replaced by a plain session).
+        #
+        # @return **True** if it does, **False** otherwise.
+        #
+        ##
+
+        return isinstance(self._session, CloudScraper)
+
+    def Get(
+        self,
+        URL: str,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING,
+        stream: bool = False
+    ) -> Optional[Union[bytes, str]]:
+
+        ##
+        #
+        # Sends a GET request, once the rate limiter allows it.
+        #
+        # @param URL          The URL.
+        # @param text         Return the response as text (instead of bytes).
+        # @param textEncoding The encoding of the text.
+        # @param stream       Stream the response.
+        #
+        # @return The response, or **None** if the request has failed.
+        #
+        ##
+
+        if self._rateLimiter:
+            self._rateLimiter.Acquire(URL)
+
+        return super().Get(URL, text, textEncoding, stream)
+
+    def Post(
+        self,
+        URL: str,
+        payload,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING
+    ) -> Optional[Union[bytes, str]]:
+
+        ##
+        #
+        # Sends a POST request, once the rate limiter allows it.
+        #
+        # @param URL          The URL.
+        # @param payload      The payload.
+        # @param text         Return the response as text (instead of bytes).
+        # @param textEncoding The encoding of the text.
+        #
+        # @return The response, or **None** if the request has failed.
+        #
+        ##
+
+        if self._rateLimiter:
+            self._rateLimiter.Acquire(URL)
+
+        return super().Post(URL, payload, text, textEncoding)
\ No newline at end of file
@@ -0,0 +1,154 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+import threading
+from time import monotonic, sleep
+from typing import Dict, List, Tuple
+
+# Non-standard packages.
+
+from dreamy_utilities.Web import GetHostname
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Limits the rate at which requests are sent, separately for every host (so that different hosts
+# never throttle each other). Uses the token bucket algorithm: every host has a bucket holding up to
+# "burst" tokens, refilled at the rate of "rate" tokens per second; sending a request takes one token.
+#
+# The limiter is thread-safe. Requests are served in the order in which they've been reserved.
+#
+##
+
+class RateLimiter:
+
+    def __init__(self, rate: float, burst: int) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param rate  The default number of requests per second.
+        # @param burst The default number of requests that can be sent at once.
+        #
+        ##
+
+        self._rate = rate
+        self._burst = burst
+
+        self._limits = {}
+        self._buckets: Dict[str, List[float]] = {}
+
+        self._lock = threading.Lock()
+
+    def SetLimits(self, hostname: str, rate: float, burst: int) -> None:
+
+        ##
+        #
+        # Sets the limits for a host.
+        #
+        # @param hostname The hostname, as returned by GetHostname() (e.g. "fanfiction.net").
+        # @param rate     The number of requests per second.
+        # @param burst    The number of requests that can be sent at once.
+        #
+        ##
+
+        with self._lock:
+            self._limits[hostname] = (rate, burst)
+
+    def GetLimits(self, URL: str) -> Tuple[float, int]:
+
+        ##
+        #
+        # Returns the limits applying to requests sent to given URL.
+        #
+        # @param URL The URL.
+        #
+        # @return A tuple: the number of requests per second, and the number of requests that can be
+        #         sent at once.
+        #
+        ##
+
+        with self._lock:
+            return self._limits.get(GetHostname(URL) or "", (self._rate, self._burst))
+
+    def Reserve(self, URL: str) -> float:
+
+        ##
+        #
+        # Reserves a request to given URL.
+        #
+        # @param URL The URL.
+        #
+        # @return The time the caller has to wait before sending the request, in seconds.
+        #
+        ##
+
+        hostname = GetHostname(URL) or ""
+        currentTime = monotonic()
+
+        with self._lock:
+
+            rate, burst = self._limits.get(hostname, (self._rate, self._burst))
+
+            if rate <= 0:
+                return 0
+
+            # Every bucket is a list: the number of tokens and the time of the last update. The number of
+            # tokens can be negative - that's how reservations are represented.
+
+            bucket = self._buckets.setdefault(hostname, [burst, currentTime])
+
+            bucket[0] = min(burst, bucket[0] + (currentTime - bucket[1]) * rate)
+            bucket[1] = currentTime
+
+            bucket[0] -= 1
+
+            return 0 if bucket[0] >= 0 else -bucket[0] / rate
+
+    def Acquire(self, URL: str) -> None:
+
+        ##
+        #
+        # Waits until a request to given URL can be sent.
+        #
+        # @param URL The URL.
+        #
+        ##
+
+        if (delay := self.Reserve(URL)) > 0:
+            sleep(delay)
\ No newline at end of file
@@ -0,0 +1,392 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Concepts.Chapter import Chapter
+from fiction_dl.Concepts.Image import Image
+from fiction_dl.Concepts.Story import Story
+
+# Standard packages.
+
+from hashlib import sha256
+import json
+from pathlib import Path
+from shutil import rmtree
+from typing import Optional
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A chapter whose content is stored in a file (read whenever it's accessed, and never kept in
+# memory). Setting the content overwrites the file; setting it to **None** doesn't change anything.
+#
+##
+
+class SpilledChapter(Chapter):
+
+    def __init__(self, filePath: Path, title: Optional[str] = None, content: Optional[str] = None) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param filePath The path of the file containing the content of the chapter.
+        # @param title    The title of the chapter.
+        # @param content  The content of the chapter. Optional: if it's not given, the content is the
+        #                 one already stored in the file.
+        #
+        ##
+
+        self._filePath = filePath
+
+        super().__init__(title, content)
+
+    @property
+    def FilePath(self) -> Path:
+
+        ##
+        #
+        # Returns the path of the file containing the content of the chapter.
+        #
+        # @return The path.
+        #
+        ##
+
+        return self._filePath
+
+    @property
+    def Content(self) -> Optional[str]:
+
+        ##
+        #
+        # Reads the content of the chapter.
+        #
+        # @return The content, or **None** if there's none.
+        #
+        ##
+
+        return self._filePath.read_bytes().decode() if self._filePath.is_file() else None
+
+    @Content.setter
+    def Content(self, content: Optional[str]) -> None:
+
+        ##
+        #
+        # Writes the content of the chapter.
+        #
+        # @param content The content.
+        #
+        ##
+
+        if content is not None:
+            self._filePath.write_bytes(content.encode())
+
+    def __bool__(self) -> bool:
+
+        ##
+        #
+        # The bool operator.
+        #
+        # @return **True** if the chapter has any content.
+        #
+        ##
+
+        return self._filePath.is_file() and (self._filePath.stat().st_size > 0)
+
+##
+#
+# An image whose data is stored in a file (read whenever it's accessed, and never kept in memory).
+# Setting the data overwrites the file; setting it to **None** doesn't change anything.
+#
+##
+
+class SpilledImage(Image):
+
+    def __init__(self, filePath: Path, URL: str) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param filePath The path of the file containing the data of the image.
+        # @param URL      The image's URL.
+        #
+        ##
+
+        self._filePath = filePath
+
+        super().__init__(URL)
+
+    @property
+    def Data(self) -> Optional[bytes]:
+
+        ##
+        #
+        # Reads the data of the image.
+        #
+        # @return The data, or **None** if there's none.
+        #
+        ##
+
+        return self._filePath.read_bytes() if self._filePath.is_file() else None
+
+    @Data.setter
+    def Data(self, data: Optional[bytes]) -> None:
+
+        ##
+        #
+        # Writes the data of the image.
+        #
+        # @param data The data.
+        #
+        ##
+
+        if data is not None:
+            self._filePath.write_bytes(data)
+
+    def __bool__(self) -> bool:
+
+        ##
+        #
+        # The bool operator.
+        #
+        # @return **True** if the image contains any data.
+        #
+        ##
+
+        return self._filePath.is_file() and (self._filePath.stat().st_size > 0)
+
+##
+#
+# Represents the spill area: a directory in which the content of stories is stored (until they're
+# formatted), so that it doesn't have to be kept in memory. Every story gets its own subdirectory,
+# containing the content of its chapters, the data of its images and a description of the story (its
+# metadata, chapter titles and image URLs and dimensions) - so spilled stories can be restored later,
+# by another run of the application.
+#
+# The chapters of very large stories can be spilled one by one, as soon as they're extracted; the
+# description is written only once the whole story has been spilled.
+#
+##
+
+class SpillArea:
+
+    def __init__(self, directoryPath: Path) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param directoryPath The path of the directory. It will be created when it's first used.
+        #
+        ##
+
+        self._directoryPath = directoryPath
+
+    def SpillStory(self, story: Story) -> Story:
+
+        ##
+        #
+        # Moves the content of a story to the spill area: its chapters and images are replaced with ones
+        # stored in files.
+        #
+        # @param story The story.
+        #
+        # @return The story.
+        #
+        ##
+
+        storyDirectoryPath = self._GetStoryDirectoryPath(story.InputURL)
+        storyDirectoryPath.mkdir(parents = True, exist_ok = True)
+
+        story.Chapters = [
+            self.SpillChapter(story.InputURL, index, chapter)
+            for index, chapter in enumerate(story.Chapters, start = 1)
+        ]
+
+        spilledImages = []
+
+        for index, image in enumerate(story.Images, start = 1):
+
+            spilledImage = SpilledImage(storyDirectoryPath / f"{index}.jpeg", image.URL)
+            spilledImage.Data = image.Data
+            spilledImage.W = image.W
+            spilledImage.H = image.H
+
+            spilledImages.append(spilledImage)
+
+        story.Images = spilledImages
+
+        # The description is written last: stories without it are incomplete.
+
+        description = {
+            "Metadata": {name: getattr(story.Metadata, name) for name in self._MetadataNames},
+            "Chapters": [chapter.Title for chapter in story.Chapters],
+            "Images": [(image.URL, image.W, image.H) for image in story.Images],
+        }
+
+        (storyDirectoryPath / self._DescriptionFileName).write_text(json.dumps(description), encoding = "utf-8")
+
+        return story
+
+    def SpillChapter(self, URL: str, index: int, chapter: Chapter) -> Chapter:
+
+        ##
+        #
+        # Moves the content of a single chapter to the spill area.
+        #
+        # @param URL     The URL of the story the chapter belongs to (see Story.InputURL).
+        # @param index   The index of the chapter (starting with 1).
+        # @param chapter The chapter.
+        #
+        # @return The chapter stored in the spill area.
+        #
+        ##
+
+        if isinstance(chapter, SpilledChapter) and (chapter.FilePath == self._GetChapterFilePath(URL, index)):
+            return chapter
+
+        storyDirectoryPath = self._GetStoryDirectoryPath(URL)
+        storyDirectoryPath.mkdir(parents = True, exist_ok = True)
+
+        return SpilledChapter(self._GetChapterFilePath(URL, index), chapter.Title, chapter.Content)
+
+    def RestoreStory(self, URL: str) -> Optional[Story]:
+
+        ##
+        #
+        # Restores a story stored in the spill area.
+        #
+        # @param URL The URL of the story (see Story.InputURL).
+        #
+        # @return The story, or **None** if it isn't present in the spill area.
+        #
+        ##
+
+        storyDirectoryPath = self._GetStoryDirectoryPath(URL)
+        descriptionFilePath = storyDirectoryPath / self._DescriptionFileName
+
+        try:
+            description = json.loads(descriptionFilePath.read_text(encoding = "utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        story = Story(URL)
+
+        for name, value in description["Metadata"].items():
+            setattr(story.Metadata, name, value)
+
+        story.Chapters = [
+            SpilledChapter(self._GetChapterFilePath(URL, index), title)
+            for index, title in enumerate(description["Chapters"], start = 1)
+        ]
+
+        for index, (imageURL, width, height) in enumerate(description["Images"], start = 1):
+
+            image = SpilledImage(storyDirectoryPath / f"{index}.jpeg", imageURL)
+            image.W = width
+            image.H = height
+
+            story.Images.append(image)
+
+        return story
+
+    def RemoveStory(self, URL: str) -> None:
+
+        ##
+        #
+        # Removes a story from the spill area (if it's present there).
+        #
+        # @param URL The URL of the story (see Story.InputURL).
+        #
+        ##
+
+        rmtree(self._GetStoryDirectoryPath(URL), ignore_errors = True)
+
+    def Clear(self) -> None:
+
+        ##
+        #
+        # Removes all the stories from the spill area.
+        #
+        ##
+
+        rmtree(self._directoryPath, ignore_errors = True)
+
+    def _GetStoryDirectoryPath(self, URL: str) -> Path:
+
+        ##
+        #
+        # Generates the path of the directory in which a story is stored.
+        #
+        # @param URL The URL of the story.
+        #
+        # @return The path.
+        #
+        ##
+
+        return self._directoryPath / sha256(URL.encode()).hexdigest()
+
+    def _GetChapterFilePath(self, URL: str, index: int) -> Path:
+
+        ##
+        #
+        # Generates the path of the file in which the content of a chapter is stored.
+        #
+        # @param URL   The URL of the story the chapter belongs to.
+        # @param index The index of the chapter (starting with 1).
+        #
+        # @return The path.
+        #
+        ##
+
+        return self._GetStoryDirectoryPath(URL) / f"{index}.html"
+
+    # The name of the file describing a spilled story.
+    _DescriptionFileName = "Story.json"
+
+    # The names of the metadata values stored along with a story.
+    _MetadataNames = [
+        "URL",
+        "Title",
+        "Author",
+        "Summary",
+        "DatePublished",
+        "DateUpdated",
+        "DateExtracted",
+        "ChapterCount",
+        "WordCount",
+    ]
\ No newline at end of file
@@ -0,0 +1,223 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from concurrent.futures import Executor, Future
+import logging
+from threading import Condition
+from typing import Callable, List, Optional, Union
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A set of tasks depending on each other, run by an executor (or performed in the background). A task
+# is started once all the tasks it depends on have finished, so independent tasks run in parallel. The
+# executor can be shared by many graphs, which limits the number of tasks run at once by all of them.
+#
+# A task depends on other tasks either strictly (it's skipped if any of them fails), or optionally (it
+# only waits for them). Dependencies on tasks which haven't been added are considered satisfied.
+#
+##
+
+class TaskGraph:
+
+    def __init__(self) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        ##
+
+        self._tasks = {}
+
+    def AddTask(
+        self,
+        name: str,
+        function: Callable[[], Union[bool, Future]],
+        dependencies: Optional[List[str]] = None,
+        optionalDependencies: Optional[List[str]] = None
+    ) -> None:
+
+        ##
+        #
+        # Adds a task.
+        #
+        # @param name                 The name of the task.
+        # @param function             The function performing the task. Returns **True** on success,
+        #                             **False** on failure - or a future resolved with one of them, if
+        #                             the task is performed in the background.
+        # @param dependencies         The names of the tasks which have to succeed before this one.
+        # @param optionalDependencies The names of the tasks which have to finish (successfully or not)
+        #                             before this one.
+        #
+        ##
+
+        self._tasks[name] = (function, dependencies or [], optionalDependencies or [])
+
+    def Run(
+        self,
+        executor: Executor,
+        callback: Optional[Callable[[str, Optional[bool]], None]] = None
+    ) -> Future:
+
+        ##
+        #
+        # Runs all the tasks. A task can be performed in the background (by some external service): its
+        # function returns a future then, and the task finishes once the future is resolved. The calling
+        # thread waits only while some task is run (or waits to be run) by the executor; the tasks depending
+        # on the ones performed in the background are started once they finish (using the same executor).
+        #
+        # A task which throws an exception (or whose future does) is considered to have failed.
+        #
+        # @param executor The executor running the tasks (it isn't shut down afterwards).
+        # @param callback A function called whenever a task finishes or is skipped (by the thread
+        #                 finishing it): receives the name of the task and its result. Optional.
+        #
+        # @return A future resolved once all the tasks have finished. Its result holds the results of the
+        #         tasks: **True** if a task has succeeded, **False** if it has failed, **None** if it has
+        #         been skipped.
+        #
+        ##
+
+        results = {}
+        pendingTasks = dict(self._tasks)
+
+        runningTaskCount = 0
+        backgroundTaskCount = 0
+
+        condition = Condition()
+        tasksFinished = Future()
+
+        def Finish(name: str, result: Optional[bool]) -> None:
+
+            results[name] = result
+
+            if callback:
+                callback(name, result)
+
+        def StartReadyTasks() -> None:
+
+            nonlocal runningTaskCount
+
+            # Start (or skip) every task whose dependencies have finished. Skipping a task might make
+            # others ready to be started (or skipped).
+
+            while (readyTasks := [
+                name for name, (_, dependencies, optionalDependencies) in pendingTasks.items()
+                if not any(
+                    (dependency in self._tasks) and (dependency not in results)
+                    for dependency in dependencies + optionalDependencies
+                )
+            ]):
+
+                for name in readyTasks:
+
+                    function, dependencies, _ = pendingTasks.pop(name)
+
+                    if all(results.get(dependency, True) for dependency in dependencies):
+                        runningTaskCount += 1
+                        executor.submit(RunTask, name, function)
+                    else:
+                        Finish(name, None)
+
+            if (not runningTaskCount) and (not backgroundTaskCount):
+
+                if pendingTasks:
+                    tasksFinished.set_exception(
+                        ValueError(f"The tasks depend on each other in a cycle: {list(pendingTasks)}.")
+                    )
+                else:
+                    tasksFinished.set_result(results)
+
+            condition.notify_all()
+
+        def RunTask(name: str, function: Callable[[], Union[bool, Future]]) -> None:
+
+            nonlocal runningTaskCount, backgroundTaskCount
+
+            try:
+
+                result = function()
+
+            except Exception as caughtException:
+
+                logging.exception(f'Task "{name}" has thrown an exception: {caughtException}')
+                result = False
+
+            if isinstance(result, Future):
+
+                with condition:
+                    runningTaskCount -= 1
+                    backgroundTaskCount += 1
+                    condition.notify_all()
+
+                result.add_done_callback(lambda future: FinishBackgroundTask(name, future))
+                return
+
+            with condition:
+                runningTaskCount -= 1
+                Finish(name, bool(result))
+                StartReadyTasks()
+
+        def FinishBackgroundTask(name: str, future: Future) -> None:
+
+            nonlocal backgroundTaskCount
+
+            try:
+
+                result = bool(future.result())
+
+            except BaseException as caughtException:
+
+                logging.error(f'Task "{name}" has failed in the background: {caughtException or "cancelled"}')
+                result = False
+
+            with condition:
+                backgroundTaskCount -= 1
+                Finish(name, result)
+                StartReadyTasks()
+
+        # Run the tasks which don't wait for the background ones.
+
+        with condition:
+            StartReadyTasks()
+            condition.wait_for(lambda: not runningTaskCount)
+
+        if tasksFinished.done() and tasksFinished.exception():
+            raise tasksFinished.exception()
+
+        return tasksFinished
\ No newline at end of file
@@ -35,7 +35,7 @@ from fiction_dl.Concepts.Extractor import Extractor
 
 import logging
 import re
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Non-standard packages.
 
@@ -191,6 +191,20 @@ class ExtractorAO3(Extractor):
 
         return False
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Can the chapters be extracted concurrently (by many threads at once)?
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        # All the chapters are extracted from the same page.
+
+        return False
+
     def ScanChannel(self, URL: str) -> Optional[List[str]]:
 
         ##
@@ -267,6 +281,23 @@ class ExtractorAO3(Extractor):
 
         return True
 
+    def RestoreScanState(self, state: Dict[str, Any]) -> bool:
+
+        ##
+        #
+        # Restores the results of a previous scan (as returned by GetScanState()).
+        #
+        # @param state The results of the scan.
+        #
+        # @return **False**: only the metadata can be restored, since extracting chapters requires
+        #         the tag soup of the whole work, downloaded when scanning.
+        #
+        ##
+
+        super().RestoreScanState(state)
+
+        return False
+
     def ExtractChapter(self, index: int) -> Optional[Chapter]:
 
         ##
@@ -35,7 +35,7 @@ import fiction_dl.Configuration as Configuration
 # Standard packages.
 
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Non-standard packages.
 
@@ -87,6 +87,23 @@ class ExtractorAsstrKristen(Extractor):
             "asstr.org",
         ]
 
+    def RestoreScanState(self, state: Dict[str, Any]) -> bool:
+
+        ##
+        #
+        # Restores the results of a previous scan (as returned by GetScanState()).
+        #
+        # @param state The results of the scan.
+        #
+        # @return **False**: only the metadata can be restored, since extracting chapters requires
+        #         the text of the story, downloaded when scanning.
+        #
+        ##
+
+        super().RestoreScanState(state)
+
+        return False
+
     def _InternallyScanStory(
         self,
         URL: str,
@@ -36,7 +36,7 @@ from fiction_dl.Concepts.Extractor import Extractor
 from datetime import datetime
 import logging
 import re
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Non-standard packages.
 
@@ -155,6 +155,42 @@ class ExtractorSamAndJack(Extractor):
 
         return storyURLs
 
+    def GetScanState(self) -> Optional[Dict[str, Any]]:
+
+        ##
+        #
+        # Returns the results of the last scan, including chapter titles.
+        #
+        # @return A JSON-serializable dictionary, or **None** if there's nothing worth storing.
+        #
+        ##
+
+        if not (state := super().GetScanState()):
+            return None
+
+        state["ChapterTitles"] = self._chapterTitles
+
+        return state
+
+    def RestoreScanState(self, state: Dict[str, Any]) -> bool:
+
+        ##
+        #
+        # Restores the results of a previous scan (as returned by GetScanState()).
+        #
+        # @param state The results of the scan.
+        #
+        # @return **True** if the extractor is ready to extract chapters, **False** otherwise.
+        #
+        ##
+
+        if "ChapterTitles" not in state:
+            return False
+
+        self._chapterTitles = dict(state["ChapterTitles"])
+
+        return super().RestoreScanState(state)
+
     def _InternallyScanStory(
         self,
         URL: str,
@@ -36,7 +36,7 @@ import fiction_dl.Configuration as Configuration
 # Standard packages.
 
 from itertools import groupby
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Non-standard packages.
 
@@ -78,6 +78,20 @@ class ExtractorTextFile(Extractor):
 
         return False
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Can the chapters be extracted concurrently (by many threads at once)?
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        # There's nothing to download.
+
+        return False
+
     def Initialize(self, filePath: str) -> bool:
 
         ##
@@ -94,7 +108,7 @@ class ExtractorTextFile(Extractor):
             return False
 
         self._filePath = filePath
-        self.Story = Story()
+        self.Story = Story(filePath)
 
         return True
 
@@ -164,6 +178,18 @@ class ExtractorTextFile(Extractor):
 
         return True
 
+    def GetScanState(self) -> Optional[Dict[str, Any]]:
+
+        ##
+        #
+        # Returns the results of the last scan. Not worth storing: scanning a local file is cheap.
+        #
+        # @return **None**.
+        #
+        ##
+
+        return None
+
     def ExtractChapter(self, index: int) -> Optional[Chapter]:
 
         ##
@@ -80,6 +80,20 @@ class ExtractorXenForo(Extractor):
 
         return True
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Can the chapters be extracted concurrently (by many threads at once)?
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        # Chapters (threadmarks) are extracted from shared pages.
+
+        return False
+
     def Authenticate(self, interface: Interface) -> bool:
 
         ##
@@ -28,7 +28,9 @@
 
 # Application.
 
+from fiction_dl.Concepts.Chapter import Chapter
 from fiction_dl.Concepts.Formatter import Formatter
+from fiction_dl.Concepts.Image import Image
 from fiction_dl.Concepts.Story import Story
 from fiction_dl.Concepts.StoryPackage import StoryPackage
 from fiction_dl.Utilities.Filesystem import GetPackageDirectory
@@ -36,8 +38,9 @@ from fiction_dl.Utilities.HTML import ReformatHTMLToXHTML
 
 # Standard packages.
 
+from functools import partial
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Union
 
 # Non-standard packages.
 
@@ -119,7 +122,7 @@ class FormatterEPUB(Formatter):
                 if not image:
                     continue
 
-                self._EmbedImage(book, f"{index}.jpeg", image.Data)
+                self._EmbedImage(book, f"{index}.jpeg", image)
 
         # Prepare the spine.
 
@@ -158,127 +161,222 @@ class FormatterEPUB(Formatter):
 
         book.add_item(stylesheet)
 
-        # Add chapters and create book spine.
+        # Add chapters and create book spine. The content of every chapter is generated only when the
+        # e-book is written (one chapter at a time, so that the content of the whole story doesn't have
+        # to be kept in memory).
 
-        imageIndex = 0
-        stories = story.Stories if isinstance(story, StoryPackage) else [story]
-
-        for storyIndex, specificStory in enumerate(stories, start = 1):
+        def PackageChapterTitler(index: int, chapterTitle: str, storyTitle: str) -> str:
+            return f"{storyTitle} — Chapter {index}" + (f": {chapterTitle}" if chapterTitle else "")
 
-            prettifiedStoryTitle = specificStory.Metadata.GetPrettified().Title
+        def StoryChapterTitler(index: int, chapterTitle: str, storyTitle: str) -> str:
+            return f"Chapter {index}" + (f": {chapterTitle}" if chapterTitle else "")
 
-            for index, chapter in enumerate(specificStory.Chapters, start = 1):
+        def PackagePrefixer(index: int, chapterTitle: str, storyTitle: str) -> str:
+            return f"<h2>{PackageChapterTitler(index, chapterTitle, storyTitle)}</h2>"
 
-                def PackageChapterTitler(index: int, chapterTitle: str, storyTitle: str) -> str:
-                    return f"{storyTitle} — Chapter {index}" + (f": {chapterTitle}" if chapterTitle else "")
+        def StoryPrefixer(index: int, chapterTitle: str, storyTitle: str) -> str:
+            return f"<h2>{StoryChapterTitler(index, chapterTitle, storyTitle)}</h2>"
 
-                def StoryChapterTitler(index: int, chapterTitle: str, storyTitle: str) -> str:
-                    return f"Chapter {index}" + (f": {chapterTitle}" if chapterTitle else "")
+        titler = PackageChapterTitler if isinstance(story, StoryPackage) else StoryChapterTitler
+        prefixer = PackagePrefixer if isinstance(story, StoryPackage) else StoryPrefixer
 
-                def PackagePrefixer(index: int, chapterTitle: str, storyTitle: str) -> str:
-                    return f"<h2>{PackageChapterTitler(index, chapterTitle, storyTitle)}</h2>"
+        stories = story.Stories if isinstance(story, StoryPackage) else [story]
 
-                def StoryPrefixer(index: int, chapterTitle: str, storyTitle: str) -> str:
-                    return f"<h2>{StoryChapterTitler(index, chapterTitle, storyTitle)}</h2>"
+        for storyIndex, specificStory in enumerate(stories, start = 1):
 
-                titler = PackageChapterTitler if isinstance(story, StoryPackage) else StoryChapterTitler
-                prefixer = PackagePrefixer if isinstance(story, StoryPackage) else StoryPrefixer
+            prettifiedStoryTitle = specificStory.Metadata.GetPrettified().Title
 
-                # Create the chapter.
+            for index, chapter in enumerate(specificStory.Chapters, start = 1):
 
-                bookChapter = epub.EpubHtml(
+                bookChapter = DeferredEpubHtml(
+                    partial(
+                        self._GenerateChapterContent,
+                        specificStory,
+                        index,
+                        chapter,
+                        prefixer(index, chapter.Title, prettifiedStoryTitle)
+                    ),
                     file_name = f"Story {storyIndex} - Chapter {index}.xhtml",
                     title = titler(index, chapter.Title, prettifiedStoryTitle),
                     lang = "en"
                 )
 
-                # Prepare chapter content.
+                book.add_item(bookChapter)
+                book.spine.append(bookChapter)
 
-                content = prefixer(index, chapter.Title, prettifiedStoryTitle) + chapter.Content
-                content = ReformatHTMLToXHTML(content)
+        # Create a ToC.
 
-                if self.CoverImageData and (len(specificStory.Chapters) == index):
-                    content += f'<img src = "{self._CoverImageName}"/>'
+        book.toc = book.spine[1:]
 
-                # Replace images.
+        # Add NCX and Navigation tile.
 
-                if self._embedImages:
+        book.add_item(epub.EpubNcx())
+        book.add_item(epub.EpubNav())
 
-                    soup = BeautifulSoup(content, features = "html.parser")
+        # Write the file. The list of pages isn't generated: the content doesn't mark any pages, and
+        # looking for them would require generating the content of every chapter twice.
 
-                    for index, tag in enumerate(soup.find_all("img")):
+        epub.write_epub(filePath, book, {"epub3_pages": False})
 
-                        if index >= len(specificStory.Images):
-                            continue
+        # Return.
 
-                        if (image := specificStory.Images[index]):
-                            tag["src"] = f"{index}.jpeg"
-                            tag["alt"] = "There is an image here."
-                        else:
-                            tag["alt"] = "There ought to be an image here."
+        return True
 
-                    content = str(soup)
+    def _GenerateChapterContent(self, story: Story, index: int, chapter: Chapter, prefix: str) -> str:
 
-                else:
+        ##
+        #
+        # Generates the content of a chapter of the e-book.
+        #
+        # @param story   The story the chapter belongs to.
+        # @param index   The index of the chapter (starting with 1).
+        # @param chapter The chapter.
+        # @param prefix  The code preceding the content of the chapter (its title).
+        #
+        # @return The content.
+        #
+        ##
 
-                    content = content.replace("<img/>", "")
+        content = prefix + chapter.Content
+        content = ReformatHTMLToXHTML(content)
 
-                # Set the chapter.
+        if self.CoverImageData and (len(story.Chapters) == index):
+            content += f'<img src = "{self._CoverImageName}"/>'
 
-                bookChapter.set_content(content)
+        # Replace images.
 
-                book.add_item(bookChapter)
-                book.spine.append(bookChapter)
+        if self._embedImages:
 
-        # Create a ToC.
+            soup = BeautifulSoup(content, features = "html.parser")
 
-        book.toc = book.spine[1:]
+            for index, tag in enumerate(soup.find_all("img")):
 
-        # Add NCX and Navigation tile.
+                if index >= len(story.Images):
+                    continue
 
-        book.add_item(epub.EpubNcx())
-        book.add_item(epub.EpubNav())
+                if (image := story.Images[index]):
+                    tag["src"] = f"{index}.jpeg"
+                    tag["alt"] = "There is an image here."
+                else:
+                    tag["alt"] = "There ought to be an image here."
 
-        # Write the file.
+            content = str(soup)
 
-        epub.write_epub(filePath, book, {})
+        else:
 
-        # Return.
+            content = content.replace("<img/>", "")
 
-        return True
+        return content
 
     @staticmethod
     def _EmbedImage(
         book: epub.EpubBook,
         fileName: str,
-        data: bytes,
+        image: Image,
         fileType: str = "image/jpeg"
     ) -> bool:
 
         ##
         #
-        # Embeds an image inside the created ebook.
+        # Embeds an image inside the created ebook. Its data is read only when the e-book is written.
         #
         # @param book     The ebook.
         # @param fileName Embedded image's file name (that is, the file name of the image file
         #                 *inside* the ebook archive).
-        # @param data     Image data: binary and encoded.
+        # @param image    The image.
         # @param fileType Image data type.
         #
         # @return **True** if the image has been embedded correctly, **False** otherwise.
         #
         ##
 
-        if (not book) or (not fileName) or (not data) or (not fileType):
+        if (not book) or (not fileName) or (not image) or (not fileType):
             return False
 
-        item = epub.EpubImage()
+        item = DeferredEpubImage(image)
         item.file_name = fileName
         item.media_type = fileType
-        item.content = data
 
         book.add_item(item)
 
         return True
 
-    _CoverImageName = "Cover.jpeg"
\ No newline at end of file
+    _CoverImageName = "Cover.jpeg"
+
+##
+#
+# An e-book chapter whose content is generated only when it's needed (when the e-book is written).
+#
+##
+
+class DeferredEpubHtml(epub.EpubHtml):
+
+    def __init__(self, contentGenerator: Callable[[], str], **kwargs) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param contentGenerator The function generating the content of the chapter.
+        # @param kwargs           The arguments passed to the constructor of the base class.
+        #
+        ##
+
+        super().__init__(**kwargs)
+
+        self._contentGenerator = contentGenerator
+
+    def get_content(self, default: Optional[bytes] = None) -> bytes:
+
+        ##
+        #
+        # Generates the content of the chapter. It isn't kept afterwards.
+        #
+        # @param default The default content.
+        #
+        # @return The content.
+        #
+        ##
+
+        self.content = self._contentGenerator()
+
+        try:
+            return super().get_content(default)
+        finally:
+            self.content = ""
+
+##
+#
+# An e-book image whose data is read only when it's needed (when the e-book is written).
+#
+##
+
+class DeferredEpubImage(epub.EpubImage):
+
+    def __init__(self, image: Image) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param image The image.
+        #
+        ##
+
+        super().__init__()
+
+        self._image = image
+
+    def get_content(self, default: Optional[bytes] = None) -> bytes:
+
+        ##
+        #
+        # Reads the data of the image.
+        #
+        # @param default The default data.
+        #
+        # @return The data.
+        #
+        ##
+
+        return self._image.Data or default
\ No newline at end of file
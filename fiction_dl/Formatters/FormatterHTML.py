@@ -37,7 +37,7 @@ from fiction_dl.Utilities.Filesystem import GetPackageDirectory
 
 from base64 import b64encode
 from pathlib import Path
-from typing import List, Union
+from typing import Callable, Iterator, List, Union
 
 # Non-standard packages.
 
@@ -96,7 +96,8 @@ class FormatterHTML(Formatter):
         # Load the template and fill it with the story.
 
         templateFilePath = GetPackageDirectory() / f"Templates/{templateFileName}"
-        content = story.FillTemplate(ReadTextFile(templateFilePath), escapeHTMLEntities = True)
+        template = story.FillTemplate(ReadTextFile(templateFilePath), escapeHTMLEntities = True)
+        head, _, tail = template.partition("@@@Content@@@")
 
         def ChapterTitler(index: int, chapterTitle: str) -> str:
             return f"Chapter {index}" + (f": {chapterTitle}" if chapterTitle else "")
@@ -108,43 +109,70 @@ class FormatterHTML(Formatter):
             return f"<h2>{ChapterTitler(index, chapterTitle)}</h2>"
 
         prefixer = PackagePrefixer if isinstance(story, StoryPackage) else StoryPrefixer
-        content = content.replace(
-            "@@@Content@@@",
-            story.Join(prefixer)
-        )
 
-        # Replace images.
+        # Save the template to file (writing the content one story, and one chapter, at a time).
 
-        if self._embedImages:
+        try:
 
-            soup = BeautifulSoup(content, features = "html.parser")
+            with open(filePath, "w", encoding = "utf-8") as outputFile:
 
-            for index, tag in enumerate(soup.find_all("img")):
+                outputFile.write(head)
 
-                if (0 == index) or (index > len(story.Images)):
-                    continue
+                for specificStory in story.Stories if isinstance(story, StoryPackage) else [story]:
+                    for content in self._GenerateStoryContent(specificStory, prefixer):
+                        outputFile.write(content)
 
-                if (image := story.Images[index - 1]):
-                    tag["src"] = "data:image/jpeg;base64," + b64encode(image.Data).decode()
-                    tag["alt"] = "There is an image here."
-                else:
-                    tag["alt"] = "There ought to be an image here."
+                outputFile.write(tail)
 
-            content = str(soup)
+            return True
 
-        else:
+        except OSError:
 
-            content = content.replace("<img/>", "")
+            return False
 
-        # Save the template to file.
+    def _GenerateStoryContent(
+        self,
+        story: Story,
+        prefixer: Callable[[int, str, str], str]
+    ) -> Iterator[str]:
 
-        try:
+        ##
+        #
+        # Generates the content of a single story, with its images embedded (or removed). The content is
+        # generated one chapter at a time, so that the content of the whole story is never kept in memory.
+        #
+        # @param story    The story.
+        # @param prefixer The function generating chapter prefixes.
+        #
+        # @return The content of consecutive chapters.
+        #
+        ##
 
-            with open(filePath, "w", encoding = "utf-8") as outputFile:
-                outputFile.write(content)
+        prettifiedTitle = story.Metadata.GetPrettified().Title
+        imageIndex = 0
 
-            return True
+        for index, chapter in enumerate(story.Chapters, start = 1):
 
-        except OSError:
+            content = prefixer(index, chapter.Title, prettifiedTitle) + chapter.Content
+
+            # Replace images.
+
+            if not self._embedImages:
+                yield content.replace("<img/>", "")
+                continue
+
+            soup = BeautifulSoup(content, features = "html.parser")
+
+            for tag in soup.find_all("img"):
+
+                if imageIndex < len(story.Images):
+
+                    if (image := story.Images[imageIndex]):
+                        tag["src"] = "data:image/jpeg;base64," + b64encode(image.Data).decode()
+                        tag["alt"] = "There is an image here."
+                    else:
+                        tag["alt"] = "There ought to be an image here."
+
+                imageIndex += 1
 
-            return False
\ No newline at end of file
+            yield str(soup)
\ No newline at end of file
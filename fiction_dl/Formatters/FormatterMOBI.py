@@ -30,15 +30,12 @@
 
 from fiction_dl.Concepts.Formatter import Formatter
 from fiction_dl.Concepts.Story import Story
+from fiction_dl.Core.CalibreConverter import CalibreConverter
 
 # Standard packages.
 
+from concurrent.futures import Future
 from pathlib import Path
-from subprocess import call, DEVNULL
-
-# Non-standard packages.
-
-from dreamy_utilities.Text import Stringify
 
 #
 #
@@ -88,38 +85,32 @@ class FormatterMOBI(Formatter):
     def ConvertFromEPUB(
         self,
         sourceFilePath: Path,
-        outputDirectoryPath: Path
-    ) -> bool:
+        outputDirectoryPath: Path,
+        converter: CalibreConverter
+    ) -> Future:
 
         ##
         #
-        # Converts an EPUB file to a MOBI file. The output file may exist: it will be overwritten if
-        # it does.
+        # Converts an EPUB file to a MOBI file, in the background. The output file may exist: it will be
+        # overwritten if it does.
         #
         # @param sourceFilePath      Path to the EPUB file.
         # @param outputDirectoryPath Path to the output directory. The output file will be created
         #                            inside it; its (base)name will be the same as the name of the
         #                            source file. The directory **has** to exist beforehand, this
         #                            method does *not* create it.
+        # @param converter           The Calibre conversion service.
         #
-        # @return **True** if the conversion has been performed successfully, **False** otherwise.
+        # @return A future; its result is **True** if the conversion has been performed successfully,
+        #         **False** otherwise.
         #
         ##
 
-        if not sourceFilePath.is_file():
-            return False
+        if (not sourceFilePath.is_file()) or (not outputDirectoryPath.is_dir()):
 
-        elif not outputDirectoryPath.is_dir():
-            return False
+            future = Future()
+            future.set_result(False)
 
-        call(
-            [
-                "ebook-convert",
-                Stringify(sourceFilePath),
-                Stringify(outputDirectoryPath / (sourceFilePath.stem + ".mobi")),
-            ],
-            stdout = DEVNULL,
-            stderr = DEVNULL
-        )
+            return future
 
-        return True
\ No newline at end of file
+        return converter.Submit(sourceFilePath, outputDirectoryPath / (sourceFilePath.stem + ".mobi"))
\ No newline at end of file
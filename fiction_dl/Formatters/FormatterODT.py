@@ -39,7 +39,7 @@ from fiction_dl.Utilities.HTML import StripEmptyTags
 import html
 from pathlib import Path
 import re
-from typing import List, Union
+from typing import List, Tuple, Union
 from zipfile import ZipFile, is_zipfile, ZIP_DEFLATED
 
 # Non-standard packages.
@@ -134,13 +134,7 @@ class FormatterODT(Formatter):
             return f"<h1>{ChapterTitler(index, chapterTitle)}</h1>"
 
         prefixer = PackagePrefixer if isinstance(story, StoryPackage) else StoryPrefixer
-
-        content = self._TranslateHTMLtoODT(story.Join(prefixer), story)
-        content = StripEmptyTags(
-            content,
-            validEmptyTags = ["draw:frame", "draw:image"],
-            validEmptyTagAttributes = {"text:style-name": "Horizontal_20_Line"}
-        )
+        stories = story.Stories if isinstance(story, StoryPackage) else [story]
 
         # Prepare the files.
 
@@ -157,7 +151,7 @@ class FormatterODT(Formatter):
         contentDocument = contentDocument.replace("http://link.link/", metadata.URL)
 
         EOF = contentDocument.find("</office:text>")
-        contentDocument = contentDocument[:EOF] + content + contentDocument[EOF:]
+        contentHead, contentTail = contentDocument[:EOF], contentDocument[EOF:]
 
         # Modify the metadata.
 
@@ -194,7 +188,7 @@ class FormatterODT(Formatter):
 
             for index, image in enumerate(story.Images):
 
-                if not image.Data:
+                if not image:
                     continue
 
                 EOF = manifestDocument.find("</manifest:manifest>")
@@ -220,10 +214,44 @@ class FormatterODT(Formatter):
                     outputArchive.writestr(item, archive.read(item.filename))
 
             outputArchive.writestr("META-INF/manifest.xml", manifestDocument)
-            outputArchive.writestr("content.xml", contentDocument)
             outputArchive.writestr("meta.xml", metadataDocument)
             outputArchive.writestr("styles.xml", stylesDocument)
 
+            # The content is translated and written one chapter at a time, so that the content of the
+            # whole story (or package) never has to be kept in memory.
+
+            with outputArchive.open("content.xml", "w", force_zip64 = (len(stories) > 1)) as contentFile:
+
+                contentFile.write(contentHead.encode())
+
+                firstImageIndex = 0
+
+                for specificStory in stories:
+
+                    prettifiedTitle = specificStory.Metadata.GetPrettified().Title
+                    imageIndex = 0
+
+                    for index, chapter in enumerate(specificStory.Chapters, start = 1):
+
+                        content, imageIndex = self._TranslateHTMLtoODT(
+                            prefixer(index, chapter.Title, prettifiedTitle) + chapter.Content,
+                            specificStory,
+                            firstImageIndex,
+                            imageIndex
+                        )
+
+                        content = StripEmptyTags(
+                            content,
+                            validEmptyTags = ["draw:frame", "draw:image"],
+                            validEmptyTagAttributes = {"text:style-name": "Horizontal_20_Line"}
+                        )
+
+                        contentFile.write(content.encode())
+
+                    firstImageIndex += len(specificStory.Images)
+
+                contentFile.write(contentTail.encode())
+
             if self._embedImages:
 
                 for index, image in enumerate(story.Images):
@@ -278,15 +306,24 @@ class FormatterODT(Formatter):
 
         return document
 
-    def _TranslateHTMLtoODT(self, code: str, story: Union[Story, StoryPackage]) -> str:
+    def _TranslateHTMLtoODT(
+        self,
+        code: str,
+        story: Union[Story, StoryPackage],
+        firstImageIndex: int = 0,
+        imageIndex: int = 0
+    ) -> Tuple[str, int]:
 
         ##
         #
         # Translates HTML code to ODT code.
         #
-        # @param code HTML code.
+        # @param code            HTML code.
+        # @param story           The story the code comes from.
+        # @param firstImageIndex The index (in the output file) of the first image of the story.
+        # @param imageIndex      The index of the first image of the story used in the code.
         #
-        # @return ODT code.
+        # @return ODT code, and the index of the next image of the story.
         #
         ##
 
@@ -294,8 +331,6 @@ class FormatterODT(Formatter):
 
         soup = BeautifulSoup(code, features = "html.parser")
 
-        imageIndex = 0
-
         for tag in soup.find_all(True, recursive = True):
 
             if "h1" == tag.name:
@@ -365,14 +400,14 @@ class FormatterODT(Formatter):
 
                 drawFrameTag = soup.new_tag("draw:frame")
                 drawFrameTag["draw:style-name"] = "Imported_Image"
-                drawFrameTag["draw:name"] = f"Image{imageIndex}"
+                drawFrameTag["draw:name"] = f"Image{firstImageIndex + imageIndex}"
                 drawFrameTag["text:anchor-type"] = "char"
                 drawFrameTag["svg:width"] = "{:.3f}cm".format(width)
                 drawFrameTag["svg:height"] = "{:.3f}cm".format(height)
                 drawFrameTag["draw:z-index"] = "1"
 
                 drawImageTag = soup.new_tag("draw:image")
-                drawImageTag["xlink:href"] = f"Pictures/{imageIndex}.jpeg"
+                drawImageTag["xlink:href"] = f"Pictures/{firstImageIndex + imageIndex}.jpeg"
                 drawImageTag["xlink:type"] = "simple"
                 drawImageTag["xlink:show"] = "embed"
                 drawImageTag["xlink:actuate"] = "onLoad"
@@ -383,4 +418,4 @@ class FormatterODT(Formatter):
 
                 imageIndex += 1
 
-        return str(soup)
\ No newline at end of file
+        return (str(soup), imageIndex)
\ No newline at end of file
@@ -30,15 +30,12 @@
 
 from fiction_dl.Concepts.Formatter import Formatter
 from fiction_dl.Concepts.Story import Story
+from fiction_dl.Core.LibreOfficeConverter import LibreOfficeConverter
 
 # Standard packages.
 
+from concurrent.futures import Future
 from pathlib import Path
-from subprocess import call, DEVNULL
-
-# Non-standard packages.
-
-from dreamy_utilities.Text import Stringify
 
 #
 #
@@ -89,45 +86,31 @@ class FormatterPDF(Formatter):
         self,
         sourceFilePath: Path,
         outputDirectoryPath: Path,
-        converterFilePath: Path
-    ) -> bool:
+        converter: LibreOfficeConverter
+    ) -> Future:
 
         ##
         #
-        # Converts an ODT file to a PDF file. The output file may exist: it will be overwritten if
-        # it does.
+        # Converts an ODT file to a PDF file, in the background. The output file may exist: it will be
+        # overwritten if it does.
         #
         # @param sourceFilePath      Path to the ODT file.
         # @param outputDirectoryPath Path to the output directory. The output file will be created
         #                            inside it; its (base)name will be the same as the name of the
         #                            source file. The directory **has** to exist beforehand, this
         #                            method does *not* create it.
-        # @param converterFilePath   Path to the LibreOffice executable (soffice.exe/soffice).
+        # @param converter           The LibreOffice conversion service.
         #
-        # @return **True** if the conversion has been performed successfully, **False** otherwise.
+        # @return A future; its result is **True** if the conversion has been performed successfully,
+        #         **False** otherwise.
         #
         ##
 
-        if not sourceFilePath.is_file():
-            return False
-
-        elif not outputDirectoryPath.is_dir():
-            return False
-
-        elif not converterFilePath.is_file():
-            return False
-
-        call(
-            [
-                Stringify(converterFilePath),
-                "--headless",
-                "--convert-to",
-                "pdf",
-                Stringify(sourceFilePath),
-                "--outdir",
-                Stringify(outputDirectoryPath),
-            ],
-            stdout = DEVNULL
-        )
-
-        return True
\ No newline at end of file
+        if (not sourceFilePath.is_file()) or (not outputDirectoryPath.is_dir()):
+
+            future = Future()
+            future.set_result(False)
+
+            return future
+
+        return converter.Submit(sourceFilePath, outputDirectoryPath)
\ No newline at end of file
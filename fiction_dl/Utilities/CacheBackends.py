@@ -0,0 +1,66 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.CacheBackends.CacheBackendFilesystem import CacheBackendFilesystem
+from fiction_dl.CacheBackends.CacheBackendHTTP import CacheBackendHTTP
+from fiction_dl.Concepts.CacheBackend import CacheBackend
+
+# Standard packages.
+
+from pathlib import Path
+from typing import Optional
+
+#
+#
+#
+# Functions.
+#
+#
+#
+
+def CreateCacheBackend(location: str) -> Optional[CacheBackend]:
+
+    ##
+    #
+    # Creates the appropriate cache backend for given location.
+    #
+    # @param location The location of the remote cache: either an HTTP(S) URL or a path to a directory.
+    #
+    # @return An initialized cache backend, or **None** if no location has been given.
+    #
+    ##
+
+    if not location:
+        return None
+
+    if location.lower().startswith(("http://", "https://")):
+        return CacheBackendHTTP(location)
+
+    return CacheBackendFilesystem(Path(location))
\ No newline at end of file
@@ -53,8 +53,25 @@ from fiction_dl.Extractors.ExtractorWuxiaWorld import ExtractorWuxiaWorld
 
 # Standard packages.
 
+from threading import Lock
 from typing import Optional
 
+# Non-standard packages.
+
+from dreamy_utilities.Web import GetHostname
+
+#
+#
+#
+# Globals.
+#
+#
+#
+
+# An extractor of every kind, used to find the one matching a URL.
+_extractorPrototypes = []
+_extractorPrototypesLock = Lock()
+
 #
 #
 #
@@ -67,7 +84,9 @@ def CreateExtractor(URL: str) -> Optional[Extractor]:
 
     ##
     #
-    # Creates the appropriate extractor for any given URL.
+    # Creates the appropriate extractor for any given URL. Only the matching extractor is created: an
+    # extractor of every kind is created only once (and used only to check which hostnames it supports),
+    # since creating one takes a while.
     #
     # @param URL The URL.
     #
@@ -75,34 +94,51 @@ def CreateExtractor(URL: str) -> Optional[Extractor]:
     #
     ##
 
-    availableExtractors = [
-
-        ExtractorAdultFanfiction(),
-        ExtractorAH(),
-        ExtractorAO3(),
-        ExtractorAsstrKristen(),
-        ExtractorFFNet(),
-        ExtractorFicWad(),
-        ExtractorHentaiFoundry(),
-        ExtractorHPFF(),
-        ExtractorLiterotica(),
-        ExtractorNajlepszaErotyka(),
-        ExtractorNifty(),
-        ExtractorQuestionableQuesting(),
-        ExtractorQuotev(),
-        ExtractorRalst(),
-        ExtractorReddit(),
-        ExtractorSamAndJack(),
-        ExtractorSpaceBattles(),
-        ExtractorSufficientVelocity(),
-        ExtractorWhoFic(),
-        ExtractorWuxiaWorld(),
-
-        ExtractorTextFile(),
-
-    ]
-
-    for extractor in availableExtractors:
+    global _extractorPrototypes
+
+    with _extractorPrototypesLock:
+
+        if not _extractorPrototypes:
+
+            _extractorPrototypes = [
+
+                ExtractorAdultFanfiction(),
+                ExtractorAH(),
+                ExtractorAO3(),
+                ExtractorAsstrKristen(),
+                ExtractorFFNet(),
+                ExtractorFicWad(),
+                ExtractorHentaiFoundry(),
+                ExtractorHPFF(),
+                ExtractorLiterotica(),
+                ExtractorNajlepszaErotyka(),
+                ExtractorNifty(),
+                ExtractorQuestionableQuesting(),
+                ExtractorQuotev(),
+                ExtractorRalst(),
+                ExtractorReddit(),
+                ExtractorSamAndJack(),
+                ExtractorSpaceBattles(),
+                ExtractorSufficientVelocity(),
+                ExtractorWhoFic(),
+                ExtractorWuxiaWorld(),
+
+                ExtractorTextFile(),
+
+            ]
+
+    # Extractors which don't support any hostnames (like the text file extractor) decide for themselves.
+
+    hostname = GetHostname(URL)
+
+    for prototype in _extractorPrototypes:
+
+        supportedHostnames = prototype.GetSupportedHostnames()
+
+        if supportedHostnames and (hostname not in supportedHostnames):
+            continue
+
+        extractor = type(prototype)()
 
         if extractor.Initialize(URL):
             return extractor
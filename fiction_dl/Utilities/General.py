@@ -28,12 +28,32 @@
 
 # Standard packages.
 
+import logging
+import os
 from pathlib import Path
+import signal
+from subprocess import DEVNULL, Popen, TimeoutExpired
+from threading import Lock
+from typing import List
 
 # Non-standard packages.
 
 import fitz
 
+#
+#
+#
+# Globals.
+#
+#
+#
+
+# The processes started by RunProcess() which are still running. Once KillProcesses() has been called,
+# no more processes are started.
+_runningProcesses = set()
+_runningProcessesLock = Lock()
+_processesKilled = False
+
 #
 #
 #
@@ -58,4 +78,106 @@ def RenderPDFPageToBytes(documentFilePath: Path, pageIndex: int) -> bytes:
     document = fitz.open(documentFilePath)
     page = document.loadPage(pageIndex)
 
-    return page.getPixmap().getImageData(output = "jpeg")
\ No newline at end of file
+    return page.getPixmap().getImageData(output = "jpeg")
+
+def RunProcess(command: List[str], timeout: float) -> bool:
+
+    ##
+    #
+    # Runs a process (with its output discarded), killing it - along with the processes it has started
+    # - if it doesn't finish in time.
+    #
+    # @param command The command.
+    # @param timeout The timeout, in seconds.
+    #
+    # @return **True** if the process has finished successfully, **False** otherwise.
+    #
+    ##
+
+    with _runningProcessesLock:
+
+        if _processesKilled:
+            return False
+
+        try:
+
+            process = Popen(command, stdout = DEVNULL, stderr = DEVNULL, start_new_session = _UseNewSessions())
+
+        except OSError as caughtException:
+
+            logging.error(f'Failed to start "{command[0]}": {caughtException}')
+            return False
+
+        _runningProcesses.add(process)
+
+    try:
+
+        return 0 == process.wait(timeout = timeout)
+
+    except TimeoutExpired:
+
+        logging.error(f'"{command[0]}" hasn\'t finished in {timeout:.0f} seconds; killing it.')
+
+        _KillProcess(process)
+        process.wait()
+
+        return False
+
+    finally:
+
+        with _runningProcessesLock:
+            _runningProcesses.discard(process)
+
+def KillProcesses() -> None:
+
+    ##
+    #
+    # Kills all the processes started by RunProcess() which are still running (along with the
+    # processes they have started), and prevents it from starting new ones. Used when quitting.
+    #
+    ##
+
+    global _processesKilled
+
+    with _runningProcessesLock:
+
+        _processesKilled = True
+
+        for process in _runningProcesses:
+            _KillProcess(process)
+
+def _KillProcess(process: Popen) -> None:
+
+    ##
+    #
+    # Kills a process started by RunProcess(), along with the processes it has started.
+    #
+    # @param process The process.
+    #
+    ##
+
+    try:
+
+        if _UseNewSessions():
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+
+    except OSError:
+
+        # The process has finished already.
+
+        pass
+
+def _UseNewSessions() -> bool:
+
+    ##
+    #
+    # Checks whether processes are started in new sessions (so that they can be killed along with the
+    # processes they start).
+    #
+    # @return **True** if they are, **False** otherwise.
+    #
+    ##
+
+    return "nt" != os.name
\ No newline at end of file
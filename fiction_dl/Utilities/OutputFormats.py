@@ -0,0 +1,106 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from typing import List
+
+#
+#
+#
+# Globals.
+#
+#
+#
+
+# The output formats (in the order they're generated in), along with the formats they're converted from:
+# PDF files are converted from ODT files, and MOBI files from EPUB files.
+OutputFormatSources = {
+    "HTML": [],
+    "ODT" : [],
+    "PDF" : ["ODT"],
+    "EPUB": [],
+    "MOBI": ["EPUB"],
+}
+
+#
+#
+#
+# Functions.
+#
+#
+#
+
+def ReadOutputFormats(text: str) -> List[str]:
+
+    ##
+    #
+    # Reads a list of output formats, e.g. "epub,html".
+    #
+    # @param text The names of the formats, separated with commas (case doesn't matter).
+    #
+    # @return The names of the formats, in the order they're generated in.
+    #
+    ##
+
+    names = [name.strip().upper() for name in text.split(",") if name.strip()]
+
+    if not names:
+        raise ValueError("no output format has been given")
+
+    if (unknownNames := [name for name in names if name not in OutputFormatSources]):
+        raise ValueError(f"unknown output format(s): {', '.join(unknownNames)}")
+
+    return [name for name in OutputFormatSources if name in names]
+
+def PlanOutputFormats(requestedFormats: List[str]) -> List[str]:
+
+    ##
+    #
+    # Determines which output formats have to be generated to obtain the requested ones: the requested
+    # formats themselves, and (recursively) the formats they're converted from. Formats which are only
+    # used optionally (like the PDF file providing the cover of the EPUB file) aren't included.
+    #
+    # @param requestedFormats The names of the requested formats.
+    #
+    # @return The names of the formats to be generated, in the order they're generated in.
+    #
+    ##
+
+    plannedFormats = set()
+    pendingFormats = list(requestedFormats)
+
+    while pendingFormats:
+
+        name = pendingFormats.pop()
+
+        if name not in plannedFormats:
+            plannedFormats.add(name)
+            pendingFormats.extend(OutputFormatSources[name])
+
+    return [name for name in OutputFormatSources if name in plannedFormats]
\ No newline at end of file
@@ -0,0 +1,109 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Processors.SanitizerProcessor import SanitizerProcessor
+from fiction_dl.Processors.TypographyProcessor import TypographyProcessor
+from fiction_dl.Utilities.Filesystem import GetPackageDirectory
+import fiction_dl.Configuration as Configuration
+
+# Standard packages.
+
+from functools import lru_cache
+from hashlib import sha256
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
+
+#
+#
+#
+# Functions.
+#
+#
+#
+
+def ProcessContent(content: str) -> Optional[str]:
+
+    ##
+    #
+    # Processes the content of a chapter using all the available processors.
+    #
+    # @param content The content to be processed.
+    #
+    # @return The processed content.
+    #
+    ##
+
+    # The sanitizer is used twice - once before any other processing, once after every other
+    # processor. The first time is required to clean up the story (remove empty tags and tag
+    # trees, for example), the second to guarantee that the story is actually sanitized.
+
+    content = SanitizerProcessor().Process(content)
+    content = TypographyProcessor().Process(content)
+    content = SanitizerProcessor().Process(content)
+
+    return content
+
+@lru_cache(maxsize = None)
+def GetContentProcessingVersion() -> str:
+
+    ##
+    #
+    # Returns the version of the content processing pipeline. It changes whenever the application's
+    # version, the code of any of the processors or the version of any package they use changes, so it
+    # can be used to invalidate content processed previously.
+    #
+    # @return The version, as a short hexadecimal string.
+    #
+    ##
+
+    packageDirectoryPath = GetPackageDirectory()
+
+    sourceFilePaths = [
+        packageDirectoryPath / "Concepts/Processor.py",
+        packageDirectoryPath / "Utilities/HTML.py",
+        packageDirectoryPath / "Utilities/Processors.py",
+        *sorted((packageDirectoryPath / "Processors").glob("*.py")),
+    ]
+
+    digest = sha256(Configuration.ApplicationVersion.encode())
+
+    for filePath in sourceFilePaths:
+        digest.update(filePath.read_bytes())
+
+    for packageName in ["beautifulsoup4", "bleach", "dreamy-utilities"]:
+
+        try:
+            packageVersion = version(packageName)
+        except PackageNotFoundError:
+            packageVersion = ""
+
+        digest.update(f"{packageName} {packageVersion}".encode())
+
+    return digest.hexdigest()[:16]
\ No newline at end of file
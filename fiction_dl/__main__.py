@@ -47,6 +47,7 @@ if __package__ is None:
 
 from fiction_dl.Core.Application import Application
 from fiction_dl.Utilities.Filesystem import GetLibreOfficeExecutablePath
+from fiction_dl.Utilities.OutputFormats import ReadOutputFormats
 import fiction_dl.Configuration as Configuration
 
 # Standard packages.
@@ -160,6 +161,13 @@ def ReadCommandLineArguments() -> Namespace:
         help = "overwrites output files (in case they already exist)"
     )
 
+    argumentParser.add_argument(
+        "-u",
+        dest = "UpdateStories",
+        action = "store_true",
+        help = "updates changed stories (downloads only new chapters, keeps the cache for future updates)"
+    )
+
     argumentParser.add_argument(
         "-d",
         dest = "Debug",
@@ -181,6 +189,144 @@ def ReadCommandLineArguments() -> Namespace:
         help = "preserves the cache after the application quits"
     )
 
+    argumentParser.add_argument(
+        "-cache-gc", "--cache-gc",
+        dest = "CollectCacheGarbage",
+        action = "store_true",
+        help = "removes expired items from the cache and evicts stories exceeding its limits"
+    )
+
+    argumentParser.add_argument(
+        "-cache-stats", "--cache-stats",
+        dest = "PrintCacheStatistics",
+        action = "store_true",
+        help = "prints the statistics of the cache's usage (hits, misses, data read and written) across all runs"
+    )
+
+    argumentParser.add_argument(
+        "-cache-import", "--cache-import",
+        dest = "CacheImportFilePath",
+        type = Path,
+        help = "imports a cache bundle (created using -cache-export) into the cache"
+    )
+
+    argumentParser.add_argument(
+        "-cache-export", "--cache-export",
+        dest = "CacheExportFilePath",
+        type = Path,
+        help = "exports the contents of the cache to a bundle file (after downloading the stories, if any)"
+    )
+
+    argumentParser.add_argument(
+        "-cache-filter",
+        dest = "CacheExportFilter",
+        type = str,
+        help = "exports only the stories whose URLs (or host names) match given pattern, e.g. \"*.fanfiction.net\""
+    )
+
+    argumentParser.add_argument(
+        "-cache-size",
+        dest = "CacheMaximumSize",
+        type = int,
+        default = Configuration.CacheMaximumSize,
+        help = "the maximum size of the cache, in megabytes"
+    )
+
+    argumentParser.add_argument(
+        "-cache-items",
+        dest = "CacheMaximumItemCount",
+        type = int,
+        default = Configuration.CacheMaximumItemCount,
+        help = "the maximum number of items in the cache"
+    )
+
+    argumentParser.add_argument(
+        "-cache-age",
+        dest = "CacheMaximumItemAge",
+        type = float,
+        default = Configuration.CacheMaximumItemAge,
+        help = "the maximum age of a cached item, in days"
+    )
+
+    argumentParser.add_argument(
+        "-cache-remote",
+        dest = "CacheRemoteLocation",
+        type = str,
+        default = Configuration.CacheRemoteLocation,
+        help = "the location of a remote cache shared by many machines: an HTTP(S) URL or a directory path"
+    )
+
+    argumentParser.add_argument(
+        "-scan-ttl",
+        dest = "StoryScanLifetime",
+        type = float,
+        default = Configuration.StoryScanLifetime,
+        help = "for how long the results of scanning a story are reused, in minutes (0 disables reusing them)"
+    )
+
+    argumentParser.add_argument(
+        "-spill",
+        dest = "SpillChapterCount",
+        type = int,
+        default = Configuration.SpillChapterCount,
+        help = "keeps the content of stories with at least that many chapters on the disk, instead of in memory"
+    )
+
+    argumentParser.add_argument(
+        "-resume",
+        dest = "Resume",
+        action = "store_true",
+        help = "resumes the previous run (using the same input), skipping the stories it has processed"
+    )
+
+    argumentParser.add_argument(
+        "-j",
+        dest = "Jobs",
+        type = int,
+        default = Configuration.Jobs,
+        help = "the number of stories downloaded at once"
+    )
+
+    argumentParser.add_argument(
+        "-j-host",
+        dest = "JobsPerHost",
+        type = int,
+        default = Configuration.JobsPerHost,
+        help = "the number of stories downloaded at once per host (website)"
+    )
+
+    argumentParser.add_argument(
+        "-rate",
+        dest = "RequestRate",
+        type = float,
+        default = Configuration.RequestRate,
+        help = "the number of requests per second sent to a website requiring breaks between requests"
+    )
+
+    argumentParser.add_argument(
+        "-burst",
+        dest = "RequestBurst",
+        type = int,
+        default = Configuration.RequestBurst,
+        help = "the number of requests sent at once to a website requiring breaks between requests"
+    )
+
+    argumentParser.add_argument(
+        "-async",
+        dest = "AsyncRequests",
+        action = "store_true",
+        default = Configuration.AsyncRequests,
+        help = "downloads chapters and images asynchronously (requires the \"aiohttp\" package)"
+    )
+
+    argumentParser.add_argument(
+        "-formats",
+        dest = "OutputFormats",
+        type = str,
+        default = Configuration.OutputFormats,
+        help = "the output formats to be generated, separated with commas (e.g. \"epub,html\")"
+    )
+
     argumentParser.add_argument(
         "-lo",
         dest = "LibreOffice",
@@ -200,10 +346,41 @@ def ReadCommandLineArguments() -> Namespace:
     argumentParser.add_argument(
         "Input",
         type = str,
+        nargs = "?",
         help = "a URL, or a path to a text file with one URL per line"
     )
 
-    return argumentParser.parse_args()
+    arguments = argumentParser.parse_args()
+
+    # The input is required, unless the application is only supposed to maintain the cache.
+
+    cacheOperationRequested =            \
+        arguments.CollectCacheGarbage or  \
+        arguments.PrintCacheStatistics or \
+        arguments.CacheImportFilePath or  \
+        arguments.CacheExportFilePath
+
+    if (not arguments.Input) and (not cacheOperationRequested):
+        argumentParser.error("the following arguments are required: Input")
+
+    if (arguments.Jobs < 1) or (arguments.JobsPerHost < 1):
+        argumentParser.error("the number of stories downloaded at once has to be positive")
+
+    if arguments.RequestRate <= 0:
+        argumentParser.error("the request rate has to be positive")
+
+    if arguments.RequestBurst < 1:
+        argumentParser.error("the request burst has to be positive")
+
+    if (arguments.SpillChapterCount is not None) and (arguments.SpillChapterCount < 1):
+        argumentParser.error("the minimal number of chapters of spilled stories has to be positive")
+
+    try:
+        arguments.OutputFormats = ReadOutputFormats(arguments.OutputFormats)
+    except ValueError as error:
+        argumentParser.error(str(error))
+
+    return arguments
 
 #
 #